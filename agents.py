@@ -1,60 +1,218 @@
-from crewai import Agent
-from langchain_community.llms import Ollama
-from langchain_openai import ChatOpenAI
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from crewai import LLM, Agent
+from crewai.events import LLMStreamChunkEvent, crewai_event_bus
 
 from config import Settings
+from ratelimit import ProviderLimiter, provider_limiter
+from routing import Backend, LatencyRouter, shared_router
+
+# Backends tried by the "auto" provider, in order of preference until measured.
+ROUTED_PROVIDERS = ("openrouter", "ollama")
+
+# off: no memory; agent: every agent builds its own CrewAI memory; shared: all
+# agents in the process read and write one memory store. Agents are pooled
+# across articles, so with memory on, what one analysis stores can surface
+# in later, unrelated ones.
+AGENT_MEMORY_MODES = ("off", "agent", "shared")
 
 
 class ArticleAnalysisAgents:
-    def __init__(self, settings: Settings):
+    """Agent factory bound to one LLM backend, or to several in routing mode.
+
+    With ``MODEL_PROVIDER=auto`` every available backend is loaded and
+    :attr:`router` picks one per task from rolling latency and error rates.
+
+    Agents are pooled: :meth:`lease` hands out an idle agent built by the same
+    factory on the same LLM, or builds one, and takes it back once the task is
+    done. An agent is never used by two tasks at once.
+
+    With ``on_token`` the clients stream, and every token they generate is
+    passed to it until :meth:`close` is called.
+    """
+
+    def __init__(self, settings: Settings, on_token: Optional[Callable[[str], None]] = None):
         self.settings = settings
-        self.llm = self._load_llm()
+        self.on_token = on_token
+        self.memory = _agent_memory(settings.agent_memory)
+        self.backends = self._load_backends()
+        self.router: Optional[LatencyRouter] = shared_router() if self.routing else None
+        self.llm = self.backends[0].llm
+        # Shared by every agent factory for the same provider in this process.
+        self.limiter: ProviderLimiter = self.backends[0].limiter
+        self._idle: Dict[Tuple[str, int], List[Agent]] = {}
+        self._idle_lock = threading.Lock()
+        if on_token is not None:
+            crewai_event_bus.on(LLMStreamChunkEvent)(self._forward_token)
+
+    def close(self) -> None:
+        """Stop forwarding tokens to ``on_token``."""
+        if self.on_token is not None:
+            crewai_event_bus.off(LLMStreamChunkEvent, self._forward_token)
 
-    def _load_llm(self):
-        provider = self.settings.model_provider
+    def _forward_token(self, source, event: LLMStreamChunkEvent) -> None:
+        # The event bus is process-wide; only this factory's clients are forwarded.
+        if event.tool_call is None and any(source is backend.llm for backend in self.backends):
+            self.on_token(event.chunk)
+
+    @contextmanager
+    def lease(self, factory: str, llm=None) -> Iterator[Agent]:
+        """Borrow an agent from ``factory`` (e.g. ``"summarizer_agent"``) for one task."""
+        key = (factory, id(llm or self.llm))
+        with self._idle_lock:
+            idle = self._idle.setdefault(key, [])
+            agent = idle.pop() if idle else None
+        if agent is None:
+            agent = getattr(self, factory)(llm)
+        try:
+            yield agent
+        finally:
+            with self._idle_lock:
+                self._idle[key].append(agent)
+
+    @property
+    def routing(self) -> bool:
+        return self.settings.model_provider == "auto"
+
+    def _load_backends(self) -> List[Backend]:
+        if not self.routing:
+            provider = self.settings.model_provider
+            return [self._backend(provider, self._load_llm(provider))]
+        backends = []
+        for provider in ROUTED_PROVIDERS:
+            if provider == "openrouter" and not self.settings.openrouter_api_key:
+                continue
+            backends.append(self._backend(provider, self._load_llm(provider)))
+        return backends
+
+    def _backend(self, provider: str, llm) -> Backend:
+        model = (
+            self.settings.openrouter_model
+            if provider == "openrouter"
+            else self.settings.ollama_model
+        )
+        return Backend(
+            provider=provider,
+            model=model,
+            llm=llm,
+            limiter=provider_limiter(self.settings, provider),
+        )
+
+    def _load_llm(self, provider: str) -> LLM:
+        # Tokens only reach on_token as they are generated when the client streams.
+        stream = self.on_token is not None
         if provider == "openrouter":
             if not self.settings.openrouter_api_key:
                 raise ValueError(
                     "OpenRouter selected but OPENROUTER_API_KEY is not configured."
                 )
-            return ChatOpenAI(
-                base_url="https://openrouter.ai/api/v1",
-                api_key=self.settings.openrouter_api_key,
+            return LLM(
                 model=self.settings.openrouter_model,
+                provider="openrouter",
+                base_url=self.settings.openrouter_base_url,
+                api_key=self.settings.openrouter_api_key,
                 temperature=0.3,
+                # Retries are handled, with backoff shared across calls, by the provider limiter.
+                max_retries=0,
+                stream=stream,
             )
 
         if provider == "ollama":
-            return Ollama(model=self.settings.ollama_model)
+            # The server address comes from OLLAMA_HOST, defaulting to localhost:11434.
+            return LLM(model=self.settings.ollama_model, provider="ollama", stream=stream)
 
         raise ValueError(f"Unsupported model provider '{provider}'.")
 
-    def summarizer_agent(self):
+    def summarizer_agent(self, llm=None):
         return Agent(
             role="Article Summarizer",
             goal="Summarize the key points of an article.",
             backstory="You are an expert in summarizing articles, able to extract the most important information and present it in a concise and easy-to-understand format.",
             verbose=True,
-            memory=True,
-            llm=self.llm
+            memory=self.memory,
+            llm=llm or self.llm
         )
 
-    def assumptions_agent(self):
+    def assumptions_agent(self, llm=None):
         return Agent(
             role="Assumption Identifier",
             goal="Identify the underlying assumptions in an article.",
             backstory="You have a keen eye for identifying hidden assumptions and biases in written content. You can uncover the author's underlying beliefs and perspectives.",
             verbose=True,
-            memory=True,
-            llm=self.llm
+            memory=self.memory,
+            llm=llm or self.llm
         )
 
-    def errors_agent(self):
+    def errors_agent(self, llm=None):
         return Agent(
             role="Error and Bias Detector",
             goal="Identify potential factual errors, logical fallacies, and biases in an article.",
             backstory="You are a meticulous fact-checker and critical thinker, able to spot inconsistencies, logical flaws, and biased language in any text.",
             verbose=True,
-            memory=True,
-            llm=self.llm
+            memory=self.memory,
+            llm=llm or self.llm
+        )
+
+    def analyst_agent(self, llm=None):
+        return Agent(
+            role="Article Analyst",
+            goal="Summarize an article and identify its assumptions, errors, and biases in a single review.",
+            backstory="You combine the skills of an expert summarizer, a critical reader attuned to hidden assumptions, and a meticulous fact-checker, and you report each finding in the section it belongs to.",
+            verbose=True,
+            memory=self.memory,
+            llm=llm or self.llm
         )
+
+
+_pool: Dict[Tuple, ArticleAnalysisAgents] = {}
+_pool_lock = threading.Lock()
+
+
+def shared_agents(settings: Settings) -> ArticleAnalysisAgents:
+    """Return the agent factory shared by every pipeline in this process with the same LLM settings.
+
+    LLM clients and pooled agents are built once per combination of provider,
+    models, credentials, limits and memory mode instead of once per pipeline.
+    """
+    key = (
+        settings.model_provider,
+        settings.openrouter_model,
+        settings.ollama_model,
+        settings.openrouter_api_key,
+        settings.openrouter_base_url,
+        settings.agent_memory,
+        settings.llm_requests_per_second,
+        settings.llm_tokens_per_minute,
+        settings.llm_max_in_flight,
+        settings.llm_max_retries,
+        settings.llm_retry_base_delay,
+    )
+    with _pool_lock:
+        agents = _pool.get(key)
+        if agents is None:
+            agents = _pool[key] = ArticleAnalysisAgents(settings)
+        return agents
+
+
+_shared_memory = None
+_shared_memory_lock = threading.Lock()
+
+
+def _agent_memory(mode: str):
+    if mode == "off":
+        return False
+    if mode == "agent":
+        return True
+    if mode == "shared":
+        global _shared_memory
+        with _shared_memory_lock:
+            if _shared_memory is None:
+                from crewai.memory import Memory
+
+                _shared_memory = Memory()
+            return _shared_memory
+    raise ValueError(
+        f"Unsupported agent memory '{mode}'. Use one of: {', '.join(AGENT_MEMORY_MODES)}."
+    )
@@ -0,0 +1,231 @@
+import gzip
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from chunking import paragraph_hashes
+from storage import ArchivedAnalysis, ArticleRepository, NewAnalysis, NewArticle
+from telemetry import StageSample
+
+# Bump when the record layout changes incompatibly.
+ARCHIVE_FORMAT = 1
+
+
+@dataclass
+class ArchiveSummary:
+    articles: int = 0
+    analyses: int = 0
+    # Export: reports whose file was gone. Import: records already present or
+    # older than the local copy, and analyses of articles that are missing.
+    skipped: int = 0
+    # Export: pass as ``since`` next time to fetch only what changed.
+    cursor: Optional[datetime] = None
+
+
+def export_archive(
+    repository: ArticleRepository,
+    path: Path,
+    *,
+    since: Optional[datetime] = None,
+    on_progress: Optional[Callable[[ArchiveSummary], None]] = None,
+) -> ArchiveSummary:
+    """Stream articles and analyses changed since ``since`` to a gzipped JSONL file.
+
+    Rows are read in batches and written one line at a time, so memory use
+    does not depend on the size of the database. Report files are embedded.
+    The returned cursor is the time the export started: rows written while
+    it ran may appear again in the next export, which the import skips.
+    """
+    summary = ArchiveSummary(cursor=datetime.utcnow())
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        _write(
+            handle,
+            {
+                "type": "header",
+                "format": ARCHIVE_FORMAT,
+                "exported_at": summary.cursor.isoformat(),
+                "since": since.isoformat() if since else None,
+            },
+        )
+        # Articles first, so an import can attach every analysis that follows.
+        for article in repository.iter_articles(since=since):
+            _write(
+                handle,
+                {
+                    "type": "article",
+                    "url": article.url,
+                    "title": article.title,
+                    "content": article.content,
+                    "content_hash": article.content_hash,
+                    "fetched_at": article.fetched_at.isoformat(),
+                    "etag": article.etag,
+                    "last_modified": article.last_modified,
+                },
+            )
+            summary.articles += 1
+            _progress(on_progress, summary)
+        for item in repository.iter_analyses(since=since):
+            analysis = item.analysis
+            try:
+                report = Path(analysis.output_path).read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                report = None
+                summary.skipped += 1
+            _write(
+                handle,
+                {
+                    "type": "analysis",
+                    "article_url": item.article_url,
+                    "model_provider": analysis.model_provider,
+                    "model_name": analysis.model_name,
+                    "output_path": str(analysis.output_path),
+                    "created_at": analysis.created_at.isoformat(),
+                    "strategy": analysis.strategy,
+                    "duration_seconds": analysis.duration_seconds,
+                    "input_tokens": analysis.input_tokens,
+                    "output_tokens": analysis.output_tokens,
+                    "cache_hits": analysis.cache_hits,
+                    "cache_misses": analysis.cache_misses,
+                    "failed_sections": analysis.failed_sections,
+                    "article_tokens": analysis.article_tokens,
+                    "compacted_tokens": analysis.compacted_tokens,
+                    "content_hash": analysis.content_hash,
+                    "stages": [asdict(sample) for sample in analysis.stages],
+                    "report": report,
+                },
+            )
+            summary.analyses += 1
+            _progress(on_progress, summary)
+    return summary
+
+
+def import_archive(
+    repository: ArticleRepository,
+    path: Path,
+    *,
+    output_dir: Path,
+    batch_size: int = 500,
+    on_progress: Optional[Callable[[ArchiveSummary], None]] = None,
+) -> ArchiveSummary:
+    """Merge an archive written by :func:`export_archive`, ``batch_size`` rows per transaction.
+
+    Articles only replace older local copies, analyses already present are
+    skipped, and embedded reports are written to ``output_dir``, so the same
+    archive can be imported repeatedly.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary = ArchiveSummary()
+    articles: List[NewArticle] = []
+    analyses: List[ArchivedAnalysis] = []
+
+    def flush_articles() -> None:
+        saved = repository.merge_articles(articles)
+        summary.articles += saved
+        summary.skipped += len(articles) - saved
+        articles.clear()
+        _progress(on_progress, summary)
+
+    def flush_analyses() -> None:
+        # Analyses refer to articles by URL; those may still be buffered.
+        if articles:
+            flush_articles()
+        merged = repository.merge_analyses(analyses)
+        summary.analyses += merged
+        summary.skipped += len(analyses) - merged
+        analyses.clear()
+        _progress(on_progress, summary)
+
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise ValueError(f"{path}:{number}: not a JSON record ({exc}).") from exc
+            kind = record.get("type")
+            if kind == "header":
+                if record.get("format") != ARCHIVE_FORMAT:
+                    raise ValueError(
+                        f"{path} uses archive format {record.get('format')}; "
+                        f"this version reads format {ARCHIVE_FORMAT}."
+                    )
+            elif kind == "article":
+                articles.append(_article_from_record(record))
+                if len(articles) >= batch_size:
+                    flush_articles()
+            elif kind == "analysis":
+                analyses.append(_analysis_from_record(record, output_dir))
+                if len(analyses) >= batch_size:
+                    flush_analyses()
+            else:
+                raise ValueError(f"{path}:{number}: unknown record type {kind!r}.")
+    flush_analyses()
+    return summary
+
+
+def _article_from_record(record: dict) -> NewArticle:
+    return NewArticle(
+        url=record["url"],
+        title=record.get("title"),
+        content=record["content"],
+        content_hash=record["content_hash"],
+        fetched_at=datetime.fromisoformat(record["fetched_at"]),
+        etag=record.get("etag"),
+        last_modified=record.get("last_modified"),
+        paragraph_hashes=paragraph_hashes(record["content"]),
+    )
+
+
+def _analysis_from_record(record: dict, output_dir: Path) -> ArchivedAnalysis:
+    created_at = datetime.fromisoformat(record["created_at"])
+    report = record.get("report")
+    output_path = Path(record["output_path"])
+    if report is not None:
+        output_path = _place_report(output_dir, output_path.name, report, created_at)
+    return ArchivedAnalysis(
+        article_url=record["article_url"],
+        analysis=NewAnalysis(
+            article_id=0,
+            model_provider=record["model_provider"],
+            model_name=record["model_name"],
+            output_path=output_path,
+            created_at=created_at,
+            strategy=record.get("strategy"),
+            duration_seconds=record.get("duration_seconds"),
+            input_tokens=record.get("input_tokens"),
+            output_tokens=record.get("output_tokens"),
+            cache_hits=record.get("cache_hits"),
+            cache_misses=record.get("cache_misses"),
+            failed_sections=record.get("failed_sections"),
+            article_tokens=record.get("article_tokens"),
+            compacted_tokens=record.get("compacted_tokens"),
+            content_hash=record.get("content_hash"),
+            stages=[StageSample(**sample) for sample in record.get("stages", [])],
+        ),
+        report=report,
+    )
+
+
+def _place_report(output_dir: Path, name: str, report: str, created_at: datetime) -> Path:
+    """Write ``report`` under its original file name unless another report holds it."""
+    path = output_dir / name
+    if path.exists() and path.read_text(encoding="utf-8") != report:
+        path = output_dir / f"{path.stem}-{created_at.strftime('%Y%m%d%H%M%S')}{path.suffix}"
+    if not path.exists():
+        path.write_text(report, encoding="utf-8")
+    return path
+
+
+def _write(handle, record: dict) -> None:
+    handle.write(json.dumps(record, ensure_ascii=False))
+    handle.write("\n")
+
+
+def _progress(
+    on_progress: Optional[Callable[[ArchiveSummary], None]], summary: ArchiveSummary
+) -> None:
+    if on_progress:
+        on_progress(summary)
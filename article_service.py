@@ -1,12 +1,20 @@
 import hashlib
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional, Tuple
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
+from chunking import paragraph_hashes
+from config import Settings
+from extractors import ExtractedArticle, extract_html, get_extractor
 from storage import ArticleRecord, ArticleRepository
+from telemetry import Telemetry
+from urls import canonicalize_url
+
+_READ_CHUNK_BYTES = 64 * 1024
 
 
 class ArticleDownloadError(Exception):
@@ -18,62 +26,205 @@ class ArticlePayload:
     record: ArticleRecord
     content: str
     title: Optional[str]
+    # The cached version this download replaced, when the article changed.
+    previous: Optional[ArticleRecord] = None
+
+
+@dataclass
+class DownloadedArticle:
+    content: str
+    title: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
 
 
 class ArticleService:
-    def __init__(self, repository: ArticleRepository):
+    def __init__(
+        self,
+        repository: ArticleRepository,
+        *,
+        pool_size: int = 10,
+        freshness_ttl: Optional[timedelta] = None,
+        extractor: str = "auto",
+        max_download_bytes: Optional[int] = None,
+        max_parse_chars: Optional[int] = None,
+        parse_executor: Optional[Executor] = None,
+    ):
         self.repository = repository
+        self.freshness_ttl = freshness_ttl
+        self.extractor = get_extractor(extractor)
+        self.max_download_bytes = max_download_bytes
+        self.max_parse_chars = max_parse_chars
+        self.parse_executor = parse_executor
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def from_settings(
+        cls,
+        repository: ArticleRepository,
+        settings: Settings,
+        *,
+        parse_executor: Optional[Executor] = None,
+    ) -> "ArticleService":
+        return cls(
+            repository,
+            pool_size=max(settings.http_pool_size, settings.fetch_concurrency),
+            freshness_ttl=settings.article_ttl,
+            extractor=settings.html_extractor,
+            max_download_bytes=settings.max_download_bytes,
+            max_parse_chars=settings.max_parse_chars,
+            parse_executor=parse_executor,
+        )
 
-    def get_article(self, url: str) -> ArticlePayload:
-        cached = self.repository.get_article(url)
-        if cached:
-            return ArticlePayload(record=cached, content=cached.content, title=cached.title)
+    def get_article(self, url: str, telemetry: Optional[Telemetry] = None) -> ArticlePayload:
+        telemetry = telemetry or Telemetry()
+        with telemetry.stage("fetch") as sample:
+            # A hit means the body came from the cache, even if the origin was asked.
+            payload, sample.cache_hit = self._get_article(url, telemetry)
+            return payload
+
+    def _get_article(self, url: str, telemetry: Telemetry) -> Tuple[ArticlePayload, bool]:
+        # The canonical form only keys the cache; the page is fetched as given,
+        # since the server may not serve the canonical variant.
+        key = canonicalize_url(url)
+        cached = self.repository.get_article(key)
+        if cached and self._is_fresh(cached):
+            return ArticlePayload(record=cached, content=cached.content, title=cached.title), True
+
+        try:
+            downloaded = self._download_article(url, cached, telemetry)
+        except ArticleDownloadError:
+            if cached:
+                # Serve the stale copy rather than failing when the origin is unreachable.
+                return (
+                    ArticlePayload(record=cached, content=cached.content, title=cached.title),
+                    True,
+                )
+            raise
+
+        now = datetime.utcnow()
+        if downloaded is None:
+            record = self.repository.mark_article_validated(
+                cached.id, validated_at=now, etag=None, last_modified=None
+            )
+            return ArticlePayload(record=record, content=record.content, title=record.title), True
+
+        content_hash = hashlib.sha256(downloaded.content.encode("utf-8")).hexdigest()
+        if cached and cached.content_hash == content_hash:
+            record = self.repository.mark_article_validated(
+                cached.id,
+                validated_at=now,
+                etag=downloaded.etag,
+                last_modified=downloaded.last_modified,
+            )
+            return ArticlePayload(record=record, content=record.content, title=record.title), True
 
-        content, title = self._download_article(url)
-        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
         record = self.repository.save_article(
-            url=url,
-            title=title,
-            content=content,
+            url=key,
+            title=downloaded.title,
+            content=downloaded.content,
             content_hash=content_hash,
-            fetched_at=datetime.utcnow(),
+            fetched_at=now,
+            etag=downloaded.etag,
+            last_modified=downloaded.last_modified,
+            paragraph_hashes=paragraph_hashes(downloaded.content),
+        )
+        return (
+            ArticlePayload(
+                record=record,
+                content=downloaded.content,
+                title=downloaded.title,
+                previous=cached,
+            ),
+            False,
         )
-        return ArticlePayload(record=record, content=content, title=title)
 
-    def _download_article(self, url: str) -> Tuple[str, Optional[str]]:
+    def download(self, url: str) -> bytes:
+        """Download a document that is not an article, such as a feed, within the download limit."""
+        try:
+            with self.session.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                return bytes(self._read_body(response))
+        except requests.RequestException as exc:
+            raise ArticleDownloadError(f"Failed to fetch {url}: {exc}") from exc
+
+    def _is_fresh(self, record: ArticleRecord) -> bool:
+        if self.freshness_ttl is None:
+            return True
+        checked_at = record.validated_at or record.fetched_at
+        return datetime.utcnow() - checked_at < self.freshness_ttl
+
+    def _download_article(
+        self,
+        url: str,
+        cached: Optional[ArticleRecord] = None,
+        telemetry: Optional[Telemetry] = None,
+    ) -> Optional[DownloadedArticle]:
+        """Download and parse an article.
+
+        When ``cached`` carries validators the request is conditional and
+        ``None`` is returned if the origin answers 304 Not Modified.
+        """
+        headers: Dict[str, str] = {}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        telemetry = telemetry or Telemetry()
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
+            with telemetry.stage("download"), self.session.get(
+                url, headers=headers, timeout=30, stream=True
+            ) as response:
+                if response.status_code == 304 and headers:
+                    return None
+                response.raise_for_status()
+                html = self._read_html(response)
         except requests.RequestException as exc:
             raise ArticleDownloadError(f"Failed to fetch article: {exc}") from exc
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        title = self._extract_title(soup)
-        content = self._extract_body(soup)
-
-        if not content.strip():
+        with telemetry.stage("extract"):
+            extracted = self._extract(html)
+        if not extracted.content.strip():
             raise ArticleDownloadError("Unable to extract article content.")
 
-        return content, title
-
-    @staticmethod
-    def _extract_title(soup: BeautifulSoup) -> Optional[str]:
-        if soup.title and soup.title.string:
-            return soup.title.string.strip()
-        heading = soup.find("h1")
-        if heading and heading.get_text():
-            return heading.get_text().strip()
-        return None
-
-    @staticmethod
-    def _extract_body(soup: BeautifulSoup) -> str:
-        article_tag = soup.find("article")
-        paragraphs = (
-            article_tag.find_all("p") if article_tag else soup.find_all("p")
+        return DownloadedArticle(
+            content=extracted.content,
+            title=extracted.title,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
         )
-        text_segments = []
-        for paragraph in paragraphs:
-            text = paragraph.get_text(strip=True)
-            if text:
-                text_segments.append(text)
-        return "\n\n".join(text_segments)
+
+    def _read_html(self, response: requests.Response) -> str:
+        body = self._read_body(response)
+        try:
+            return body.decode(response.encoding or "utf-8", errors="replace")
+        except LookupError:
+            return body.decode("utf-8", errors="replace")
+
+    def _read_body(self, response: requests.Response) -> bytearray:
+        limit = self.max_download_bytes
+        declared = response.headers.get("Content-Length")
+        if limit and declared and declared.isdigit() and int(declared) > limit:
+            raise ArticleDownloadError(
+                f"Article is {int(declared):,} bytes, above the {limit:,} byte download limit."
+            )
+
+        body = bytearray()
+        for chunk in response.iter_content(_READ_CHUNK_BYTES):
+            body.extend(chunk)
+            if limit and len(body) > limit:
+                raise ArticleDownloadError(
+                    f"Article exceeds the {limit:,} byte download limit."
+                )
+        return body
+
+    def _extract(self, html: str) -> ExtractedArticle:
+        if self.max_parse_chars and len(html) > self.max_parse_chars:
+            html = html[: self.max_parse_chars]
+        if self.parse_executor is not None:
+            return self.parse_executor.submit(extract_html, html, self.extractor.name).result()
+        return self.extractor.extract(html)
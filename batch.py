@@ -0,0 +1,180 @@
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+from article_service import ArticlePayload
+from pipeline import AnalysisPipeline, AnalysisResult, LLMUsage
+from telemetry import Telemetry
+
+_DONE = object()
+
+
+@dataclass
+class BatchOutcome:
+    index: int
+    url: str
+    status: str = "pending"
+    stage: Optional[str] = None
+    error: Optional[str] = None
+    title: Optional[str] = None
+    article_id: Optional[int] = None
+    output_path: Optional[Path] = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    usage: Optional[LLMUsage] = None
+    elapsed: float = 0.0
+    started: float = 0.0
+    article: Optional[ArticlePayload] = None
+    result: Optional[AnalysisResult] = None
+    telemetry: Optional[Telemetry] = None
+
+
+class BatchRunner:
+    """Run fetch, analysis and report writing as overlapping worker stages.
+
+    Each stage owns a fixed number of threads and hands items to the next stage
+    through a bounded queue, so a slow stage applies backpressure upstream
+    instead of letting fetched articles pile up in memory.
+    """
+
+    def __init__(
+        self,
+        pipeline: AnalysisPipeline,
+        *,
+        batch_id: Optional[str] = None,
+        on_complete: Optional[Callable[[BatchOutcome], None]] = None,
+    ):
+        self.pipeline = pipeline
+        self.batch_id = batch_id or uuid.uuid4().hex[:12]
+        self.on_complete = on_complete
+        settings = pipeline.settings
+        self._stages = [
+            ("fetch", self._fetch, max(1, settings.fetch_concurrency)),
+            ("analyze", self._analyze, max(1, settings.analysis_concurrency)),
+            ("write", self._write, max(1, settings.write_concurrency)),
+        ]
+        self._lock = threading.Lock()
+        self._outcomes: List[BatchOutcome] = []
+        self._feed_error: Optional[BaseException] = None
+
+    def run(self, urls: Iterable[str]) -> List[BatchOutcome]:
+        """Process ``urls`` and return their outcomes in input order.
+
+        If iterating ``urls`` fails, the URLs already read are still finished
+        and the error is raised afterwards.
+        """
+        inboxes = [
+            queue.Queue(maxsize=workers * 2) for _, _, workers in self._stages
+        ]
+        stage_threads = []
+        for position, (name, handler, workers) in enumerate(self._stages):
+            inbox = inboxes[position]
+            outbox = inboxes[position + 1] if position + 1 < len(inboxes) else None
+            threads = [
+                threading.Thread(
+                    target=self._work,
+                    args=(name, handler, inbox, outbox),
+                    name=f"batch-{name}-{index}",
+                    daemon=True,
+                )
+                for index in range(workers)
+            ]
+            for thread in threads:
+                thread.start()
+            stage_threads.append(threads)
+
+        feeder = threading.Thread(
+            target=self._feed, args=(urls, inboxes[0]), name="batch-feed", daemon=True
+        )
+        feeder.start()
+        feeder.join()
+
+        for position, threads in enumerate(stage_threads):
+            for thread in threads:
+                thread.join()
+            if position + 1 < len(inboxes):
+                for _ in range(self._stages[position + 1][2]):
+                    inboxes[position + 1].put(_DONE)
+
+        if self._feed_error is not None:
+            raise self._feed_error
+        return sorted(self._outcomes, key=lambda outcome: outcome.index)
+
+    def _feed(self, urls: Iterable[str], inbox: "queue.Queue[object]") -> None:
+        try:
+            for index, url in enumerate(urls):
+                inbox.put(BatchOutcome(index=index, url=url, started=time.perf_counter()))
+        except BaseException as exc:  # noqa: BLE001 - re-raised by run() once the stages drain
+            self._feed_error = exc
+        finally:
+            # Without these the stage threads would wait on their inboxes forever.
+            for _ in range(self._stages[0][2]):
+                inbox.put(_DONE)
+
+    def _work(
+        self,
+        name: str,
+        handler: Callable[[BatchOutcome], None],
+        inbox: "queue.Queue[object]",
+        outbox: Optional["queue.Queue[object]"],
+    ) -> None:
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                return
+            try:
+                handler(item)
+            except Exception as exc:  # noqa: BLE001 - a failed URL must not stop the batch
+                self._finish(item, status="failed", stage=name, error=str(exc) or type(exc).__name__)
+                continue
+            if outbox is None:
+                self._finish(item, status="succeeded", stage=name)
+            else:
+                outbox.put(item)
+
+    def _fetch(self, item: BatchOutcome) -> None:
+        item.telemetry = Telemetry()
+        item.article = self.pipeline.fetch(item.url, telemetry=item.telemetry)
+        item.title = item.article.title
+        item.article_id = item.article.record.id
+
+    def _analyze(self, item: BatchOutcome) -> None:
+        item.result = self.pipeline.analyze(item.url, item.article, telemetry=item.telemetry)
+        item.cache_hits = len(item.result.cache_hits)
+        item.cache_misses = len(item.result.cache_misses)
+        item.usage = item.result.usage
+
+    def _write(self, item: BatchOutcome) -> None:
+        item.output_path = self.pipeline.write(item.result)
+
+    def _finish(
+        self, item: BatchOutcome, *, status: str, stage: str, error: Optional[str] = None
+    ) -> None:
+        item.status = status
+        item.stage = stage
+        item.error = error
+        item.elapsed = time.perf_counter() - item.started
+        # Drop article bodies and reports so long batches keep a flat footprint.
+        item.article = None
+        item.result = None
+        item.telemetry = None
+
+        self.pipeline.repository.record_batch_item(
+            batch_id=self.batch_id,
+            url=item.url,
+            status=status,
+            stage=stage,
+            error=error,
+            output_path=item.output_path,
+            article_id=item.article_id,
+            finished_at=datetime.utcnow(),
+        )
+        with self._lock:
+            self._outcomes.append(item)
+        if self.on_complete:
+            self.on_complete(item)
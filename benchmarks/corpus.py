@@ -0,0 +1,68 @@
+"""Deterministic article HTML in several sizes for offline benchmarks."""
+
+import random
+from typing import Dict
+
+# Number of article paragraphs per corpus size.
+SIZES: Dict[str, int] = {"small": 8, "medium": 60, "large": 400}
+
+_WORDS = (
+    "analysis budget policy growth market report city council energy data model "
+    "research evidence study claim source survey quarter revenue supply demand risk "
+    "forecast inflation climate infrastructure election voter health hospital school "
+    "transport network security software platform regulation investment community"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 22))]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    sentences = [_sentence(rng) for _ in range(rng.randint(3, 7))]
+    position = rng.randrange(len(sentences))
+    sentences[position] = f'<a href="/related/{rng.randint(1, 999)}">{sentences[position]}</a>'
+    if rng.random() < 0.3:
+        sentences[0] = f"<em>{sentences[0]}</em>"
+    return " ".join(sentences)
+
+
+def build_article(name: str, paragraphs: int, seed: int = 0) -> str:
+    """Render a news-style page with the usual chrome around the article body."""
+    rng = random.Random(f"{name}:{seed}")
+    navigation = "".join(
+        f'<li><a href="/section/{index}">{rng.choice(_WORDS).title()}</a></li>'
+        for index in range(25)
+    )
+    body = "\n".join(f"<p>{_paragraph(rng)}</p>" for _ in range(paragraphs))
+    related = "".join(
+        f'<li><a href="/story/{index}">{_sentence(rng)}</a></li>' for index in range(10)
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Benchmark article: {name}</title>
+<style>body {{ font-family: serif; }} .ad {{ display: none; }}</style>
+<script>window.dataLayer = window.dataLayer || []; dataLayer.push({{"page": "{name}"}});</script>
+</head>
+<body>
+<header><nav><ul>{navigation}</ul></nav></header>
+<main>
+<article>
+<h1>Benchmark article: {name}</h1>
+<div class="byline"><span>By Staff Writer</span> <time>2024-01-01</time></div>
+{body}
+<div class="ad"><script>renderAd("inline");</script></div>
+</article>
+<aside><h2>Related</h2><ul>{related}</ul></aside>
+</main>
+<footer><p>Copyright Example News. All rights reserved.</p></footer>
+</body>
+</html>
+"""
+
+
+def build_corpus(seed: int = 0) -> Dict[str, str]:
+    return {name: build_article(name, paragraphs, seed) for name, paragraphs in SIZES.items()}
@@ -0,0 +1,82 @@
+"""Extraction parity check against the BeautifulSoup backend.
+
+Extracts the benchmark corpus and a set of malformed pages with every
+installed backend and fails when any result differs from ``bs4``. A backend
+has to pass before ``HTML_EXTRACTOR=auto`` may prefer it, since a different
+extraction changes content hashes and invalidates cached articles and sections.
+
+    python benchmarks/parity.py
+    python benchmarks/parity.py --backend lxml
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from corpus import build_corpus  # noqa: E402
+from extractors import available_extractors, get_extractor  # noqa: E402
+
+# Markup that real pages get wrong and parsers repair differently.
+FIXTURES: Dict[str, str] = {
+    "unclosed-paragraphs": "<html><body><p>a<p>b</body></html>",
+    "unclosed-paragraph-text": "<p>ab<p>bcd",
+    "markup-in-title": "<html><head><title>A<b>x</b></title></head><body><p>t</p></body></html>",
+    "missing-title": "<html><body><h1> Heading <em>here</em> </h1><p>t</p></body></html>",
+    "nested-articles": "<article><p>a</p><article><p>b</p></article></article><p>c</p>",
+    "script-in-paragraph": "<p>before<script>var x = 1;</script>after</p>",
+    "entities": "<title>Caf&eacute; &amp; bar</title><p>&lt;tag&gt; &nbsp;x</p>",
+    "paragraph-in-table": "<table><tr><td><p>cell</p></td></tr></table><p>after</p>",
+    "stray-closing-tags": "<p>one</div></span><p>two</p></p>",
+    "whitespace-only": "<p>   </p><p>\n</p><p>kept</p>",
+}
+
+
+def check(backend: str, pages: Dict[str, str]) -> Dict[str, List[str]]:
+    """Differences from bs4 per page name; pages that match are left out."""
+    reference = get_extractor("bs4")
+    candidate = get_extractor(backend)
+    mismatches: Dict[str, List[str]] = {}
+    for name, html in pages.items():
+        expected = reference.extract(html)
+        actual = candidate.extract(html)
+        differences = []
+        if actual.title != expected.title:
+            differences.append(f"title {actual.title!r} != {expected.title!r}")
+        if actual.content != expected.content:
+            differences.append(f"content {actual.content[:60]!r} != {expected.content[:60]!r}")
+        if differences:
+            mismatches[name] = differences
+    return mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--backend",
+        action="append",
+        help="Backend to compare with bs4 (repeatable, default: every installed one).",
+    )
+    options = parser.parse_args()
+
+    pages = {**build_corpus(), **FIXTURES}
+    backends = options.backend or [name for name in available_extractors() if name != "bs4"]
+    failures = []
+    for backend in backends:
+        mismatches = check(backend, pages)
+        print(f"{backend:<12} {len(pages) - len(mismatches)}/{len(pages)} pages match")
+        failures.extend(
+            f"{backend} {name}: {difference}"
+            for name, differences in mismatches.items()
+            for difference in differences
+        )
+    for failure in failures:
+        print(f"  {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
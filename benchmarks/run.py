@@ -0,0 +1,384 @@
+"""Offline end-to-end benchmarks.
+
+Articles are served from a local HTTP server and the LLM is replaced by an
+OpenAI-compatible fake wired in through ``OPENROUTER_BASE_URL``, so runs need
+no network access and are comparable between commits:
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --output after.json --compare before.json
+
+A scenario that raises is recorded with ``"status": "error"`` and the
+remaining scenarios still run.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from contextlib import ExitStack
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from config import load_settings  # noqa: E402
+from corpus import SIZES, build_corpus  # noqa: E402
+from servers import ArticleServer, FakeLLMServer  # noqa: E402
+from storage import ArticleRepository, NewAnalysis, NewArticle  # noqa: E402
+
+
+class Context:
+    """Servers, scratch space and options shared by every scenario."""
+
+    def __init__(self, options, scratch: Path, articles: ArticleServer, llm: FakeLLMServer):
+        self.options = options
+        self.scratch = scratch
+        self.articles = articles
+        self.llm = llm
+
+    def settings(self, name: str, **overrides):
+        base = replace(
+            load_settings(),
+            model_provider="openrouter",
+            openrouter_api_key="benchmark",
+            openrouter_model="benchmark/fake",
+            openrouter_base_url=self.llm.api_url,
+            output_dir=self.scratch / name / "output",
+            database_path=self.scratch / name / "analysis.db",
+            verbose=False,
+        )
+        base.output_dir.mkdir(parents=True, exist_ok=True)
+        return replace(base, **overrides)
+
+
+def _timed(function: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def _rss_mb() -> float:
+    """Resident memory of this process in megabytes."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except OSError:
+        import resource
+
+        # Without /proc only the peak is available: kilobytes on Linux, bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def scenario_extract(context: Context) -> Dict[str, object]:
+    """Extraction-only throughput for every installed backend and corpus size."""
+    from extractors import available_extractors, get_extractor
+
+    corpus = build_corpus()
+    results: Dict[str, object] = {}
+    for backend in available_extractors():
+        extractor = get_extractor(backend)
+        for name, html in corpus.items():
+            samples = [
+                _timed(lambda: extractor.extract(html)) for _ in range(context.options.repeat)
+            ]
+            median = statistics.median(samples)
+            results[f"{backend}.{name}"] = {
+                "seconds": round(median, 6),
+                "mb_per_second": round(len(html.encode("utf-8")) / 1e6 / median, 2),
+            }
+    return results
+
+
+def scenario_fetch(context: Context) -> Dict[str, object]:
+    """Cold download, fresh cache hit and 304 revalidation of the whole corpus."""
+    from pipeline import AnalysisPipeline
+
+    urls = [context.articles.url(name) for name in SIZES]
+    results: Dict[str, object] = {}
+    for phase, ttl in (("cold", timedelta(hours=1)), ("cached", timedelta(hours=1)), ("revalidate", timedelta(0))):
+        pipeline = AnalysisPipeline(context.settings("fetch", article_ttl=ttl))
+        before = context.articles.requests
+        try:
+            seconds = _timed(lambda: [pipeline.fetch(url) for url in urls])
+        finally:
+            pipeline.close()
+        results[phase] = {
+            "seconds": round(seconds, 4),
+            "http_requests": context.articles.requests - before,
+        }
+    return results
+
+
+def _analyze_once(context: Context, settings, url: str) -> Dict[str, object]:
+    from pipeline import AnalysisPipeline
+
+    pipeline = AnalysisPipeline(settings)
+    calls_before = context.llm.requests
+    try:
+        started = time.perf_counter()
+        article = pipeline.fetch(url)
+        result = pipeline.analyze(url, article)
+        pipeline.write(result)
+        seconds = time.perf_counter() - started
+    finally:
+        pipeline.close()
+    return {
+        "seconds": round(seconds, 4),
+        "llm_requests": context.llm.requests - calls_before,
+        "cache_hits": len(result.cache_hits),
+        "estimated_input_tokens": result.usage.input_tokens,
+        "estimated_output_tokens": result.usage.output_tokens,
+    }
+
+
+def scenario_analyze(context: Context) -> Dict[str, object]:
+    """A single ``analyze`` of the medium article for every strategy."""
+    results: Dict[str, object] = {}
+    for strategy in ("standard", "single-pass", "chunked"):
+        settings = context.settings(
+            f"analyze-{strategy}", analysis_strategy=strategy, cache_policy="bypass"
+        )
+        results[strategy] = _analyze_once(context, settings, context.articles.url("medium"))
+    return results
+
+
+def scenario_analyze_cached(context: Context) -> Dict[str, object]:
+    """A cold run followed by a re-run served from the section cache."""
+    settings = context.settings("analyze-cached")
+    url = context.articles.url("medium")
+    return {
+        "cold": _analyze_once(context, settings, url),
+        "warm": _analyze_once(context, settings, url),
+    }
+
+
+_AGENT_FACTORIES = ("summarizer_agent", "assumptions_agent", "errors_agent")
+
+
+def scenario_setup(context: Context) -> Dict[str, object]:
+    """Per-analysis setup of LLM clients and agents, rebuilt every run versus pooled."""
+    from agents import ArticleAnalysisAgents, shared_agents
+
+    def rebuilt(settings) -> None:
+        agents = ArticleAnalysisAgents(settings)
+        for factory in _AGENT_FACTORIES:
+            getattr(agents, factory)()
+
+    def pooled(settings) -> None:
+        agents = shared_agents(settings)
+        with ExitStack() as leases:
+            for factory in _AGENT_FACTORIES:
+                leases.enter_context(agents.lease(factory))
+
+    results: Dict[str, object] = {}
+    for name, setup, memory in (
+        # Agents with their own memory, rebuilt for every run, as before pooling.
+        ("rebuilt", rebuilt, "agent"),
+        ("pooled", pooled, "off"),
+        ("pooled.memory-agent", pooled, "agent"),
+        ("pooled.memory-shared", pooled, "shared"),
+    ):
+        # A model name of its own keeps clients pooled by earlier scenarios
+        # out of the first run.
+        settings = context.settings(
+            f"setup-{name}", agent_memory=memory, openrouter_model=f"benchmark/setup-{name}"
+        )
+        gc.collect()
+        rss_start = _rss_mb()
+        # The first run also pays one-time imports and builds what later runs may reuse.
+        first = _timed(lambda: setup(settings))
+        gc.collect()
+        rss_first = _rss_mb()
+        samples = [_timed(lambda: setup(settings)) for _ in range(context.options.repeat)]
+        gc.collect()
+        results[name] = {
+            "first_seconds": round(first, 4),
+            "first_rss_mb": round(rss_first - rss_start, 1),
+            "seconds": round(statistics.median(samples), 6),
+            # Growth over the remaining runs; pooled setups should stay flat.
+            "rss_growth_mb": round(_rss_mb() - rss_first, 1),
+        }
+    return results
+
+
+def scenario_listings(context: Context) -> Dict[str, object]:
+    """``history`` and ``cache`` against a database with many rows."""
+    settings = context.settings("listings")
+    rows = context.options.listing_rows
+    repository = ArticleRepository(settings.database_path)
+    try:
+        now = datetime.utcnow()
+        body = build_corpus()["small"]
+        records = repository.save_articles(
+            [
+                NewArticle(
+                    url=f"https://bench.example/{index}",
+                    title=f"Article {index}",
+                    content=f"{body}\n{index}",
+                    content_hash=f"{index:064x}",
+                    fetched_at=now - timedelta(seconds=index),
+                )
+                for index in range(rows)
+            ]
+        )
+        repository.record_analyses(
+            NewAnalysis(
+                article_id=record.id,
+                model_provider="openrouter",
+                model_name="benchmark/fake",
+                output_path=settings.output_dir / f"{record.id}.md",
+                created_at=record.fetched_at,
+            )
+            for record in records
+        )
+        in_process = {
+            "list_recent_analyses": _timed(lambda: repository.list_recent_analyses(50)),
+            "list_cached_articles": _timed(lambda: repository.list_cached_articles(50)),
+        }
+    finally:
+        repository.close()
+
+    env = dict(
+        os.environ,
+        DATABASE_PATH=str(settings.database_path),
+        OUTPUT_DIR=str(settings.output_dir),
+    )
+    results: Dict[str, object] = {"rows": rows}
+    for name, seconds in in_process.items():
+        results[name] = {"seconds": round(seconds, 6)}
+    for command in ("history", "cache"):
+        seconds = _timed(
+            lambda: subprocess.run(
+                [sys.executable, str(ROOT / "main.py"), command, "--limit", "50"],
+                cwd=context.scratch,
+                env=env,
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+        )
+        results[f"cli.{command}"] = {"seconds": round(seconds, 4)}
+    return results
+
+
+SCENARIOS: Dict[str, Callable[[Context], Dict[str, object]]] = {
+    "extract": scenario_extract,
+    "fetch": scenario_fetch,
+    "analyze": scenario_analyze,
+    "analyze-cached": scenario_analyze_cached,
+    "listings": scenario_listings,
+    "setup": scenario_setup,
+}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _flatten(prefix: str, value, into: Dict[str, float]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}.{key}" if prefix else key, item, into)
+    elif prefix.endswith("seconds") and isinstance(value, (int, float)):
+        into[prefix] = float(value)
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object]) -> List[str]:
+    """Describe how every timing changed relative to a previous run."""
+    now: Dict[str, float] = {}
+    before: Dict[str, float] = {}
+    _flatten("", current["scenarios"], now)
+    _flatten("", baseline["scenarios"], before)
+    lines = []
+    for key in sorted(now.keys() & before.keys()):
+        if before[key]:
+            change = (now[key] - before[key]) / before[key] * 100
+            lines.append(f"{key:<60} {before[key]:>10.4f}s -> {now[key]:>10.4f}s ({change:+.1f}%)")
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable, default: all).",
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON results to this file.")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON results to compare against.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions for micro-benchmarks.")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per fake LLM call.")
+    parser.add_argument("--llm-output-tokens", type=int, default=300, help="Tokens per fake LLM answer.")
+    parser.add_argument("--listing-rows", type=int, default=20000, help="Rows seeded for listings.")
+    options = parser.parse_args()
+
+    results: Dict[str, object] = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "options": {
+                "repeat": options.repeat,
+                "llm_latency": options.llm_latency,
+                "llm_output_tokens": options.llm_output_tokens,
+                "listing_rows": options.listing_rows,
+            },
+        },
+        "scenarios": {},
+    }
+    with tempfile.TemporaryDirectory() as scratch, ArticleServer(
+        build_corpus()
+    ) as articles, FakeLLMServer(
+        latency=options.llm_latency, output_tokens=options.llm_output_tokens
+    ) as llm:
+        context = Context(options, Path(scratch), articles, llm)
+        for name in options.scenario or SCENARIOS:
+            print(f"running {name} ...", file=sys.stderr)
+            try:
+                outcome = {"status": "ok", **SCENARIOS[name](context)}
+            except Exception as exc:  # noqa: BLE001 - one broken scenario must not stop the suite
+                outcome = {
+                    "status": "error",
+                    "error": f"{type(exc).__name__}: {exc}".splitlines()[0],
+                    "traceback": traceback.format_exc(limit=3),
+                }
+            results["scenarios"][name] = outcome
+
+    rendered = json.dumps(results, indent=2)
+    if options.output:
+        options.output.write_text(rendered + "\n", encoding="utf-8")
+    else:
+        print(rendered)
+    if options.compare:
+        baseline = json.loads(options.compare.read_text(encoding="utf-8"))
+        print(f"compared with {baseline['meta'].get('commit', 'unknown')}:", file=sys.stderr)
+        for line in compare(results, baseline):
+            print(line, file=sys.stderr)
+    failed = [name for name, outcome in results["scenarios"].items() if outcome["status"] != "ok"]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
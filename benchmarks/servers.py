@@ -0,0 +1,174 @@
+"""Local stand-ins for article sites and an OpenAI-compatible LLM endpoint."""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+from tokens import CHARS_PER_TOKEN, estimate_tokens
+
+_MARKER = re.compile(r"^=== ([A-Z]+) ===$", re.MULTILINE)
+_FILLER = "The article's claims rest on the cited figures and should be checked against the source data. "
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):  # noqa: A002 - signature fixed by the base class
+        pass
+
+
+class _BackgroundServer:
+    handler_class = _QuietHandler
+
+    def __init__(self):
+        self.requests = 0
+        self._lock = threading.Lock()
+        owner = self
+
+        class Handler(self.handler_class):
+            server_owner = owner
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _ArticleHandler(_QuietHandler):
+    def do_GET(self):
+        owner = self.server_owner
+        owner.count_request()
+        name = self.path.rsplit("/", 1)[-1].split("?", 1)[0]
+        if name.endswith(".html"):
+            name = name[: -len(".html")]
+        page = owner.pages.get(name)
+        if page is None:
+            self.send_error(404)
+            return
+        etag = owner.etags[name]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(page)
+
+
+class ArticleServer(_BackgroundServer):
+    """Serve a corpus of pages at ``/articles/<name>.html`` with ETag support."""
+
+    handler_class = _ArticleHandler
+
+    def __init__(self, pages: Dict[str, str]):
+        self.pages = {name: html.encode("utf-8") for name, html in pages.items()}
+        self.etags = {
+            name: '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+            for name, body in self.pages.items()
+        }
+        super().__init__()
+
+    def url(self, name: str) -> str:
+        return f"{self.base_url}/articles/{name}.html"
+
+
+class _CompletionHandler(_QuietHandler):
+    def do_POST(self):
+        owner = self.server_owner
+        owner.count_request()
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        prompt = "\n".join(str(message.get("content", "")) for message in payload.get("messages", []))
+        owner.record_prompt(prompt)
+        if owner.latency:
+            time.sleep(owner.latency)
+        content = owner.completion_for(prompt)
+        body = json.dumps(
+            {
+                "id": f"bench-{owner.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model", "benchmark"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": estimate_tokens(prompt),
+                    "completion_tokens": estimate_tokens(content),
+                    "total_tokens": estimate_tokens(prompt) + estimate_tokens(content),
+                },
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeLLMServer(_BackgroundServer):
+    """OpenAI-compatible ``/v1/chat/completions`` endpoint with canned answers.
+
+    Each response waits ``latency`` seconds and returns roughly
+    ``output_tokens`` tokens. Section markers found in the prompt are echoed
+    so single-pass responses parse like a real model's would.
+    """
+
+    handler_class = _CompletionHandler
+
+    def __init__(self, *, latency: float = 0.0, output_tokens: int = 300):
+        self.latency = latency
+        self.output_tokens = output_tokens
+        self.prompt_tokens = 0
+        super().__init__()
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    def record_prompt(self, prompt: str) -> None:
+        with self._lock:
+            self.prompt_tokens += estimate_tokens(prompt)
+
+    def completion_for(self, prompt: str) -> str:
+        markers = list(dict.fromkeys(_MARKER.findall(prompt)))
+        if not markers:
+            return self._filler(self.output_tokens)
+        per_section = max(1, self.output_tokens // len(markers))
+        return "\n\n".join(f"=== {kind} ===\n{self._filler(per_section)}" for kind in markers)
+
+    @staticmethod
+    def _filler(tokens: int) -> str:
+        chars = tokens * CHARS_PER_TOKEN
+        text = (_FILLER * (chars // len(_FILLER) + 1))[:chars]
+        return "- " + text.strip()
@@ -0,0 +1,125 @@
+"""Startup-time regression check for the lightweight CLI commands.
+
+Runs ``show-config``, ``history`` and ``cache`` in fresh interpreters against a
+scratch database and fails when any of them is slower than the threshold or
+when importing ``main`` pulls in the analysis stack.
+
+    python benchmarks/startup.py --runs 5 --threshold 1.0 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = (("show-config",), ("history",), ("cache",))
+
+# Modules that must only be imported once an analysis actually runs.
+HEAVY_MODULES = (
+    "crewai",
+    "agents",
+    "tasks",
+    "pipeline",
+    "bs4",
+)
+
+
+def time_command(args, env, cwd) -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(ROOT / "main.py"), *args],
+        cwd=cwd,
+        env=env,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - started
+
+
+def heavy_imports(env, cwd) -> list:
+    probe = (
+        "import json, sys\n"
+        f"sys.path.insert(0, {str(ROOT)!r})\n"
+        "import main\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=cwd, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per command (median is reported).")
+    parser.add_argument(
+        "--threshold", type=float, default=1.0, help="Maximum median seconds per command."
+    )
+    parser.add_argument("--json", type=Path, help="Also write the results to this JSON file.")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(
+            os.environ,
+            DATABASE_PATH=str(Path(scratch) / "bench.db"),
+            OUTPUT_DIR=str(Path(scratch) / "output"),
+        )
+        # One untimed run creates the database so migrations are not measured.
+        time_command(("cache",), env, scratch)
+
+        results = []
+        for command in COMMANDS:
+            samples = [time_command(command, env, scratch) for _ in range(options.runs)]
+            results.append(
+                {
+                    "command": " ".join(command),
+                    "median_seconds": round(statistics.median(samples), 4),
+                    "max_seconds": round(max(samples), 4),
+                    "runs": options.runs,
+                }
+            )
+        leaked = heavy_imports(env, scratch)
+
+    failures = [
+        f"{result['command']} took {result['median_seconds']:.2f}s "
+        f"(threshold {options.threshold:.2f}s)"
+        for result in results
+        if result["median_seconds"] > options.threshold
+    ]
+    if leaked:
+        failures.append(f"importing main loads: {', '.join(leaked)}")
+
+    for result in results:
+        print(
+            f"{result['command']:<12} median {result['median_seconds']:.3f}s  "
+            f"max {result['max_seconds']:.3f}s"
+        )
+    if options.json:
+        options.json.write_text(
+            json.dumps(
+                {
+                    "benchmark": "startup",
+                    "threshold_seconds": options.threshold,
+                    "results": results,
+                    "heavy_imports": leaked,
+                    "passed": not failures,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
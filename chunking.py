@@ -0,0 +1,173 @@
+import hashlib
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import List, Optional, Sequence
+
+from tokens import estimate_tokens
+
+PARAGRAPH_SEPARATOR = "\n\n"
+
+
+@dataclass
+class Paragraph:
+    index: int
+    text: str
+
+    @property
+    def label(self) -> str:
+        return f"[P{self.index}]"
+
+
+@dataclass
+class ArticleChunk:
+    index: int
+    paragraphs: List[Paragraph]
+    tokens: int
+
+    @property
+    def first_paragraph(self) -> int:
+        return self.paragraphs[0].index
+
+    @property
+    def last_paragraph(self) -> int:
+        return self.paragraphs[-1].index
+
+    def render(self) -> str:
+        """Return the chunk text with every paragraph prefixed by its label."""
+        return PARAGRAPH_SEPARATOR.join(
+            f"{paragraph.label} {paragraph.text}" for paragraph in self.paragraphs
+        )
+
+
+def split_paragraphs(body: str) -> List[Paragraph]:
+    """Split an extracted article body into 1-indexed paragraphs."""
+    texts = [text.strip() for text in body.split(PARAGRAPH_SEPARATOR)]
+    return [
+        Paragraph(index=position, text=text)
+        for position, text in enumerate(filter(None, texts), start=1)
+    ]
+
+
+def paragraph_hash(text: str) -> str:
+    """Hash a paragraph, ignoring differences in whitespace."""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def paragraph_hashes(body: str) -> List[str]:
+    return [paragraph_hash(paragraph.text) for paragraph in split_paragraphs(body)]
+
+
+@dataclass
+class ParagraphDiff:
+    """Paragraph-level changes between two versions of an article body."""
+
+    changed: List[Paragraph] = field(default_factory=list)
+    added: List[Paragraph] = field(default_factory=list)
+    removed: List[Paragraph] = field(default_factory=list)
+    # Previous wording of the changed paragraphs, numbered as in the old version.
+    replaced: List[Paragraph] = field(default_factory=list)
+    total_tokens: int = 0
+
+    @property
+    def updated(self) -> List[Paragraph]:
+        """Changed and added paragraphs of the new version, in article order."""
+        return sorted(self.changed + self.added, key=lambda paragraph: paragraph.index)
+
+    @property
+    def outdated(self) -> List[Paragraph]:
+        """Removed and replaced paragraphs of the previous version, in article order."""
+        return sorted(self.replaced + self.removed, key=lambda paragraph: paragraph.index)
+
+    @property
+    def change_ratio(self) -> float:
+        """Size of the edit relative to the new body, in estimated tokens."""
+        edited = sum(
+            estimate_tokens(paragraph.text) for paragraph in self.updated + self.outdated
+        )
+        return edited / max(1, self.total_tokens)
+
+    def describe(self) -> str:
+        counts = [
+            f"{len(paragraphs)} {name}"
+            for name, paragraphs in (
+                ("changed", self.changed),
+                ("added", self.added),
+                ("removed", self.removed),
+            )
+            if paragraphs
+        ]
+        if not counts:
+            return "no paragraph changes"
+        labels = _label_ranges([paragraph.index for paragraph in self.updated])
+        return ", ".join(counts) + (f" ({labels})" if labels else "")
+
+
+def diff_paragraphs(
+    previous_body: str, body: str, previous_hashes: Optional[Sequence[str]] = None
+) -> ParagraphDiff:
+    """Compare two versions of an article paragraph by paragraph.
+
+    ``previous_hashes`` are the stored hashes of ``previous_body``; they are
+    recomputed when missing.
+    """
+    old = split_paragraphs(previous_body)
+    new = split_paragraphs(body)
+    old_hashes = list(previous_hashes or ())
+    if len(old_hashes) != len(old):
+        old_hashes = [paragraph_hash(paragraph.text) for paragraph in old]
+    new_hashes = [paragraph_hash(paragraph.text) for paragraph in new]
+
+    diff = ParagraphDiff(total_tokens=sum(estimate_tokens(paragraph.text) for paragraph in new))
+    matcher = SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag == "replace":
+            diff.changed.extend(new[new_start:new_end])
+            diff.replaced.extend(old[old_start:old_end])
+        elif tag == "insert":
+            diff.added.extend(new[new_start:new_end])
+        elif tag == "delete":
+            diff.removed.extend(old[old_start:old_end])
+    return diff
+
+
+def _label_ranges(indexes: Sequence[int]) -> str:
+    ranges: List[List[int]] = []
+    for index in indexes:
+        if ranges and index == ranges[-1][1] + 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+    return ", ".join(
+        f"[P{first}]" if first == last else f"[P{first}]-[P{last}]" for first, last in ranges
+    )
+
+
+def chunk_article(body: str, token_budget: int) -> List[ArticleChunk]:
+    """Greedily pack consecutive paragraphs into chunks of at most ``token_budget``.
+
+    Paragraphs are never split, so a single paragraph larger than the budget
+    becomes a chunk of its own.
+    """
+    return chunk_paragraphs(split_paragraphs(body), token_budget)
+
+
+def chunk_paragraphs(paragraphs: Sequence[Paragraph], token_budget: int) -> List[ArticleChunk]:
+    """Like :func:`chunk_article`, for paragraphs that keep their own indices."""
+    chunks: List[ArticleChunk] = []
+    current: List[Paragraph] = []
+    current_tokens = 0
+    for paragraph in paragraphs:
+        tokens = estimate_tokens(f"{paragraph.label} {paragraph.text}")
+        if current and current_tokens + tokens > token_budget:
+            chunks.append(
+                ArticleChunk(index=len(chunks) + 1, paragraphs=current, tokens=current_tokens)
+            )
+            current, current_tokens = [], 0
+        current.append(paragraph)
+        current_tokens += tokens
+    if current:
+        chunks.append(
+            ArticleChunk(index=len(chunks) + 1, paragraphs=current, tokens=current_tokens)
+        )
+    return chunks
@@ -0,0 +1,146 @@
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import List, Set, Tuple
+
+from chunking import PARAGRAPH_SEPARATOR, Paragraph, split_paragraphs
+from tokens import count_tokens
+
+# Bump when the rules below change; cached sections are keyed on it.
+COMPACTION_VERSION = 1
+
+# Site chrome that extractors pick up as paragraphs. Only short paragraphs are
+# matched, so an article that is itself about cookies or newsletters keeps its text.
+_BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"\b(we|this (site|website)) uses? cookies\b",
+        r"\bcookie (policy|settings|preferences)\b",
+        r"\baccept (all )?cookies\b",
+        r"\bsign up for (our|the)\b.*\bnewsletter\b",
+        r"\bsubscribe (to|for|now|today)\b",
+        r"\b(already a )?subscriber\?",
+        r"\b(related|recommended|more) (stories|articles|reading|coverage)\b",
+        r"^(read more|see also|more from|most popular|trending)\b",
+        r"\bshare (this|on) (article|story|facebook|twitter|x|linkedin)\b",
+        r"\bfollow us on\b",
+        r"\ball rights reserved\b",
+        r"^(advertisement|sponsored( content)?|ad)$",
+        r"\bclick here to\b",
+        r"\bsupport (our|independent) journalism\b",
+        r"\b(this (article|story) (was|has been) (originally )?published|appeared originally)\b",
+        r"^(photo|image|credit|illustration)( credit)?:",
+        r"\benable javascript\b",
+        r"\bsign in to (comment|continue)\b",
+    )
+]
+_BOILERPLATE_MAX_WORDS = 40
+
+# Pull quotes and repeated blurbs of this many words are dropped when their
+# text already appeared inside an earlier paragraph.
+_QUOTE_MIN_WORDS = 4
+_QUOTE_MAX_WORDS = 60
+
+_ZERO_WIDTH = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff"))
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+@dataclass
+class CompactedArticle:
+    content: str
+    original_tokens: int
+    compacted_tokens: int
+    boilerplate: int = 0
+    duplicates: int = 0
+    truncated: int = 0
+    # The kept paragraphs under their index in the original article, so
+    # [P#] labels cite the extracted article rather than the compacted text.
+    paragraphs: List[Paragraph] = field(default_factory=list)
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+    def describe(self) -> str:
+        saved = self.saved_tokens / self.original_tokens if self.original_tokens else 0.0
+        summary = f"{self.original_tokens:,} -> {self.compacted_tokens:,} tokens (-{saved:.0%})"
+        dropped = [
+            f"{count} {name}"
+            for name, count in (
+                ("boilerplate", self.boilerplate),
+                ("duplicate", self.duplicates),
+                ("over budget", self.truncated),
+            )
+            if count
+        ]
+        if dropped:
+            summary += f"; dropped paragraphs: {', '.join(dropped)}"
+        return summary
+
+
+def compact_article(body: str, *, token_budget: int = 0) -> CompactedArticle:
+    """Strip site chrome and repeated paragraphs and fit the body to ``token_budget``.
+
+    Paragraph order is preserved. With a budget, paragraphs are kept from the
+    start of the article until the budget is reached, and a note records how
+    many were left out. ``0`` means no budget.
+    """
+    kept: List[Paragraph] = []
+    seen: Set[str] = set()
+    seen_text = ""
+    compacted = CompactedArticle(
+        content="", original_tokens=count_tokens(body), compacted_tokens=0
+    )
+    for paragraph in split_paragraphs(body):
+        text = normalize_whitespace(paragraph.text)
+        if not text:
+            continue
+        words = len(text.split())
+        if words <= _BOILERPLATE_MAX_WORDS and any(
+            pattern.search(text) for pattern in _BOILERPLATE_PATTERNS
+        ):
+            compacted.boilerplate += 1
+            continue
+        key = _comparison_key(text)
+        quote = _QUOTE_MIN_WORDS <= words <= _QUOTE_MAX_WORDS and f" {key} " in seen_text
+        if key in seen or quote:
+            compacted.duplicates += 1
+            continue
+        seen.add(key)
+        seen_text += f" {key} "
+        kept.append(Paragraph(index=paragraph.index, text=text))
+
+    texts = [paragraph.text for paragraph in kept]
+    if token_budget > 0:
+        texts, compacted.truncated = _fit_budget(texts, token_budget)
+    compacted.paragraphs = kept[: len(kept) - compacted.truncated]
+    compacted.content = PARAGRAPH_SEPARATOR.join(texts)
+    compacted.compacted_tokens = count_tokens(compacted.content)
+    return compacted
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of whitespace, including non-breaking and zero-width spaces."""
+    text = unicodedata.normalize("NFKC", text).translate(_ZERO_WIDTH)
+    return " ".join(text.split())
+
+
+def _comparison_key(text: str) -> str:
+    return " ".join(_PUNCTUATION.sub(" ", text.lower()).split())
+
+
+def _fit_budget(paragraphs: List[str], token_budget: int) -> Tuple[List[str], int]:
+    kept: List[str] = []
+    used = 0
+    for index, paragraph in enumerate(paragraphs):
+        tokens = count_tokens(paragraph) + 1
+        if kept and used + tokens > token_budget:
+            omitted = len(paragraphs) - index
+            kept.append(
+                f"[{omitted} more paragraph{'s' if omitted != 1 else ''} omitted to fit "
+                f"the {token_budget:,} token budget.]"
+            )
+            return kept, omitted
+        kept.append(paragraph)
+        used += tokens
+    return kept, 0
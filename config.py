@@ -1,10 +1,24 @@
 import os
 from dataclasses import dataclass, replace
+from datetime import timedelta
 from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
 
+# "auto" loads every configured backend and routes each task to the fastest healthy one.
+MODEL_PROVIDERS = ("openrouter", "ollama", "auto")
+
+EXECUTION_MODES = ("sequential", "parallel")
+
+# "use" reads and writes cached sections, "refresh" recomputes and overwrites
+# them, "bypass" neither reads nor writes the cache.
+CACHE_POLICIES = ("use", "refresh", "bypass")
+
+# "chunked" only takes effect for articles larger than the chunk token budget;
+# "single-pass" falls back to per-task prompts when its response cannot be parsed.
+ANALYSIS_STRATEGIES = ("standard", "chunked", "single-pass")
+
 
 @dataclass(frozen=True)
 class Settings:
@@ -17,6 +31,67 @@ class Settings:
     output_dir: Path
     database_path: Path
     verbose: bool = False
+    fetch_concurrency: int = 4
+    analysis_concurrency: int = 2
+    write_concurrency: int = 1
+    execution_mode: str = "sequential"
+    task_timeout: Optional[float] = 600.0
+    cache_policy: str = "use"
+    analysis_strategy: str = "standard"
+    chunk_token_budget: int = 3000
+    chunk_concurrency: int = 4
+    http_pool_size: int = 10
+    article_ttl: Optional[timedelta] = timedelta(hours=24)
+    html_extractor: str = "auto"
+    max_download_bytes: Optional[int] = 10_000_000
+    max_parse_chars: Optional[int] = 5_000_000
+    extract_processes: int = 0
+    # prefetch politeness: concurrent requests per host and the minimum
+    # seconds between the starts of two requests to the same host.
+    prefetch_host_concurrency: int = 2
+    prefetch_host_delay: float = 1.0
+    openrouter_base_url: str = "https://openrouter.ai/api/v1"
+    server_host: str = "127.0.0.1"
+    server_port: int = 8765
+    server_queue_size: int = 100
+    job_lease: timedelta = timedelta(minutes=10)
+    job_max_attempts: int = 3
+    job_retry_delay: timedelta = timedelta(seconds=30)
+    job_poll_interval: float = 2.0
+    # Largest edit, as a fraction of the article, re-analyzed from the diff
+    # instead of from scratch; 0 disables incremental re-analysis.
+    incremental_max_change: float = 0.5
+    # SimHash similarity above which a new article starts from the cached
+    # analysis of its nearest cached neighbour; 0 disables the lookup.
+    near_duplicate_threshold: float = 0.9
+    # Strip boilerplate and duplicate paragraphs before prompting; a positive
+    # budget also trims the article to that many tokens. Off by default:
+    # switching it on re-keys, and so recomputes, every cached section.
+    compaction: bool = False
+    compaction_token_budget: int = 0
+    # Client-side limits per LLM provider; 0 leaves a rate unlimited.
+    llm_requests_per_second: float = 0.0
+    llm_tokens_per_minute: int = 0
+    llm_max_in_flight: int = 8
+    llm_max_retries: int = 3
+    llm_retry_base_delay: float = 1.0
+    # Routing mode only: send a second request to the next backend once the
+    # first has run longer than this percentile of its recent latency.
+    routing_hedge: bool = False
+    routing_hedge_percentile: float = 0.9
+    # CrewAI memory for agents: off, agent (one store per agent) or shared
+    # (one store for every agent in the process). Pooled agents serve many
+    # articles, so any memory carries context from one analysis to the next.
+    agent_memory: str = "off"
+
+    @property
+    def model_name(self) -> str:
+        """Name of the model served by the active provider."""
+        if self.model_provider == "openrouter":
+            return self.openrouter_model
+        if self.model_provider == "auto":
+            return f"{self.openrouter_model} | {self.ollama_model}"
+        return self.ollama_model
 
     def with_overrides(
         self,
@@ -25,6 +100,17 @@ class Settings:
         output_dir: Optional[Path] = None,
         database_path: Optional[Path] = None,
         verbose: Optional[bool] = None,
+        fetch_concurrency: Optional[int] = None,
+        analysis_concurrency: Optional[int] = None,
+        write_concurrency: Optional[int] = None,
+        execution_mode: Optional[str] = None,
+        task_timeout: Optional[float] = None,
+        cache_policy: Optional[str] = None,
+        analysis_strategy: Optional[str] = None,
+        chunk_token_budget: Optional[int] = None,
+        chunk_concurrency: Optional[int] = None,
+        html_extractor: Optional[str] = None,
+        extract_processes: Optional[int] = None,
     ) -> "Settings":
         """Return a copy of the settings with provided overrides applied."""
         return replace(
@@ -33,6 +119,27 @@ class Settings:
             output_dir=(output_dir or self.output_dir),
             database_path=(database_path or self.database_path),
             verbose=self.verbose if verbose is None else verbose,
+            fetch_concurrency=(
+                self.fetch_concurrency if fetch_concurrency is None else fetch_concurrency
+            ),
+            analysis_concurrency=(
+                self.analysis_concurrency
+                if analysis_concurrency is None
+                else analysis_concurrency
+            ),
+            write_concurrency=(
+                self.write_concurrency if write_concurrency is None else write_concurrency
+            ),
+            execution_mode=execution_mode or self.execution_mode,
+            task_timeout=self.task_timeout if task_timeout is None else task_timeout,
+            cache_policy=cache_policy or self.cache_policy,
+            analysis_strategy=analysis_strategy or self.analysis_strategy,
+            chunk_token_budget=chunk_token_budget or self.chunk_token_budget,
+            chunk_concurrency=chunk_concurrency or self.chunk_concurrency,
+            html_extractor=html_extractor or self.html_extractor,
+            extract_processes=(
+                self.extract_processes if extract_processes is None else extract_processes
+            ),
         )
 
 
@@ -51,6 +158,45 @@ def load_settings() -> Settings:
         os.getenv("DATABASE_PATH", "data/analysis.db")
     ).expanduser().resolve()
 
+    fetch_concurrency = int(os.getenv("FETCH_CONCURRENCY", "4"))
+    analysis_concurrency = int(os.getenv("ANALYSIS_CONCURRENCY", "2"))
+    write_concurrency = int(os.getenv("WRITE_CONCURRENCY", "1"))
+    execution_mode = os.getenv("EXECUTION_MODE", "sequential").strip().lower()
+    task_timeout = float(os.getenv("TASK_TIMEOUT", "600")) or None
+    cache_policy = os.getenv("RESULT_CACHE", "use").strip().lower()
+    analysis_strategy = os.getenv("ANALYSIS_STRATEGY", "standard").strip().lower()
+    chunk_token_budget = int(os.getenv("CHUNK_TOKEN_BUDGET", "3000"))
+    chunk_concurrency = int(os.getenv("CHUNK_CONCURRENCY", "4"))
+    http_pool_size = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    article_ttl_seconds = float(os.getenv("ARTICLE_TTL", "86400"))
+    article_ttl = timedelta(seconds=article_ttl_seconds) if article_ttl_seconds > 0 else None
+    html_extractor = os.getenv("HTML_EXTRACTOR", "auto").strip().lower()
+    max_download_bytes = int(os.getenv("MAX_DOWNLOAD_BYTES", "10000000")) or None
+    max_parse_chars = int(os.getenv("MAX_PARSE_CHARS", "5000000")) or None
+    extract_processes = int(os.getenv("EXTRACT_PROCESSES", "0"))
+    prefetch_host_concurrency = int(os.getenv("PREFETCH_HOST_CONCURRENCY", "2"))
+    prefetch_host_delay = float(os.getenv("PREFETCH_HOST_DELAY", "1"))
+    openrouter_base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+    server_host = os.getenv("SERVER_HOST", "127.0.0.1")
+    server_port = int(os.getenv("SERVER_PORT", "8765"))
+    server_queue_size = int(os.getenv("SERVER_QUEUE_SIZE", "100"))
+    job_lease = timedelta(seconds=float(os.getenv("JOB_LEASE", "600")))
+    job_max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    job_retry_delay = timedelta(seconds=float(os.getenv("JOB_RETRY_DELAY", "30")))
+    job_poll_interval = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+    incremental_max_change = float(os.getenv("INCREMENTAL_MAX_CHANGE", "0.5"))
+    near_duplicate_threshold = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+    compaction = os.getenv("COMPACTION", "false").strip().lower() in {"1", "true", "yes"}
+    compaction_token_budget = int(os.getenv("COMPACTION_TOKEN_BUDGET", "0"))
+    llm_requests_per_second = float(os.getenv("LLM_REQUESTS_PER_SECOND", "0"))
+    llm_tokens_per_minute = int(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+    llm_max_in_flight = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+    llm_max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    llm_retry_base_delay = float(os.getenv("LLM_RETRY_BASE_DELAY", "1"))
+    routing_hedge = os.getenv("ROUTING_HEDGE", "false").strip().lower() in {"1", "true", "yes"}
+    routing_hedge_percentile = float(os.getenv("ROUTING_HEDGE_PERCENTILE", "0.9"))
+    agent_memory = os.getenv("AGENT_MEMORY", "off").strip().lower()
+
     return Settings(
         model_provider=model_provider,
         openrouter_api_key=openrouter_api_key,
@@ -58,4 +204,41 @@ def load_settings() -> Settings:
         ollama_model=ollama_model,
         output_dir=output_dir,
         database_path=database_path,
+        fetch_concurrency=fetch_concurrency,
+        analysis_concurrency=analysis_concurrency,
+        write_concurrency=write_concurrency,
+        execution_mode=execution_mode,
+        task_timeout=task_timeout,
+        cache_policy=cache_policy,
+        analysis_strategy=analysis_strategy,
+        chunk_token_budget=chunk_token_budget,
+        chunk_concurrency=chunk_concurrency,
+        http_pool_size=http_pool_size,
+        article_ttl=article_ttl,
+        html_extractor=html_extractor,
+        max_download_bytes=max_download_bytes,
+        max_parse_chars=max_parse_chars,
+        extract_processes=extract_processes,
+        prefetch_host_concurrency=prefetch_host_concurrency,
+        prefetch_host_delay=prefetch_host_delay,
+        openrouter_base_url=openrouter_base_url,
+        server_host=server_host,
+        server_port=server_port,
+        server_queue_size=server_queue_size,
+        job_lease=job_lease,
+        job_max_attempts=job_max_attempts,
+        job_retry_delay=job_retry_delay,
+        job_poll_interval=job_poll_interval,
+        incremental_max_change=incremental_max_change,
+        near_duplicate_threshold=near_duplicate_threshold,
+        compaction=compaction,
+        compaction_token_budget=compaction_token_budget,
+        llm_requests_per_second=llm_requests_per_second,
+        llm_tokens_per_minute=llm_tokens_per_minute,
+        llm_max_in_flight=llm_max_in_flight,
+        llm_max_retries=llm_max_retries,
+        llm_retry_base_delay=llm_retry_base_delay,
+        routing_hedge=routing_hedge,
+        routing_hedge_percentile=routing_hedge_percentile,
+        agent_memory=agent_memory,
     )
@@ -0,0 +1,207 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Elements whose text BeautifulSoup's get_text() leaves out.
+_NON_TEXT_TAGS = frozenset({"script", "style", "template"})
+
+
+@dataclass
+class ExtractedArticle:
+    title: Optional[str]
+    content: str
+
+
+class HtmlExtractor(ABC):
+    """Turn raw article HTML into a title and ``\\n\\n``-separated paragraphs.
+
+    Every backend aims to match the output of :class:`BeautifulSoupExtractor`:
+    the title comes from the first ``<title>`` (or the first ``<h1>``), and
+    the body is the stripped text of every non-empty ``<p>`` inside the first
+    ``<article>``, or the whole document when there is none. The fast
+    backends only match on well-formed markup; ``benchmarks/parity.py``
+    lists where they differ.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def extract(self, html: str) -> ExtractedArticle:
+        """Extract the title and paragraphs of ``html``."""
+
+
+class BeautifulSoupExtractor(HtmlExtractor):
+    name = "bs4"
+
+    def extract(self, html: str) -> ExtractedArticle:
+        soup = BeautifulSoup(html, "html.parser")
+        return ExtractedArticle(
+            title=self._extract_title(soup), content=self._extract_body(soup)
+        )
+
+    @staticmethod
+    def _extract_title(soup: BeautifulSoup) -> Optional[str]:
+        if soup.title and soup.title.string:
+            return soup.title.string.strip()
+        heading = soup.find("h1")
+        if heading and heading.get_text():
+            return heading.get_text().strip()
+        return None
+
+    @staticmethod
+    def _extract_body(soup: BeautifulSoup) -> str:
+        article_tag = soup.find("article")
+        paragraphs = (
+            article_tag.find_all("p") if article_tag else soup.find_all("p")
+        )
+        text_segments = []
+        for paragraph in paragraphs:
+            text = paragraph.get_text(strip=True)
+            if text:
+                text_segments.append(text)
+        return "\n\n".join(text_segments)
+
+
+class LxmlExtractor(HtmlExtractor):
+    name = "lxml"
+
+    def extract(self, html: str) -> ExtractedArticle:
+        try:
+            document = lxml_html.document_fromstring(html)
+        except ValueError:
+            # lxml refuses str input that carries an XML encoding declaration.
+            document = lxml_html.document_fromstring(html.encode("utf-8"))
+
+        title = None
+        title_tag = document.find(".//title")
+        if title_tag is not None and len(title_tag) == 0 and title_tag.text:
+            title = title_tag.text.strip()
+        else:
+            heading = document.find(".//h1")
+            if heading is not None:
+                text = "".join(self._strings(heading))
+                title = text.strip() if text else None
+
+        article_tag = document.find(".//article")
+        root = article_tag if article_tag is not None else document
+        text_segments = []
+        for paragraph in root.iter("p"):
+            text = "".join(part.strip() for part in self._strings(paragraph))
+            if text:
+                text_segments.append(text)
+        return ExtractedArticle(title=title, content="\n\n".join(text_segments))
+
+    @staticmethod
+    def _strings(element) -> Iterator[str]:
+        # Explicit stack instead of recursion so deeply nested markup is safe.
+        # Tails are pushed before children so they are emitted after them.
+        if element.text:
+            yield element.text
+        stack: List[object] = list(reversed(element))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                yield node
+                continue
+            if node.tail:
+                stack.append(node.tail)
+            if isinstance(node.tag, str) and node.tag.lower() not in _NON_TEXT_TAGS:
+                if node.text:
+                    yield node.text
+                stack.extend(reversed(node))
+
+    @staticmethod
+    def available() -> bool:
+        return lxml_html is not None
+
+
+class SelectolaxExtractor(HtmlExtractor):
+    name = "selectolax"
+
+    def extract(self, html: str) -> ExtractedArticle:
+        tree = LexborHTMLParser(html)
+
+        title = None
+        title_tag = tree.css_first("title")
+        children = list(title_tag.iter(include_text=True)) if title_tag else []
+        if len(children) == 1 and children[0].tag == "-text" and children[0].text_content:
+            title = children[0].text_content.strip()
+        else:
+            heading = tree.css_first("h1")
+            if heading is not None:
+                text = "".join(self._strings(heading))
+                title = text.strip() if text else None
+
+        article_tag = tree.css_first("article")
+        root = article_tag if article_tag is not None else tree.root
+        text_segments = []
+        for paragraph in root.css("p") if root is not None else []:
+            text = "".join(part.strip() for part in self._strings(paragraph))
+            if text:
+                text_segments.append(text)
+        return ExtractedArticle(title=title, content="\n\n".join(text_segments))
+
+    @staticmethod
+    def _strings(node) -> Iterator[str]:
+        stack = list(node.iter(include_text=True))[::-1]
+        while stack:
+            child = stack.pop()
+            if child.tag == "-text":
+                yield child.text_content or ""
+            elif not child.tag.startswith(("-", "!", "_")) and child.tag not in _NON_TEXT_TAGS:
+                stack.extend(list(child.iter(include_text=True))[::-1])
+
+    @staticmethod
+    def available() -> bool:
+        return LexborHTMLParser is not None
+
+
+EXTRACTORS: Dict[str, Callable[[], HtmlExtractor]] = {
+    "bs4": BeautifulSoupExtractor,
+    "lxml": LxmlExtractor,
+    "selectolax": SelectolaxExtractor,
+}
+
+# Backend behind "auto". The fast backends stay opt-in until they pass
+# benchmarks/parity.py: a different extraction changes content hashes and so
+# invalidates every cached article and section.
+_AUTO_BACKEND = "bs4"
+
+
+def available_extractors() -> List[str]:
+    names = ["bs4"]
+    if LxmlExtractor.available():
+        names.append("lxml")
+    if SelectolaxExtractor.available():
+        names.append("selectolax")
+    return names
+
+
+def get_extractor(name: str = "auto") -> HtmlExtractor:
+    installed = available_extractors()
+    if name == "auto":
+        name = _AUTO_BACKEND
+    if name not in EXTRACTORS:
+        raise ValueError(
+            f"Unsupported HTML extractor '{name}'. Choose one of: auto, {', '.join(EXTRACTORS)}."
+        )
+    if name not in installed:
+        raise ValueError(f"HTML extractor '{name}' is not installed.")
+    return EXTRACTORS[name]()
+
+
+def extract_html(html: str, backend: str = "auto") -> ExtractedArticle:
+    """Module-level entry point so extraction can be shipped to a process pool."""
+    return get_extractor(backend).extract(html)
@@ -1,19 +1,36 @@
-from datetime import datetime
+import sys
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from dataclasses import replace
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
 
 import typer
-from crewai import Crew, Process
 from rich import box
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
-from agents import ArticleAnalysisAgents
-from article_service import ArticleDownloadError, ArticleService
-from config import Settings, load_settings
-from storage import AnalysisRecord, ArticleRepository
-from tasks import ArticleAnalysisTasks
+from config import (
+    ANALYSIS_STRATEGIES,
+    CACHE_POLICIES,
+    EXECUTION_MODES,
+    MODEL_PROVIDERS,
+    Settings,
+    load_settings,
+)
+from simhash import SIMHASH_BANDS, SIMHASH_BITS, is_indexed_threshold
+from storage import SEARCH_SCOPES, AnalysisRecord, ArticleRepository, JobRecord
+from telemetry import Telemetry, summarize_stages
+
+# The analysis stack (crewai, HTML parsers) takes seconds to import,
+# so commands load it on first use; show-config, history and cache never do.
+if TYPE_CHECKING:
+    from article_service import ArticlePayload
+    from batch import BatchOutcome
+    from pipeline import AnalysisPipeline, AnalysisResult, LLMUsage
+    from prefetch import PrefetchOutcome
 
 app = typer.Typer(
     add_completion=False,
@@ -22,97 +39,184 @@ app = typer.Typer(
 console = Console()
 
 
-def _build_crew(
-    settings: Settings, task_factory: ArticleAnalysisTasks
-) -> Tuple[Crew, Dict[str, object]]:
-    agents = ArticleAnalysisAgents(settings)
-
-    summarizer_agent = agents.summarizer_agent()
-    assumptions_agent = agents.assumptions_agent()
-    errors_agent = agents.errors_agent()
+@app.command()
+def analyze(
+    url: str = typer.Argument(..., help="Article URL to analyze."),
+    output_dir: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Directory where markdown reports will be written."
+    ),
+    model_provider: Optional[str] = typer.Option(
+        None,
+        "--model",
+        "-m",
+        help="Force a provider (openrouter, ollama, or auto to route per task). "
+        "Defaults to environment setting.",
+    ),
+    execution_mode: Optional[str] = typer.Option(
+        None,
+        "--execution-mode",
+        "-x",
+        help="Run report sections 'sequential' or 'parallel'. Defaults to environment setting.",
+    ),
+    task_timeout: Optional[float] = typer.Option(
+        None,
+        "--task-timeout",
+        min=0,
+        help="Seconds before a parallel section is reported as unavailable.",
+    ),
+    strategy: Optional[str] = typer.Option(
+        None,
+        "--strategy",
+        help="'standard', 'chunked' map-reduce for long articles, or 'single-pass'. "
+        "Defaults to environment setting.",
+    ),
+    chunk_tokens: Optional[int] = typer.Option(
+        None, "--chunk-tokens", min=1, help="Token budget per chunk in chunked mode."
+    ),
+    chunk_workers: Optional[int] = typer.Option(
+        None, "--chunk-workers", min=1, help="Concurrent chunk tasks in chunked mode."
+    ),
+    extractor: Optional[str] = typer.Option(
+        None,
+        "--extractor",
+        help="HTML extraction backend (auto, bs4, lxml or selectolax).",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Neither read nor write the LLM result cache."
+    ),
+    refresh_cache: bool = typer.Option(
+        False, "--refresh-cache", help="Recompute every section and overwrite cached results."
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Show and write the report section by section as the model generates it.",
+    ),
+    verbose: bool = typer.Option(
+        False,
+        "--verbose",
+        "-v",
+        help="Enable verbose CrewAI logging.",
+    ),
+) -> None:
+    """Run the full article analysis workflow."""
+    settings = _resolve_settings(
+        model_provider=model_provider,
+        output_dir=output_dir,
+        verbose=verbose,
+        execution_mode=execution_mode,
+        task_timeout=task_timeout,
+        cache_policy=_cache_policy(no_cache, refresh_cache),
+        analysis_strategy=strategy,
+        chunk_token_budget=chunk_tokens,
+        chunk_concurrency=chunk_workers,
+        html_extractor=extractor,
+    )
+    if stream and settings.analysis_strategy != "standard":
+        raise typer.BadParameter(
+            "--stream generates sections with per-task prompts; use --strategy standard."
+        )
 
-    summarize_task = task_factory.summarize_article(summarizer_agent)
-    assumptions_task = task_factory.identify_assumptions(assumptions_agent)
-    errors_task = task_factory.identify_errors(errors_agent)
+    from pipeline import AnalysisPipeline
 
-    crew = Crew(
-        agents=[summarizer_agent, assumptions_agent, errors_agent],
-        tasks=[summarize_task, assumptions_task, errors_task],
-        process=Process.sequential,
-        verbose=settings.verbose,
-    )
-    return crew, {
-        "summary": summarize_task,
-        "assumptions": assumptions_task,
-        "errors": errors_task,
-    }
+    pipeline = AnalysisPipeline(settings)
+    try:
+        _run_analysis(pipeline, settings, url, stream=stream)
+    finally:
+        pipeline.close()
 
 
-def _task_output(task: object) -> str:
-    for attr in ("output", "result", "raw_output"):
-        value = getattr(task, attr, None)
-        if value:
-            return str(value)
-    return ""
+def _run_analysis(
+    pipeline: "AnalysisPipeline", settings: Settings, url: str, *, stream: bool = False
+) -> None:
+    from article_service import ArticleDownloadError
 
+    telemetry = Telemetry()
+    try:
+        article_payload = pipeline.fetch(url, telemetry=telemetry)
+    except ArticleDownloadError as exc:
+        console.print(
+            Panel(str(exc), title="Download Error", style="bold red", box=box.ROUNDED)
+        )
+        raise typer.Exit(code=1)
 
-def _compose_report(
-    *,
-    url: str,
-    title: Optional[str],
-    summary_md: str,
-    assumptions_md: str,
-    errors_md: str,
-    settings: Settings,
-) -> str:
-    generated_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-    model_name = (
-        settings.openrouter_model
-        if settings.model_provider == "openrouter"
-        else settings.ollama_model
+    console.print(
+        Panel(
+            "\n".join(
+                [
+                    f"[bold]Model Provider:[/bold] {settings.model_provider}",
+                    f"[bold]Execution Mode:[/bold] {settings.execution_mode}",
+                    f"[bold]Analysis Strategy:[/bold] {settings.analysis_strategy}",
+                    f"[bold]Result Cache:[/bold] {settings.cache_policy}",
+                    f"[bold]Output Directory:[/bold] {settings.output_dir}",
+                    f"[bold]Article Cached:[/bold] {article_payload.record.fetched_at.isoformat()}",
+                ]
+            ),
+            title="Analysis Configuration",
+            box=box.ROUNDED,
+        )
     )
 
-    return "\n".join(
-        [
-            "# Article Intelligence Report",
-            "",
-            "## Document Metadata",
-            f"- **URL:** {url}",
-            f"- **Title:** {title or 'Unknown'}",
-            f"- **Generated:** {generated_at}",
-            f"- **Model:** {model_name} ({settings.model_provider})",
-            "",
-            "## Executive Summary",
-            summary_md.strip() or "_No summary returned._",
-            "",
-            "## Authorial Assumptions",
-            assumptions_md.strip() or "_No assumptions identified._",
-            "",
-            "## Potential Errors & Biases",
-            errors_md.strip() or "_No potential issues detected._",
-            "",
-            "> _Report generated by the Article Analysis Agent._",
-        ]
+    if stream:
+        result, output_path = _stream_analysis(pipeline, url, article_payload, telemetry)
+    else:
+        result = pipeline.analyze(url, article_payload, telemetry=telemetry)
+        output_path = pipeline.write(result)
+
+    console.print(
+        Panel(
+            f"Report written to [bold]{output_path}[/bold]\n"
+            f"Result cache: {_format_cache_counts(len(result.cache_hits), len(result.cache_misses))}\n"
+            f"LLM usage ({result.strategy}): {_format_usage(result.usage)}"
+            + (f"\nArticle input: {result.compaction.describe()}" if result.compaction else ""),
+            title="Analysis Complete",
+            style="green",
+            box=box.DOUBLE,
+        )
     )
 
+    if not stream:
+        console.print(Panel(result.report, title="Article Analysis Report", box=box.ROUNDED))
 
-def _slugify(value: str) -> str:
-    cleaned = "".join(ch.lower() if ch.isalnum() else "-" for ch in value)
-    collapsed = "-".join(filter(None, cleaned.split("-")))
-    return collapsed or "article"
 
+def _stream_analysis(
+    pipeline: "AnalysisPipeline",
+    url: str,
+    article: "ArticlePayload",
+    telemetry: Telemetry,
+) -> Tuple["AnalysisResult", Path]:
+    """Render the report live while sections stream into the output file."""
+    from rich.live import Live
+    from rich.markdown import Markdown
 
-def _derive_output_path(settings: Settings, title: Optional[str], url: str) -> Path:
-    timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-    base = title or url
-    slug = _slugify(base)[:60]
-    filename = f"{timestamp}-{slug}.md"
-    return settings.output_dir / filename
+    with Live(console=console, refresh_per_second=4, vertical_overflow="visible") as live:
 
+        def show(text: str) -> None:
+            live.update(Panel(Markdown(text), title="Article Analysis Report", box=box.ROUNDED))
 
-@app.command()
-def analyze(
-    url: str = typer.Argument(..., help="Article URL to analyze."),
+        report_stream = pipeline.open_stream(url, article, on_update=show)
+        console.print(f"Streaming report to [bold]{report_stream.path}[/bold]")
+        try:
+            result = pipeline.analyze(url, article, telemetry=telemetry, stream=report_stream)
+            output_path = pipeline.write(result, stream=report_stream)
+        except KeyboardInterrupt:
+            report_stream.abort("interrupted before all sections were generated")
+            live.stop()
+            console.print(
+                f"[yellow]Interrupted.[/yellow] Partial report kept at {report_stream.path}"
+            )
+            raise typer.Exit(code=130)
+        except Exception as exc:
+            report_stream.abort(f"generation failed ({str(exc) or type(exc).__name__})")
+            raise
+    return result, output_path
+
+
+@app.command("analyze-many")
+def analyze_many(
+    source: str = typer.Argument(
+        "-", help="File with one URL per line, or '-' to read URLs from stdin."
+    ),
     output_dir: Optional[Path] = typer.Option(
         None, "--output", "-o", help="Directory where markdown reports will be written."
     ),
@@ -120,7 +224,58 @@ def analyze(
         None,
         "--model",
         "-m",
-        help="Force a provider (openrouter or ollama). Defaults to environment setting.",
+        help="Force a provider (openrouter, ollama, or auto to route per task). "
+        "Defaults to environment setting.",
+    ),
+    fetch_workers: Optional[int] = typer.Option(
+        None, "--fetch-workers", min=1, help="Concurrent article downloads."
+    ),
+    analysis_workers: Optional[int] = typer.Option(
+        None, "--analysis-workers", min=1, help="Concurrent crew executions."
+    ),
+    write_workers: Optional[int] = typer.Option(
+        None, "--write-workers", min=1, help="Concurrent report writers."
+    ),
+    extract_processes: Optional[int] = typer.Option(
+        None,
+        "--extract-processes",
+        min=0,
+        help="Worker processes for HTML parsing; 0 parses on the fetch threads.",
+    ),
+    execution_mode: Optional[str] = typer.Option(
+        None,
+        "--execution-mode",
+        "-x",
+        help="Run report sections 'sequential' or 'parallel'. Defaults to environment setting.",
+    ),
+    task_timeout: Optional[float] = typer.Option(
+        None,
+        "--task-timeout",
+        min=0,
+        help="Seconds before a parallel section is reported as unavailable.",
+    ),
+    strategy: Optional[str] = typer.Option(
+        None,
+        "--strategy",
+        help="'standard', 'chunked' map-reduce for long articles, or 'single-pass'. "
+        "Defaults to environment setting.",
+    ),
+    chunk_tokens: Optional[int] = typer.Option(
+        None, "--chunk-tokens", min=1, help="Token budget per chunk in chunked mode."
+    ),
+    chunk_workers: Optional[int] = typer.Option(
+        None, "--chunk-workers", min=1, help="Concurrent chunk tasks in chunked mode."
+    ),
+    extractor: Optional[str] = typer.Option(
+        None,
+        "--extractor",
+        help="HTML extraction backend (auto, bs4, lxml or selectolax).",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Neither read nor write the LLM result cache."
+    ),
+    refresh_cache: bool = typer.Option(
+        False, "--refresh-cache", help="Recompute every section and overwrite cached results."
     ),
     verbose: bool = typer.Option(
         False,
@@ -129,101 +284,517 @@ def analyze(
         help="Enable verbose CrewAI logging.",
     ),
 ) -> None:
-    """Run the full article analysis workflow."""
-    settings = load_settings()
+    """Analyze a list of URLs with overlapping fetch, analysis and write stages."""
+    settings = _resolve_settings(
+        model_provider=model_provider,
+        output_dir=output_dir,
+        verbose=verbose,
+        fetch_concurrency=fetch_workers,
+        analysis_concurrency=analysis_workers,
+        write_concurrency=write_workers,
+        execution_mode=execution_mode,
+        task_timeout=task_timeout,
+        cache_policy=_cache_policy(no_cache, refresh_cache),
+        analysis_strategy=strategy,
+        chunk_token_budget=chunk_tokens,
+        chunk_concurrency=chunk_workers,
+        html_extractor=extractor,
+        extract_processes=extract_processes,
+    )
+    urls = _read_urls(source)
+    from batch import BatchRunner
+    from pipeline import AnalysisPipeline, LLMUsage
+
+    pipeline = AnalysisPipeline(settings)
+
+    def report_progress(outcome: "BatchOutcome") -> None:
+        style = "green" if outcome.status == "succeeded" else "red"
+        console.print(f"[{style}]{outcome.status}[/{style}] {outcome.url}")
 
-    overrides = {
-        "model_provider": model_provider.lower() if model_provider else None,
-        "output_dir": output_dir.resolve() if output_dir else None,
-        "verbose": verbose,
-    }
-    settings = settings.with_overrides(
-        model_provider=overrides["model_provider"],
-        output_dir=overrides["output_dir"],
-        verbose=overrides["verbose"],
+    runner = BatchRunner(pipeline, on_complete=report_progress)
+    console.print(
+        Panel(
+            "\n".join(
+                [
+                    f"[bold]Batch ID:[/bold] {runner.batch_id}",
+                    f"[bold]Model Provider:[/bold] {settings.model_provider}",
+                    f"[bold]Output Directory:[/bold] {settings.output_dir}",
+                    "[bold]Workers (fetch/analyze/write):[/bold] "
+                    f"{settings.fetch_concurrency}/{settings.analysis_concurrency}/"
+                    f"{settings.write_concurrency}",
+                ]
+            ),
+            title="Batch Configuration",
+            box=box.ROUNDED,
+        )
     )
 
-    if settings.model_provider not in {"openrouter", "ollama"}:
-        raise typer.BadParameter(
-            f"Unsupported model provider '{settings.model_provider}'. "
-            "Please choose 'openrouter' or 'ollama'."
+    started = time.perf_counter()
+    try:
+        outcomes = runner.run(urls)
+    except (OSError, ValueError) as exc:
+        console.print(
+            Panel(
+                f"Failed to read URLs from {source}: {exc}",
+                title="Batch Error",
+                style="bold red",
+                box=box.ROUNDED,
+            )
         )
+        raise typer.Exit(code=1)
+    finally:
+        pipeline.close()
+    elapsed = time.perf_counter() - started
 
-    settings.output_dir.mkdir(parents=True, exist_ok=True)
+    if not outcomes:
+        console.print("No URLs provided.")
+        return
 
-    repository = ArticleRepository(settings.database_path)
-    service = ArticleService(repository)
+    table = Table("#", "URL", "Status", "Stage", "Seconds", "Detail", title="Batch Summary")
+    for outcome in outcomes:
+        style = "green" if outcome.status == "succeeded" else "red"
+        table.add_row(
+            str(outcome.index + 1),
+            outcome.url,
+            f"[{style}]{outcome.status}[/{style}]",
+            outcome.stage or "N/A",
+            f"{outcome.elapsed:.1f}",
+            str(outcome.output_path) if outcome.output_path else (outcome.error or ""),
+        )
+    console.print(table)
+
+    failed = sum(1 for outcome in outcomes if outcome.status != "succeeded")
+    cache_hits = sum(outcome.cache_hits for outcome in outcomes)
+    cache_misses = sum(outcome.cache_misses for outcome in outcomes)
+    usage = LLMUsage()
+    for outcome in outcomes:
+        if outcome.usage:
+            usage.calls += outcome.usage.calls
+            usage.input_tokens += outcome.usage.input_tokens
+            usage.output_tokens += outcome.usage.output_tokens
+            usage.seconds += outcome.usage.seconds
+            usage.retries += outcome.usage.retries
+    compacted = [
+        outcome.result.compaction
+        for outcome in outcomes
+        if outcome.result and outcome.result.compaction
+    ]
+    console.print(
+        f"Processed {len(outcomes)} URLs in {elapsed:.1f}s "
+        f"({len(outcomes) / elapsed if elapsed else 0:.2f}/s): "
+        f"{len(outcomes) - failed} succeeded, {failed} failed. "
+        f"Result cache: {_format_cache_counts(cache_hits, cache_misses)}. "
+        f"LLM usage: {_format_usage(usage)}."
+        + (
+            f" Compaction saved {sum(item.saved_tokens for item in compacted):,} article tokens."
+            if compacted
+            else ""
+        )
+    )
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def prefetch(
+    sources: List[str] = typer.Argument(
+        ...,
+        help="RSS/Atom feed or sitemap URLs, or files holding a feed, a sitemap or one URL "
+        "per line ('-' reads URLs from stdin).",
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", min=1, help="Concurrent downloads across all hosts."
+    ),
+    per_host: Optional[int] = typer.Option(
+        None, "--per-host", min=1, help="Concurrent downloads per host."
+    ),
+    delay: Optional[float] = typer.Option(
+        None, "--delay", min=0, help="Seconds between the starts of requests to one host."
+    ),
+    limit: Optional[int] = typer.Option(
+        None, "--limit", min=1, help="Prefetch at most this many of the discovered URLs."
+    ),
+) -> None:
+    """Download and extract articles into the cache so later analyses skip the fetch."""
+    settings = load_settings().with_overrides(fetch_concurrency=workers)
+    settings = replace(
+        settings,
+        prefetch_host_concurrency=per_host or settings.prefetch_host_concurrency,
+        prefetch_host_delay=settings.prefetch_host_delay if delay is None else delay,
+    )
+    from article_service import ArticleDownloadError
+    from prefetch import PREFETCH_STATUSES, Prefetcher
+
+    done = 0
+    total = 0
 
+    def report_progress(outcome: "PrefetchOutcome") -> None:
+        nonlocal done
+        done += 1
+        if outcome.status == "fresh":
+            return
+        style = {"failed": "red", "stale": "yellow"}.get(outcome.status, "green")
+        console.print(
+            f"[{done}/{total}] [{style}]{outcome.status}[/{style}] {outcome.url}"
+            + (f" ({outcome.error})" if outcome.error else "")
+        )
+
+    prefetcher = Prefetcher(settings, on_complete=report_progress)
+    started = time.perf_counter()
     try:
-        article_payload = service.get_article(url)
-    except ArticleDownloadError as exc:
+        with console.status("Reading feeds, sitemaps and URL lists..."):
+            try:
+                urls = prefetcher.discover(sources)
+            except (ArticleDownloadError, OSError, ValueError) as exc:
+                console.print(
+                    Panel(str(exc), title="Prefetch Error", style="bold red", box=box.ROUNDED)
+                )
+                raise typer.Exit(code=1)
+        for error in prefetcher.discovery_errors:
+            console.print(f"[yellow]Skipped sitemap[/yellow] {error}")
+        urls = urls[:limit] if limit else urls
+        total = len(urls)
         console.print(
-            Panel(str(exc), title="Download Error", style="bold red", box=box.ROUNDED)
+            f"Prefetching {total:,} URLs with {settings.fetch_concurrency} workers, "
+            f"{settings.prefetch_host_concurrency} per host, "
+            f"{settings.prefetch_host_delay:g}s apart."
         )
+        outcomes = prefetcher.run(urls)
+    finally:
+        prefetcher.close()
+    elapsed = time.perf_counter() - started
+
+    counts = dict.fromkeys(PREFETCH_STATUSES, 0)
+    for outcome in outcomes:
+        counts[outcome.status] += 1
+    console.print(
+        f"Prefetched {len(outcomes):,} URLs in {elapsed:.1f}s: "
+        + ", ".join(f"{count:,} {status}" for status, count in counts.items())
+        + "."
+    )
+    if counts["failed"]:
         raise typer.Exit(code=1)
 
+
+@app.command()
+def serve(
+    host: Optional[str] = typer.Option(None, "--host", help="Interface to listen on."),
+    port: Optional[int] = typer.Option(None, "--port", "-p", help="Port to listen on."),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", min=1, help="Concurrent analyses (default: ANALYSIS_CONCURRENCY)."
+    ),
+    queue_size: Optional[int] = typer.Option(
+        None, "--queue-size", min=1, help="Queued jobs accepted before answering 429."
+    ),
+    model_provider: Optional[str] = typer.Option(
+        None,
+        "--model",
+        "-m",
+        help="Force a provider (openrouter, ollama, or auto to route per task). "
+        "Defaults to environment setting.",
+    ),
+    output_dir: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Directory where markdown reports will be written."
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Log every HTTP request."),
+) -> None:
+    """Serve a local HTTP job API backed by a warm analysis pipeline.
+
+    POST /jobs with {"url": ...} or {"urls": [...]}, poll GET /jobs/{id} and
+    download GET /jobs/{id}/report once the job has succeeded.
+    """
+    settings = _resolve_settings(
+        model_provider=model_provider,
+        output_dir=output_dir,
+        verbose=False,
+        analysis_concurrency=workers,
+    )
+    host = host or settings.server_host
+    port = settings.server_port if port is None else port
+
+    from pipeline import AnalysisPipeline
+    from server import JobManager, create_server
+
+    pipeline = AnalysisPipeline(settings)
+    # Build the LLM client and agent factory now so the first job does not pay for it.
+    pipeline.warm_up()
+    manager = JobManager(
+        pipeline,
+        workers=settings.analysis_concurrency,
+        queue_size=queue_size or settings.server_queue_size,
+    )
+    server = create_server(
+        manager, host, port, log=(lambda line: console.print(line)) if verbose else (lambda _: None)
+    )
+    manager.start()
     console.print(
         Panel(
             "\n".join(
                 [
+                    f"[bold]Listening on:[/bold] http://{host}:{server.server_address[1]}",
                     f"[bold]Model Provider:[/bold] {settings.model_provider}",
+                    f"[bold]Workers:[/bold] {manager.workers}",
+                    f"[bold]Queue Size:[/bold] {queue_size or settings.server_queue_size}",
                     f"[bold]Output Directory:[/bold] {settings.output_dir}",
-                    f"[bold]Article Cached:[/bold] {article_payload.record.fetched_at.isoformat()}",
                 ]
             ),
-            title="Analysis Configuration",
+            title="Analysis Server",
             box=box.ROUNDED,
         )
     )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("Shutting down; waiting for running jobs to finish.")
+    finally:
+        server.server_close()
+        manager.stop()
+        pipeline.close()
+
 
-    task_factory = ArticleAnalysisTasks(
-        article_body=article_payload.content,
-        url=url,
-        title=article_payload.title,
+@app.command()
+def enqueue(
+    source: str = typer.Argument(
+        "-", help="File with one URL per line, or '-' to read from stdin."
+    ),
+    max_attempts: Optional[int] = typer.Option(
+        None, "--max-attempts", min=1, help="Attempts before a job is marked failed."
+    ),
+) -> None:
+    """Add URLs to the durable job queue processed by `worker`."""
+    settings = load_settings()
+    urls = list(_read_urls(source))
+    if not urls:
+        raise typer.BadParameter("No URLs provided.")
+    repository = ArticleRepository(settings.database_path)
+    job_ids = repository.enqueue_jobs(
+        urls, max_attempts=max_attempts or settings.job_max_attempts
+    )
+    console.print(
+        f"Queued {len(job_ids)} job{'s' if len(job_ids) != 1 else ''} "
+        f"(ids {job_ids[0]}-{job_ids[-1]})."
     )
-    crew, task_map = _build_crew(settings, task_factory)
 
-    crew.kickoff()
 
-    summary_md = _task_output(task_map["summary"])
-    assumptions_md = _task_output(task_map["assumptions"])
-    errors_md = _task_output(task_map["errors"])
+@app.command()
+def worker(
+    concurrency: Optional[int] = typer.Option(
+        None, "--concurrency", min=1, help="Jobs run at once (default: ANALYSIS_CONCURRENCY)."
+    ),
+    exit_when_empty: bool = typer.Option(
+        False, "--exit-when-empty", help="Stop once no job is waiting instead of polling."
+    ),
+    model_provider: Optional[str] = typer.Option(
+        None,
+        "--model",
+        "-m",
+        help="Force a provider (openrouter, ollama, or auto to route per task). "
+        "Defaults to environment setting.",
+    ),
+    output_dir: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Directory where markdown reports will be written."
+    ),
+) -> None:
+    """Process queued jobs; run as many workers as you like against one database.
 
-    report = _compose_report(
-        url=url,
-        title=article_payload.title,
-        summary_md=summary_md,
-        assumptions_md=assumptions_md,
-        errors_md=errors_md,
-        settings=settings,
+    Jobs are leased while they run, so those held by a worker that crashes or
+    is killed are retried by another worker once the lease expires.
+    """
+    settings = _resolve_settings(
+        model_provider=model_provider,
+        output_dir=output_dir,
+        verbose=False,
+        analysis_concurrency=concurrency,
     )
 
-    output_path = _derive_output_path(settings, article_payload.title, url)
-    output_path.write_text(report, encoding="utf-8")
+    from pipeline import AnalysisPipeline
+    from worker import JobWorker
 
-    model_name = (
-        settings.openrouter_model
-        if settings.model_provider == "openrouter"
-        else settings.ollama_model
+    pipeline = AnalysisPipeline(settings)
+    pipeline.warm_up()
+
+    def report(event: str, job: JobRecord, detail: Optional[str]) -> None:
+        styles = {
+            "succeeded": "green",
+            "retrying": "yellow",
+            "failed": "red",
+            "lease-lost": "magenta",
+        }
+        line = f"[{styles.get(event, 'cyan')}]{event}[/] job {job.id} {job.url}"
+        if event != "started":
+            line += f" (attempt {job.attempts}/{job.max_attempts}): {detail}"
+        console.print(line)
+
+    job_worker = JobWorker(pipeline, concurrency=settings.analysis_concurrency, on_event=report)
+    console.print(
+        f"Worker {job_worker.identity} running {job_worker.concurrency} job"
+        f"{'s' if job_worker.concurrency != 1 else ''} at a time "
+        f"(lease {settings.job_lease.total_seconds():.0f}s)."
     )
-    repository.record_analysis(
-        article_id=article_payload.record.id,
-        model_provider=settings.model_provider,
-        model_name=model_name,
-        output_path=output_path,
-        created_at=datetime.utcnow(),
+    try:
+        job_worker.run(exit_when_empty=exit_when_empty)
+    except KeyboardInterrupt:
+        console.print(
+            "Stopping; waiting for running jobs to finish. "
+            "Press Ctrl-C again to hand them back to the queue."
+        )
+        job_worker.stop()
+        try:
+            job_worker.wait()
+        except KeyboardInterrupt:
+            released = job_worker.release_running()
+            console.print(f"Handed {released} running job(s) back to the queue.")
+    finally:
+        pipeline.close()
+
+
+@app.command()
+def jobs(
+    status: Optional[str] = typer.Option(
+        None, "--status", help="Only list jobs with this status (queued, running, succeeded, failed)."
+    ),
+    limit: int = typer.Option(20, help="Maximum number of jobs to display."),
+) -> None:
+    """Show the durable job queue."""
+    settings = load_settings()
+    repository = ArticleRepository(settings.database_path)
+    counts = repository.job_counts()
+    console.print(", ".join(f"{name}: {count}" for name, count in counts.items()))
+
+    records = repository.list_jobs(status=status, limit=limit)
+    if not records:
+        return
+    table = Table("ID", "URL", "Status", "Attempts", "Updated At", "Detail", title="Jobs")
+    for record in records:
+        if record.status == "running":
+            detail = f"leased by {record.lease_owner}"
+        else:
+            detail = record.error or record.output_path or ""
+        table.add_row(
+            str(record.id),
+            record.url,
+            record.status,
+            f"{record.attempts}/{record.max_attempts}",
+            record.updated_at.strftime("%Y-%m-%d %H:%M"),
+            detail,
+        )
+    console.print(table)
+
+
+def _resolve_settings(
+    *,
+    model_provider: Optional[str],
+    output_dir: Optional[Path],
+    verbose: bool,
+    fetch_concurrency: Optional[int] = None,
+    analysis_concurrency: Optional[int] = None,
+    write_concurrency: Optional[int] = None,
+    execution_mode: Optional[str] = None,
+    task_timeout: Optional[float] = None,
+    cache_policy: Optional[str] = None,
+    analysis_strategy: Optional[str] = None,
+    chunk_token_budget: Optional[int] = None,
+    chunk_concurrency: Optional[int] = None,
+    html_extractor: Optional[str] = None,
+    extract_processes: Optional[int] = None,
+) -> Settings:
+    settings = load_settings().with_overrides(
+        model_provider=model_provider.lower() if model_provider else None,
+        output_dir=output_dir.resolve() if output_dir else None,
+        verbose=verbose,
+        fetch_concurrency=fetch_concurrency,
+        analysis_concurrency=analysis_concurrency,
+        write_concurrency=write_concurrency,
+        execution_mode=execution_mode.lower() if execution_mode else None,
+        task_timeout=task_timeout,
+        cache_policy=cache_policy,
+        analysis_strategy=analysis_strategy.lower() if analysis_strategy else None,
+        chunk_token_budget=chunk_token_budget,
+        chunk_concurrency=chunk_concurrency,
+        html_extractor=html_extractor.lower() if html_extractor else None,
+        extract_processes=extract_processes,
     )
 
-    console.print(
-        Panel(
-            f"Report written to [bold]{output_path}[/bold]",
-            title="Analysis Complete",
-            style="green",
-            box=box.DOUBLE,
+    if settings.model_provider not in MODEL_PROVIDERS:
+        raise typer.BadParameter(
+            f"Unsupported model provider '{settings.model_provider}'. "
+            f"Please choose one of: {', '.join(MODEL_PROVIDERS)}."
+        )
+    if settings.execution_mode not in EXECUTION_MODES:
+        raise typer.BadParameter(
+            f"Unsupported execution mode '{settings.execution_mode}'. "
+            f"Please choose one of: {', '.join(EXECUTION_MODES)}."
+        )
+    if settings.cache_policy not in CACHE_POLICIES:
+        raise typer.BadParameter(
+            f"Unsupported result cache policy '{settings.cache_policy}'. "
+            f"Please choose one of: {', '.join(CACHE_POLICIES)}."
         )
+    if settings.analysis_strategy not in ANALYSIS_STRATEGIES:
+        raise typer.BadParameter(
+            f"Unsupported analysis strategy '{settings.analysis_strategy}'. "
+            f"Please choose one of: {', '.join(ANALYSIS_STRATEGIES)}."
+        )
+    if settings.near_duplicate_threshold and not is_indexed_threshold(
+        settings.near_duplicate_threshold
+    ):
+        raise typer.BadParameter(
+            f"NEAR_DUPLICATE_THRESHOLD {settings.near_duplicate_threshold:g} is below what the "
+            f"SimHash index covers; use 0 to disable or a value above "
+            f"{1 - SIMHASH_BANDS / SIMHASH_BITS:.2f}."
+        )
+    from extractors import get_extractor
+
+    try:
+        get_extractor(settings.html_extractor)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    settings.output_dir.mkdir(parents=True, exist_ok=True)
+    return settings
+
+
+def _cache_policy(no_cache: bool, refresh_cache: bool) -> Optional[str]:
+    if no_cache and refresh_cache:
+        raise typer.BadParameter("--no-cache and --refresh-cache are mutually exclusive.")
+    if no_cache:
+        return "bypass"
+    if refresh_cache:
+        return "refresh"
+    return None
+
+
+def _format_cache_counts(hits: int, misses: int) -> str:
+    return f"{hits} hit{'s' if hits != 1 else ''}, {misses} miss{'es' if misses != 1 else ''}"
+
+
+def _format_usage(usage: "LLMUsage") -> str:
+    return (
+        f"{usage.calls} call{'s' if usage.calls != 1 else ''}, "
+        f"~{usage.input_tokens:,} input / ~{usage.output_tokens:,} output tokens, "
+        f"{usage.seconds:.1f}s"
+        + (f", {usage.retries} retr{'ies' if usage.retries != 1 else 'y'}" if usage.retries else "")
     )
 
-    console.print(Panel(report, title="Article Analysis Report", box=box.ROUNDED))
+
+def _read_urls(source: str) -> Iterator[str]:
+    """Open ``source`` now, so a missing file fails before any work starts, and read it lazily."""
+    try:
+        handle = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    except OSError as exc:
+        raise typer.BadParameter(f"Cannot read URL list '{source}': {exc.strerror or exc}.")
+
+    def lines() -> Iterator[str]:
+        try:
+            for line in handle:
+                url = line.strip()
+                if url and not url.startswith("#"):
+                    yield url
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+
+    return lines()
 
 
 @app.command("show-config")
@@ -236,7 +807,11 @@ def show_config() -> None:
                 [
                     f"[bold]Model Provider:[/bold] {settings.model_provider}",
                     f"[bold]OpenRouter Model:[/bold] {settings.openrouter_model}",
+                    f"[bold]OpenRouter Endpoint:[/bold] {settings.openrouter_base_url}",
                     f"[bold]Ollama Model:[/bold] {settings.ollama_model}",
+                    f"[bold]Execution Mode:[/bold] {settings.execution_mode}",
+                    f"[bold]Analysis Strategy:[/bold] {settings.analysis_strategy}",
+                    f"[bold]Result Cache:[/bold] {settings.cache_policy}",
                     f"[bold]Output Directory:[/bold] {settings.output_dir}",
                     f"[bold]Database Path:[/bold] {settings.database_path}",
                 ]
@@ -247,6 +822,96 @@ def show_config() -> None:
     )
 
 
+@app.command()
+def stats(
+    window: str = typer.Option(
+        "24h", "--window", "-w", help="Time window to report, e.g. 30m, 24h or 7d."
+    ),
+    model_name: Optional[str] = typer.Option(
+        None, "--model-name", help="Only include analyses run with this model."
+    ),
+) -> None:
+    """Show throughput and per-stage latency percentiles of recent analyses."""
+    span = _parse_window(window)
+    settings = load_settings()
+    repository = ArticleRepository(settings.database_path)
+    timings = repository.list_stage_timings(
+        since=datetime.utcnow() - span, model_name=model_name
+    )
+    if not timings:
+        console.print(f"No analyses with telemetry in the last {window}.")
+        return
+
+    hours = span.total_seconds() / 3600
+    totals = [timing for timing in timings if timing.stage == "total"]
+    input_tokens = sum(timing.input_tokens for timing in timings)
+    output_tokens = sum(timing.output_tokens for timing in timings)
+    console.print(
+        f"{len(totals)} analyses in the last {window} ({len(totals) / hours:.2f}/hour), "
+        f"~{input_tokens:,} input / ~{output_tokens:,} output tokens "
+        f"({(input_tokens + output_tokens) / hours:,.0f} tokens/hour)."
+    )
+    article_tokens, compacted_tokens = repository.compaction_totals(
+        since=datetime.utcnow() - span, model_name=model_name
+    )
+    if article_tokens:
+        console.print(
+            f"Compaction: {article_tokens:,} -> {compacted_tokens:,} article tokens "
+            f"(-{1 - compacted_tokens / article_tokens:.0%})."
+        )
+
+    table = Table(
+        "Stage",
+        "Model",
+        "Count",
+        "Failed",
+        "p50",
+        "p95",
+        "p99",
+        "Tokens In/Out",
+        "Cache Hits",
+        title=f"Stage Latency in Seconds (last {window})",
+    )
+    for row in summarize_stages(
+        (
+            timing.stage,
+            f"{timing.model_name} ({timing.model_provider})",
+            timing.seconds,
+            timing.input_tokens,
+            timing.output_tokens,
+            timing.cache_hit,
+            timing.failed,
+        )
+        for timing in timings
+    ):
+        table.add_row(
+            row.stage,
+            row.model,
+            str(row.count),
+            str(row.failures) if row.failures else "",
+            f"{row.p50:.3f}",
+            f"{row.p95:.3f}",
+            f"{row.p99:.3f}",
+            f"{row.input_tokens:,}/{row.output_tokens:,}" if row.input_tokens else "",
+            f"{row.cache_hits}/{row.cache_lookups}" if row.cache_lookups else "",
+        )
+    console.print(table)
+
+
+def _parse_window(value: str) -> timedelta:
+    units = {"m": "minutes", "h": "hours", "d": "days"}
+    amount, unit = value[:-1], value[-1:].lower()
+    try:
+        span = timedelta(**{units[unit]: float(amount)})
+    except (KeyError, ValueError):
+        raise typer.BadParameter(
+            f"Invalid window '{value}'. Use a number followed by m, h or d, e.g. 24h."
+        ) from None
+    if span <= timedelta(0):
+        raise typer.BadParameter("The window must be positive.")
+    return span
+
+
 @app.command()
 def history(
     limit: int = typer.Option(10, help="Maximum number of analysis records to display.")
@@ -279,6 +944,139 @@ def _append_analysis_row(table: Table, record: AnalysisRecord) -> None:
     )
 
 
+@app.command()
+def search(
+    query: str = typer.Argument(
+        ..., help='Words to find; "quoted phrases", prefix* and OR/NOT are supported.'
+    ),
+    scope: str = typer.Option(
+        "all", "--in", help=f"What to search: {', '.join(SEARCH_SCOPES)}."
+    ),
+    limit: int = typer.Option(10, help="Results per page."),
+    page: int = typer.Option(1, help="Page of results to show."),
+) -> None:
+    """Search cached articles and generated reports by relevance."""
+    if limit < 1 or page < 1:
+        raise typer.BadParameter("--limit and --page must be at least 1.")
+    settings = load_settings()
+    repository = ArticleRepository(settings.database_path)
+    try:
+        total, results = repository.search(
+            query, scope=scope, limit=limit, offset=(page - 1) * limit
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    if not results:
+        console.print(f"No matches for '{query}'." if not total else f"No results on page {page}.")
+        return
+
+    pages = -(-total // limit)
+    table = Table(
+        "Type",
+        "ID",
+        "Title / URL",
+        "Match",
+        "Date",
+        title=f"Search Results: page {page} of {pages} ({total:,} matches)",
+        show_lines=True,
+    )
+    highlight = [
+        word
+        for word in query.replace('"', " ").replace("*", " ").split()
+        if word not in ("OR", "NOT", "AND")
+    ]
+    for result in results:
+        snippet = Text(result.snippet)
+        snippet.highlight_words(highlight, style="bold yellow", case_sensitive=False)
+        location = result.output_path if result.kind == "report" else result.url
+        table.add_row(
+            result.kind,
+            str(result.id),
+            Text.assemble(result.title or "N/A", "\n", (location, "dim")),
+            snippet,
+            result.created_at.strftime("%Y-%m-%d %H:%M"),
+        )
+    console.print(table)
+
+
+@app.command()
+def export(
+    path: Path = typer.Argument(..., help="Archive file to write, e.g. archive.jsonl.gz."),
+    since: Optional[str] = typer.Option(
+        None,
+        "--since",
+        help="Only rows changed at or after this UTC time (ISO 8601) or window (e.g. 24h).",
+    ),
+) -> None:
+    """Export articles and analyses, with report contents, to a gzipped JSONL archive."""
+    from archive import export_archive
+
+    settings = load_settings()
+    repository = ArticleRepository(settings.database_path)
+    with console.status("Exporting...") as status:
+        summary = export_archive(
+            repository,
+            path,
+            since=_parse_since(since) if since else None,
+            on_progress=lambda progress: status.update(
+                f"Exported {progress.articles:,} articles and {progress.analyses:,} analyses..."
+            ),
+        )
+    console.print(
+        f"Exported {summary.articles:,} articles and {summary.analyses:,} analyses to {path}."
+        + (f" {summary.skipped:,} report files were missing." if summary.skipped else "")
+    )
+    console.print(f"Continue from here with --since {summary.cursor.isoformat()}")
+
+
+@app.command("import")
+def import_(
+    path: Path = typer.Argument(..., exists=True, dir_okay=False, help="Archive written by export."),
+    output_dir: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Directory for the imported report files."
+    ),
+    batch_size: int = typer.Option(500, min=1, help="Rows merged per transaction."),
+) -> None:
+    """Merge an exported archive into the local database."""
+    from archive import import_archive
+
+    settings = load_settings()
+    repository = ArticleRepository(settings.database_path)
+    with console.status("Importing...") as status:
+        try:
+            summary = import_archive(
+                repository,
+                path,
+                output_dir=output_dir or settings.output_dir,
+                batch_size=batch_size,
+                on_progress=lambda progress: status.update(
+                    f"Imported {progress.articles:,} articles and {progress.analyses:,} analyses..."
+                ),
+            )
+        except (OSError, ValueError) as exc:
+            console.print(Panel(str(exc), title="Import Error", style="bold red", box=box.ROUNDED))
+            raise typer.Exit(code=1)
+    console.print(
+        f"Imported {summary.articles:,} articles and {summary.analyses:,} analyses; "
+        f"skipped {summary.skipped:,} already present, older than the local copy, "
+        "or without their article."
+    )
+
+
+def _parse_since(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.utcnow() - _parse_window(value)
+    except typer.BadParameter:
+        raise typer.BadParameter(
+            f"Invalid --since '{value}'. Use an ISO 8601 time or a window such as 24h."
+        ) from None
+
+
 @app.command()
 def cache(
     limit: int = typer.Option(10, help="Maximum number of cached articles to display.")
@@ -0,0 +1,987 @@
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from crewai import Crew, Process
+
+from agents import ArticleAnalysisAgents, shared_agents
+from article_service import ArticlePayload, ArticleService
+from chunking import (
+    ArticleChunk,
+    ParagraphDiff,
+    chunk_article,
+    chunk_paragraphs,
+    diff_paragraphs,
+)
+from compaction import COMPACTION_VERSION, CompactedArticle, compact_article
+from config import Settings
+from routing import Backend, run_routed
+from storage import ArticleRecord, ArticleRepository
+from telemetry import StageSample, Telemetry
+from tasks import (
+    ArticleAnalysisTasks,
+    parse_combined_output,
+    prompt_fingerprint,
+    render_partial,
+)
+from tokens import estimate_tokens
+
+if TYPE_CHECKING:
+    from streaming import ReportStream
+
+
+SECTIONS = ("summary", "assumptions", "errors")
+
+# Analyses of the same content hash are serialized on one of these locks so a
+# duplicate waits for the first run and is then served from the section cache.
+_CONTENT_LOCK_STRIPES = 64
+
+# Agent and task factory method names for every report section.
+_SECTION_FACTORIES = {
+    "summary": ("summarizer_agent", "summarize_article"),
+    "assumptions": ("assumptions_agent", "identify_assumptions"),
+    "errors": ("errors_agent", "identify_errors"),
+}
+
+
+@dataclass
+class LLMUsage:
+    """Estimated token usage and wall-clock time of the LLM calls of one analysis."""
+
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    seconds: float = 0.0
+    retries: int = 0
+    stages: List[StageSample] = field(default_factory=list, repr=False, compare=False)
+    # Backend that produced each successful stage, e.g. "openrouter:xai/grok-4-fast".
+    backends: Dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(
+        self,
+        task: object,
+        output: str,
+        *,
+        stage: Optional[str] = None,
+        seconds: float = 0.0,
+        backend: Optional[str] = None,
+    ) -> None:
+        input_tokens = _prompt_tokens(task)
+        output_tokens = estimate_tokens(output)
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            if stage and backend:
+                self.backends[stage] = backend
+            if stage:
+                self.stages.append(
+                    StageSample(
+                        stage=stage,
+                        seconds=seconds,
+                        input_tokens=input_tokens,
+                        output_tokens=output_tokens,
+                    )
+                )
+
+    def record_failure(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages.append(StageSample(stage=stage, seconds=seconds, failed=True))
+
+    def record_retry(self, _error: BaseException, _delay: float) -> None:
+        with self._lock:
+            self.retries += 1
+
+
+@dataclass
+class AnalysisResult:
+    url: str
+    article: ArticlePayload
+    report: str
+    cache_hits: Tuple[str, ...] = ()
+    cache_misses: Tuple[str, ...] = ()
+    strategy: str = "standard"
+    usage: LLMUsage = field(default_factory=LLMUsage)
+    failed_sections: Tuple[str, ...] = ()
+    telemetry: Telemetry = field(default_factory=Telemetry)
+    backends: Dict[str, str] = field(default_factory=dict)
+    compaction: Optional[CompactedArticle] = None
+    sections: Dict[str, str] = field(default_factory=dict)
+
+
+class AnalysisPipeline:
+    """Fetch, analyze and persist articles as independently callable stages."""
+
+    def __init__(
+        self, settings: Settings, repository: Optional[ArticleRepository] = None
+    ):
+        self.settings = settings
+        self._owns_repository = repository is None
+        self.repository = repository or ArticleRepository(settings.database_path)
+        self._content_locks = [threading.Lock() for _ in range(_CONTENT_LOCK_STRIPES)]
+        # Part of every cache key, so changing the compaction rules or budget
+        # never serves sections computed from a differently prepared body.
+        self._preprocessing = (
+            f"compaction-v{COMPACTION_VERSION}:{settings.compaction_token_budget}"
+            if settings.compaction
+            else ""
+        )
+        self._agents: Optional[ArticleAnalysisAgents] = None
+        self._agents_lock = threading.Lock()
+        self._parse_executor = (
+            ProcessPoolExecutor(max_workers=settings.extract_processes)
+            if settings.extract_processes > 0
+            else None
+        )
+        self.service = ArticleService.from_settings(
+            self.repository, settings, parse_executor=self._parse_executor
+        )
+
+    def close(self) -> None:
+        self.service.session.close()
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown()
+        if self._owns_repository:
+            self.repository.close()
+
+    @property
+    def agents(self) -> ArticleAnalysisAgents:
+        """Agent pool and LLM clients, shared with every pipeline on the same LLM settings."""
+        with self._agents_lock:
+            if self._agents is None:
+                self._agents = shared_agents(self.settings)
+            return self._agents
+
+    def warm_up(self) -> ArticleAnalysisAgents:
+        """Build the LLM client and agent factory ahead of the first analysis."""
+        return self.agents
+
+    def fetch(self, url: str, telemetry: Optional[Telemetry] = None) -> ArticlePayload:
+        return self.service.get_article(url, telemetry=telemetry)
+
+    def analyze(
+        self,
+        url: str,
+        article: ArticlePayload,
+        telemetry: Optional[Telemetry] = None,
+        stream: Optional["ReportStream"] = None,
+    ) -> AnalysisResult:
+        """Produce the report sections, from the cache where possible.
+
+        With a ``stream`` (see :meth:`open_stream`) sections are generated one
+        at a time in report order with per-task prompts, and tokens are
+        forwarded to the stream as the model produces them.
+        """
+        telemetry = telemetry or Telemetry()
+        if self.settings.cache_policy != "use":
+            return self._analyze(url, article, telemetry, stream)
+        stripe = int(article.record.content_hash[:8], 16) % _CONTENT_LOCK_STRIPES
+        with self._content_locks[stripe]:
+            return self._analyze(url, article, telemetry, stream)
+
+    def open_stream(
+        self,
+        url: str,
+        article: ArticlePayload,
+        on_update: Optional[Callable[[str], None]] = None,
+    ) -> "ReportStream":
+        """Create the report file up front so it can be filled in while streaming."""
+        from streaming import ReportStream
+
+        stream = ReportStream(
+            _derive_output_path(self.settings, article.title, url),
+            sections=SECTIONS,
+            render=lambda outputs, incomplete: _compose_report(
+                url=url,
+                title=article.title,
+                summary_md=outputs["summary"],
+                assumptions_md=outputs["assumptions"],
+                errors_md=outputs["errors"],
+                settings=self.settings,
+                incomplete=incomplete,
+            ),
+            on_update=on_update,
+        )
+        stream.abort("generation has not started")
+        return stream
+
+    def _analyze(
+        self,
+        url: str,
+        article: ArticlePayload,
+        telemetry: Telemetry,
+        stream: Optional["ReportStream"],
+    ) -> AnalysisResult:
+        compacted = None
+        body = article.content
+        if self.settings.compaction:
+            with telemetry.stage("compact"):
+                compacted = compact_article(
+                    article.content, token_budget=self.settings.compaction_token_budget
+                )
+            body = compacted.content or article.content
+        task_factory = ArticleAnalysisTasks(
+            article_body=body,
+            url=url,
+            title=article.title,
+        )
+        strategy = "standard" if stream is not None else self._strategy_for(body)
+        chunks = []
+        if strategy == "chunked":
+            chunks = (
+                chunk_paragraphs(compacted.paragraphs, self.settings.chunk_token_budget)
+                if compacted and compacted.paragraphs
+                else chunk_article(body, self.settings.chunk_token_budget)
+            )
+        outputs = self._load_cached_sections(article.record.content_hash, strategy)
+        cache_hits = tuple(section for section in SECTIONS if section in outputs)
+        missing = [section for section in SECTIONS if section not in outputs]
+        if stream is not None:
+            for section in cache_hits:
+                stream.finish(section, outputs[section])
+
+        usage = LLMUsage()
+        failed: Set[str] = set()
+        method = f"Chunked map-reduce over {len(chunks)} parts" if chunks else None
+        started = time.perf_counter()
+        updated: Dict[str, str] = {}
+        refreshed = None
+        basis, origin = (
+            self._incremental_basis(article) if missing and stream is None else (None, None)
+        )
+        if basis is not None:
+            updated, diff = self._run_incremental(
+                task_factory, article, basis, strategy, missing, usage
+            )
+            if updated:
+                self._store_sections(article, strategy, updated)
+                outputs.update(updated)
+                refreshed = f"{', '.join(updated)} updated from {origin}: {diff.describe()}"
+        pending = [section for section in missing if section not in updated]
+        if pending:
+            fresh: Optional[Dict[str, str]] = None
+            if strategy == "single-pass":
+                fresh = self._run_single_pass(task_factory, pending, usage)
+                method = "Single-pass combined prompt"
+                if fresh is None:
+                    strategy = "standard"
+                    method = "Per-task prompts (single-pass response could not be parsed)"
+            if stream is not None:
+                fresh, failed = self._run_streaming(
+                    task_factory,
+                    pending,
+                    usage,
+                    stream,
+                    partial(self._store_sections, article, strategy),
+                )
+            elif fresh is None:
+                if strategy == "chunked":
+                    fresh, failed = self._run_chunked(task_factory, chunks, pending, usage)
+                elif self.settings.execution_mode == "parallel":
+                    fresh, failed = self._run_parallel(task_factory, pending, usage)
+                else:
+                    fresh, failed = self._run_sequential(task_factory, pending, usage)
+            if stream is None:
+                self._store_sections(
+                    article,
+                    strategy,
+                    {section: output for section, output in fresh.items() if section not in failed},
+                )
+            outputs.update(fresh)
+        if missing:
+            usage.seconds = time.perf_counter() - started
+        telemetry.extend(usage.stages)
+        backends = _section_backends(cache_hits, usage, combined=strategy == "single-pass")
+        from_previous = basis is not None and basis.id == article.record.id
+        for section in updated:
+            if backends[section] == "unavailable":
+                # The edit left every paragraph intact, so the old section was reused.
+                backends[section] = "previous version" if from_previous else "near-duplicate"
+
+        report = _compose_report(
+            url=url,
+            title=article.title,
+            summary_md=outputs["summary"],
+            assumptions_md=outputs["assumptions"],
+            errors_md=outputs["errors"],
+            settings=self.settings,
+            method=method,
+            refreshed=refreshed,
+            backends=backends,
+            compaction=compacted.describe() if compacted else None,
+        )
+        return AnalysisResult(
+            url=url,
+            article=article,
+            report=report,
+            cache_hits=cache_hits,
+            cache_misses=tuple(missing),
+            strategy=(
+                ("incremental" if from_previous else "near-duplicate")
+                if updated and not pending
+                else strategy
+            ),
+            usage=usage,
+            failed_sections=tuple(section for section in missing if section in failed),
+            telemetry=telemetry,
+            backends=backends,
+            compaction=compacted,
+            sections={
+                section: outputs[section] for section in SECTIONS if section not in failed
+            },
+        )
+
+    def _strategy_for(self, body: str) -> str:
+        strategy = self.settings.analysis_strategy
+        if (
+            strategy == "chunked"
+            and estimate_tokens(body) <= self.settings.chunk_token_budget
+        ):
+            return "standard"
+        return strategy
+
+    def _load_cached_sections(
+        self, content_hash: str, strategy: str, sections: Sequence[str] = SECTIONS
+    ) -> Dict[str, str]:
+        if self.settings.cache_policy != "use":
+            return {}
+        cached = {}
+        for section in sections:
+            output = self.repository.get_section_result(
+                content_hash=content_hash,
+                task_kind=section,
+                model_provider=self.settings.model_provider,
+                model_name=self.settings.model_name,
+                prompt_fingerprint=prompt_fingerprint(section, strategy, self._preprocessing),
+            )
+            if output is not None:
+                cached[section] = output
+        return cached
+
+    def _incremental_basis(
+        self, article: ArticlePayload
+    ) -> Tuple[Optional[ArticleRecord], Optional[str]]:
+        """The cached body whose analysis this article can start from, and how to describe it.
+
+        That is the version of this article analyzed last, read from storage so
+        refetches in between (by ``prefetch``, ``worker`` or ``serve``) do not
+        lose it; failing that, a near-duplicate copy.
+        """
+        previous = self.repository.get_analyzed_version(article.record.id)
+        if previous is not None and previous.content_hash != article.record.content_hash:
+            fetched = previous.fetched_at.strftime("%Y-%m-%d %H:%M UTC")
+            return previous, f"the version fetched {fetched}"
+        # Looked up only here, once sections are missing, so fetches that are
+        # never analyzed (prefetch, cache hits) do not pay for it.
+        threshold = self.settings.near_duplicate_threshold
+        neighbour = (
+            self.repository.find_near_duplicate(article.record.content_hash, threshold=threshold)
+            if threshold > 0
+            else None
+        )
+        if neighbour is not None:
+            record = self.repository.get_article_by_content_hash(neighbour.content_hash)
+            if record is not None:
+                return record, f"a {neighbour.similarity:.0%} similar copy at {neighbour.url}"
+        return None, None
+
+    def _run_incremental(
+        self,
+        task_factory: ArticleAnalysisTasks,
+        article: ArticlePayload,
+        previous: ArticleRecord,
+        strategy: str,
+        sections: Sequence[str],
+        usage: LLMUsage,
+    ) -> Tuple[Dict[str, str], Optional[ParagraphDiff]]:
+        """Update the sections of ``previous`` from a paragraph-level diff.
+
+        ``previous`` is the version of the article analyzed last or a
+        near-duplicate copy. Only applies when its sections are still cached and the
+        difference is at most ``incremental_max_change`` of the article.
+        Sections whose update fails are left for a full analysis.
+        """
+        max_change = self.settings.incremental_max_change
+        if max_change <= 0:
+            return {}, None
+        previous_outputs = self._load_cached_sections(previous.content_hash, strategy, sections)
+        if not previous_outputs:
+            return {}, None
+        diff = diff_paragraphs(previous.content, article.content, previous.paragraph_hashes)
+        if diff.change_ratio > max_change:
+            return {}, diff
+        if not diff.updated and not diff.outdated:
+            # Only whitespace or paragraph breaks moved; the analysis still holds.
+            return previous_outputs, diff
+
+        agents = self.agents
+        updated: Dict[str, str] = {}
+        with ThreadPoolExecutor(
+            max_workers=len(previous_outputs), thread_name_prefix="update"
+        ) as executor:
+            futures = {
+                section: executor.submit(
+                    _run_task,
+                    self.settings,
+                    agents,
+                    _SECTION_FACTORIES[section][0],
+                    partial(
+                        task_factory.update_section,
+                        section,
+                        previous_output=previous_output,
+                        diff=diff,
+                    ),
+                    usage,
+                    stage=f"task.{section}.update",
+                )
+                for section, previous_output in previous_outputs.items()
+            }
+            for section, future in futures.items():
+                try:
+                    output = future.result()
+                except Exception:  # noqa: BLE001 - fall back to a full analysis
+                    continue
+                if output.strip():
+                    updated[section] = output
+        return updated, diff
+
+    def _store_sections(
+        self, article: ArticlePayload, strategy: str, outputs: Dict[str, str]
+    ) -> None:
+        if self.settings.cache_policy == "bypass":
+            return
+        for section, output in outputs.items():
+            if not output.strip():
+                continue
+            self.repository.save_section_result(
+                content_hash=article.record.content_hash,
+                task_kind=section,
+                model_provider=self.settings.model_provider,
+                model_name=self.settings.model_name,
+                prompt_fingerprint=prompt_fingerprint(section, strategy, self._preprocessing),
+                output=output,
+                created_at=datetime.utcnow(),
+            )
+
+    def _run_sequential(
+        self, task_factory: ArticleAnalysisTasks, sections: Sequence[str], usage: LLMUsage
+    ) -> Tuple[Dict[str, str], Set[str]]:
+        """Run the sections one after another, each as its own single-task crew.
+
+        The sections do not depend on each other, and separate crews let the
+        provider limiter pace and retry every LLM request on its own: a
+        rate-limited section is retried without repeating the ones already done.
+        """
+        agents = self.agents
+        outputs = {
+            section: _run_task(
+                self.settings,
+                agents,
+                _SECTION_FACTORIES[section][0],
+                getattr(task_factory, _SECTION_FACTORIES[section][1]),
+                usage,
+                stage=f"task.{section}",
+            )
+            for section in sections
+        }
+        return outputs, set()
+
+    def _run_streaming(
+        self,
+        task_factory: ArticleAnalysisTasks,
+        sections: Sequence[str],
+        usage: LLMUsage,
+        stream: "ReportStream",
+        store: Callable[[Dict[str, str]], None],
+    ) -> Tuple[Dict[str, str], Set[str]]:
+        """Run sections one after another, forwarding tokens to ``stream``.
+
+        Each section is cached as soon as it finishes, so an interrupted run
+        only has to regenerate the sections it had not completed.
+        """
+        # Not pooled: the LLM clients forward their tokens to this stream.
+        agents = ArticleAnalysisAgents(self.settings, on_token=stream.feed)
+        outputs: Dict[str, str] = {}
+        failed: Set[str] = set()
+        try:
+            for section in sections:
+                stream.begin(section)
+                try:
+                    outputs[section] = _run_task(
+                        self.settings,
+                        agents,
+                        _SECTION_FACTORIES[section][0],
+                        getattr(task_factory, _SECTION_FACTORIES[section][1]),
+                        usage,
+                        stage=f"task.{section}",
+                    )
+                except Exception as exc:  # noqa: BLE001 - degrade only this section
+                    failed.add(section)
+                    outputs[section] = _degraded_section(str(exc) or type(exc).__name__)
+                else:
+                    store({section: outputs[section]})
+                stream.finish(section, outputs[section])
+        finally:
+            agents.close()
+        return outputs, failed
+
+    def _run_single_pass(
+        self, task_factory: ArticleAnalysisTasks, sections: Sequence[str], usage: LLMUsage
+    ) -> Optional[Dict[str, str]]:
+        """Request every missing section from one prompt that embeds the article once.
+
+        Returns ``None`` when the response does not contain every section marker.
+        """
+        agents = self.agents
+        response = _run_task(
+            self.settings,
+            agents,
+            "analyst_agent",
+            partial(task_factory.combined_analysis, kinds=sections),
+            usage,
+            stage="task.combined",
+        )
+        return parse_combined_output(response, sections)
+
+    def _run_parallel(
+        self, task_factory: ArticleAnalysisTasks, sections: Sequence[str], usage: LLMUsage
+    ) -> Tuple[Dict[str, str], Set[str]]:
+        """Dispatch every section as its own crew and join them under one deadline.
+
+        A section that fails or misses the deadline is replaced by a note in the
+        report instead of failing the whole analysis.
+        """
+        agents = self.agents
+        executor = ThreadPoolExecutor(
+            max_workers=len(sections), thread_name_prefix="section"
+        )
+        futures = {
+            section: executor.submit(
+                _run_task,
+                self.settings,
+                agents,
+                _SECTION_FACTORIES[section][0],
+                getattr(task_factory, _SECTION_FACTORIES[section][1]),
+                usage,
+                stage=f"task.{section}",
+            )
+            for section in sections
+        }
+        timeout = self.settings.task_timeout
+        deadline = time.monotonic() + timeout if timeout else None
+
+        outputs: Dict[str, str] = {}
+        failed: Set[str] = set()
+        try:
+            for section, future in futures.items():
+                remaining = (
+                    max(0.0, deadline - time.monotonic()) if deadline is not None else None
+                )
+                try:
+                    outputs[section] = future.result(timeout=remaining)
+                except FutureTimeoutError:
+                    failed.add(section)
+                    usage.record_failure(f"task.{section}", timeout)
+                    outputs[section] = _degraded_section(
+                        f"timed out after {timeout:g}s"
+                    )
+                except Exception as exc:  # noqa: BLE001 - degrade only this section
+                    failed.add(section)
+                    outputs[section] = _degraded_section(str(exc) or type(exc).__name__)
+        finally:
+            # Executor.shutdown(cancel_futures=True) needs Python 3.9.
+            for future in futures.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+        return outputs, failed
+
+    def _run_chunked(
+        self,
+        task_factory: ArticleAnalysisTasks,
+        chunks: Sequence[ArticleChunk],
+        sections: Sequence[str],
+        usage: LLMUsage,
+    ) -> Tuple[Dict[str, str], Set[str]]:
+        """Map every (section, chunk) pair in parallel, then reduce per section.
+
+        Chunks carry global [P#] paragraph labels so the reduced sections can
+        still cite paragraphs of the original article. When a section's partial
+        analyses together exceed ``CHUNK_TOKEN_BUDGET``, neighbouring partials
+        are merged in rounds until they fit, so the final reduce prompt stays
+        within the budget that chunking was meant to keep.
+        """
+        agents = self.agents
+        outputs: Dict[str, str] = {}
+        failed: Set[str] = set()
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, self.settings.chunk_concurrency), thread_name_prefix="chunk"
+        ) as executor:
+            map_futures = {
+                section: [
+                    (
+                        chunk,
+                        executor.submit(
+                            _run_task,
+                            self.settings,
+                            agents,
+                            _SECTION_FACTORIES[section][0],
+                            partial(
+                                task_factory.analyze_chunk,
+                                section,
+                                chunk=chunk,
+                                chunk_count=len(chunks),
+                            ),
+                            usage,
+                            stage=f"task.{section}.map",
+                        ),
+                    )
+                    for chunk in chunks
+                ]
+                for section in sections
+            }
+
+            partials = {
+                section: self._collect(section, pending, failed)
+                for section, pending in map_futures.items()
+            }
+            budget = max(1, self.settings.chunk_token_budget)
+            while True:
+                merges = {
+                    section: _group_partials(parts, budget)
+                    for section, parts in partials.items()
+                    if len(parts) > 1 and _partials_tokens(parts) > budget
+                }
+                if not merges:
+                    break
+                for section, groups in merges.items():
+                    pending = []
+                    for index, group in enumerate(groups, start=1):
+                        span = _merged_chunk(index, group)
+                        if len(group) == 1:
+                            pending.append((span, _done(group[0][1])))
+                            continue
+                        pending.append(
+                            (
+                                span,
+                                executor.submit(
+                                    _run_task,
+                                    self.settings,
+                                    agents,
+                                    _SECTION_FACTORIES[section][0],
+                                    partial(task_factory.reduce_partials, section, partials=group),
+                                    usage,
+                                    stage=f"task.{section}.merge",
+                                ),
+                            )
+                        )
+                    merges[section] = pending
+                for section, pending in merges.items():
+                    partials[section] = self._collect(section, pending, failed)
+
+            reduce_futures = {}
+            for section, parts in partials.items():
+                reduce_futures[section] = executor.submit(
+                    _run_task,
+                    self.settings,
+                    agents,
+                    _SECTION_FACTORIES[section][0],
+                    partial(task_factory.reduce_partials, section, partials=parts),
+                    usage,
+                    stage=f"task.{section}.reduce",
+                )
+
+            for section, future in reduce_futures.items():
+                try:
+                    outputs[section] = future.result()
+                except Exception as exc:  # noqa: BLE001 - degrade only this section
+                    failed.add(section)
+                    outputs[section] = _degraded_section(str(exc) or type(exc).__name__)
+        return outputs, failed
+
+    @staticmethod
+    def _collect(
+        section: str, pending: Sequence[Tuple[ArticleChunk, Future]], failed: Set[str]
+    ) -> List[Tuple[ArticleChunk, str]]:
+        """Wait for a section's partial analyses, marking failed ones in place."""
+        partials: List[Tuple[ArticleChunk, str]] = []
+        for chunk, future in pending:
+            try:
+                partials.append((chunk, future.result()))
+            except Exception as exc:  # noqa: BLE001 - degrade only this section
+                failed.add(section)
+                partials.append((chunk, _degraded_section(str(exc) or type(exc).__name__)))
+        return partials
+
+    def write(self, result: AnalysisResult, stream: Optional["ReportStream"] = None) -> Path:
+        telemetry = result.telemetry
+        with telemetry.stage("write"):
+            if stream is not None:
+                output_path = stream.path
+                stream.complete(result.report)
+            else:
+                output_path = _derive_output_path(self.settings, result.article.title, result.url)
+                output_path.write_text(result.report, encoding="utf-8")
+        total = telemetry.elapsed()
+        telemetry.record(StageSample(stage="total", seconds=total))
+
+        self.repository.record_analysis(
+            article_id=result.article.record.id,
+            model_provider=self.settings.model_provider,
+            model_name=self.settings.model_name,
+            output_path=output_path,
+            created_at=datetime.utcnow(),
+            strategy=result.strategy,
+            duration_seconds=total,
+            input_tokens=result.usage.input_tokens,
+            output_tokens=result.usage.output_tokens,
+            cache_hits=len(result.cache_hits),
+            cache_misses=len(result.cache_misses),
+            failed_sections=len(result.failed_sections),
+            article_tokens=result.compaction.original_tokens if result.compaction else None,
+            compacted_tokens=result.compaction.compacted_tokens if result.compaction else None,
+            stages=telemetry.samples,
+            sections=result.sections,
+            content_hash=result.article.record.content_hash,
+        )
+        return output_path
+
+
+def _run_task(
+    settings: Settings,
+    agents: ArticleAnalysisAgents,
+    agent_factory: str,
+    build_task: Callable[[object], object],
+    usage: LLMUsage,
+    *,
+    stage: str,
+) -> str:
+    """Run one task as a single-agent crew with an agent leased from ``agent_factory``.
+
+    The call goes through the provider limiter, which may delay it and
+    retries it when the provider reports overload. In routing mode the task
+    goes to the fastest healthy backend, falling back to the others and,
+    with ``ROUTING_HEDGE``, racing a second backend when the first is slow.
+    """
+    started = time.perf_counter()
+
+    def attempt(backend: Backend) -> object:
+        with agents.lease(agent_factory, backend.llm) as agent:
+            task = build_task(agent)
+            crew = Crew(
+                agents=[agent],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=settings.verbose,
+            )
+            backend.limiter.call(
+                crew.kickoff, tokens=_prompt_tokens(task), on_retry=usage.record_retry
+            )
+        backend.limiter.charge(estimate_tokens(_task_output(task)))
+        return task
+
+    try:
+        if agents.router is None:
+            backend, hedged = agents.backends[0], False
+            task = attempt(backend)
+        else:
+            # Racing two streams into one report would interleave their tokens.
+            hedge = settings.routing_hedge and agents.on_token is None
+            task, backend, hedged = run_routed(
+                agents.backends,
+                agents.router,
+                attempt,
+                hedge_percentile=settings.routing_hedge_percentile if hedge else None,
+            )
+    except Exception:
+        usage.record_failure(stage, time.perf_counter() - started)
+        raise
+    output = _task_output(task)
+    usage.record(
+        task,
+        output,
+        stage=stage,
+        seconds=time.perf_counter() - started,
+        backend=f"{backend.name} (hedged)" if hedged else backend.name,
+    )
+    return output
+
+
+def _prompt_tokens(task: object) -> int:
+    return estimate_tokens(
+        f"{getattr(task, 'description', '')}\n{getattr(task, 'expected_output', '')}"
+    )
+
+
+def _section_backends(
+    cache_hits: Sequence[str], usage: LLMUsage, *, combined: bool
+) -> Dict[str, str]:
+    """Describe which backend produced each section, from its stages' records."""
+    produced: Dict[str, str] = {}
+    for section in SECTIONS:
+        if section in cache_hits:
+            produced[section] = "result cache"
+            continue
+        names = sorted(
+            {
+                backend
+                for stage, backend in usage.backends.items()
+                if stage.split(".")[1] == section
+                or (combined and stage == "task.combined")
+            }
+        )
+        produced[section] = ", ".join(names) or "unavailable"
+    return produced
+
+
+def _partials_tokens(partials: Sequence[Tuple[ArticleChunk, str]]) -> int:
+    return sum(estimate_tokens(render_partial(chunk, output)) for chunk, output in partials)
+
+
+def _group_partials(
+    partials: Sequence[Tuple[ArticleChunk, str]], budget: int
+) -> List[List[Tuple[ArticleChunk, str]]]:
+    """Pack consecutive partials into groups of at most ``budget`` tokens.
+
+    Every group but possibly the last holds at least two partials, so each
+    merge round shrinks the list even when single partials exceed the budget.
+    """
+    groups: List[List[Tuple[ArticleChunk, str]]] = []
+    current: List[Tuple[ArticleChunk, str]] = []
+    current_tokens = 0
+    for chunk, output in partials:
+        tokens = estimate_tokens(render_partial(chunk, output))
+        if len(current) >= 2 and current_tokens + tokens > budget:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append((chunk, output))
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _merged_chunk(index: int, group: Sequence[Tuple[ArticleChunk, str]]) -> ArticleChunk:
+    """A part spanning the paragraphs of every chunk in ``group``."""
+    first, last = group[0][0], group[-1][0]
+    return ArticleChunk(
+        index=index,
+        paragraphs=[first.paragraphs[0], last.paragraphs[-1]],
+        tokens=sum(chunk.tokens for chunk, _ in group),
+    )
+
+
+def _done(value: str) -> Future:
+    future: Future = Future()
+    future.set_result(value)
+    return future
+
+
+def _degraded_section(reason: str) -> str:
+    return f"_Section unavailable: {reason}._"
+
+
+def _task_output(task: object) -> str:
+    for attr in ("output", "result", "raw_output"):
+        value = getattr(task, attr, None)
+        if value:
+            return str(value)
+    return ""
+
+
+def _compose_report(
+    *,
+    url: str,
+    title: Optional[str],
+    summary_md: str,
+    assumptions_md: str,
+    errors_md: str,
+    settings: Settings,
+    method: Optional[str] = None,
+    incomplete: Optional[str] = None,
+    refreshed: Optional[str] = None,
+    backends: Optional[Dict[str, str]] = None,
+    compaction: Optional[str] = None,
+) -> str:
+    generated_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    metadata = [
+        f"- **URL:** {url}",
+        f"- **Title:** {title or 'Unknown'}",
+        f"- **Generated:** {generated_at}",
+        f"- **Model:** {settings.model_name} ({settings.model_provider})",
+    ]
+    if method:
+        metadata.append(f"- **Method:** {method}")
+    if compaction:
+        metadata.append(f"- **Input:** {compaction}")
+    if refreshed:
+        metadata.append(f"- **Refreshed:** {refreshed}")
+    if backends:
+        metadata.append(
+            "- **Produced By:** "
+            + "; ".join(f"{section}: {backend}" for section, backend in backends.items())
+        )
+
+    notice = [f"> **Incomplete report:** {incomplete}.", ""] if incomplete else []
+
+    return "\n".join(
+        [
+            "# Article Intelligence Report",
+            "",
+            *notice,
+            "## Document Metadata",
+            *metadata,
+            "",
+            "## Executive Summary",
+            summary_md.strip() or "_No summary returned._",
+            "",
+            "## Authorial Assumptions",
+            assumptions_md.strip() or "_No assumptions identified._",
+            "",
+            "## Potential Errors & Biases",
+            errors_md.strip() or "_No potential issues detected._",
+            "",
+            "> _Report generated by the Article Analysis Agent._",
+        ]
+    )
+
+
+def _slugify(value: str) -> str:
+    cleaned = "".join(ch.lower() if ch.isalnum() else "-" for ch in value)
+    collapsed = "-".join(filter(None, cleaned.split("-")))
+    return collapsed or "article"
+
+
+def _derive_output_path(settings: Settings, title: Optional[str], url: str) -> Path:
+    """Create an empty report file with a name no other writer holds, and return its path."""
+    timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+    base = title or url
+    slug = _slugify(base)[:60]
+    candidate = settings.output_dir / f"{timestamp}-{slug}.md"
+    suffix = 2
+    # Batch writers can finish several reports for the same title within one
+    # second; creating the file with "x" claims the name atomically.
+    while True:
+        try:
+            with open(candidate, "x", encoding="utf-8"):
+                return candidate
+        except FileExistsError:
+            candidate = settings.output_dir / f"{timestamp}-{slug}-{suffix}.md"
+            suffix += 1
@@ -0,0 +1,311 @@
+import gzip
+import io
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from article_service import ArticleDownloadError, ArticleService
+from config import Settings
+from storage import ArticleRepository
+from telemetry import Telemetry
+from urls import canonicalize_url
+
+# fetched: newly cached; updated: the cached body changed; unchanged: the
+# origin confirmed the cached body; fresh: skipped, checked within ARTICLE_TTL;
+# stale: the origin was unreachable and the cached copy was kept.
+PREFETCH_STATUSES = ("fetched", "updated", "unchanged", "fresh", "stale", "failed")
+
+# Sitemap indexes may list further indexes; anything nested deeper is ignored.
+_MAX_SITEMAP_DEPTH = 3
+_GZIP_MAGIC = b"\x1f\x8b"
+_LEADING_NOISE = b"\xef\xbb\xbf \t\r\n"
+
+
+@dataclass
+class PrefetchOutcome:
+    url: str
+    status: str
+    seconds: float = 0.0
+    title: Optional[str] = None
+    error: Optional[str] = None
+
+
+class HostThrottle:
+    """Cap concurrent requests per host and space out the starts of its requests."""
+
+    def __init__(self, max_concurrency: int, delay: float):
+        self.max_concurrency = max(1, max_concurrency)
+        self.delay = max(0.0, delay)
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            slots = self._slots.setdefault(
+                host, threading.BoundedSemaphore(self.max_concurrency)
+            )
+        with slots:
+            # Start times are handed out under the lock, so requests to one
+            # host stay ``delay`` apart however many threads are waiting.
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+class Prefetcher:
+    """Warm the article cache from feeds, sitemaps and URL lists ahead of analysis."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        repository: Optional[ArticleRepository] = None,
+        *,
+        on_complete: Optional[Callable[[PrefetchOutcome], None]] = None,
+    ):
+        self.settings = settings
+        self.on_complete = on_complete
+        self._owns_repository = repository is None
+        self.repository = repository or ArticleRepository(settings.database_path)
+        self._parse_executor = (
+            ProcessPoolExecutor(max_workers=settings.extract_processes)
+            if settings.extract_processes > 0
+            else None
+        )
+        self.service = ArticleService.from_settings(
+            self.repository, settings, parse_executor=self._parse_executor
+        )
+        self.throttle = HostThrottle(
+            settings.prefetch_host_concurrency, settings.prefetch_host_delay
+        )
+        # Nested sitemaps that could not be read; discovery carries on without them.
+        self.discovery_errors: List[str] = []
+
+    def close(self) -> None:
+        self.service.session.close()
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown()
+        if self._owns_repository:
+            self.repository.close()
+
+    def discover(self, sources: Iterable[str]) -> List[str]:
+        """Expand sources into article URLs, in the order they are listed.
+
+        URLs are returned as listed, one per canonical form, since the
+        canonical form only keys the cache.
+
+        An http(s) source must be an RSS/Atom feed or a sitemap, optionally
+        gzipped; sitemap indexes are followed. ``-`` reads one URL per line
+        from stdin, and any other source is a local file holding a feed, a
+        sitemap or one URL per line.
+        """
+        found: Dict[str, str] = {}
+        for source in sources:
+            for url in self._expand(source, depth=0):
+                found.setdefault(canonicalize_url(url), url)
+        return list(found.values())
+
+    def run(self, urls: Sequence[str]) -> List[PrefetchOutcome]:
+        """Download and extract every URL not checked within ``ARTICLE_TTL``.
+
+        Downloads run on ``FETCH_CONCURRENCY`` threads in an order that
+        alternates between hosts, each host limited by the throttle.
+        """
+        outcomes: List[PrefetchOutcome] = []
+        keys = [canonicalize_url(url) for url in urls]
+        checked = self.repository.last_checked(keys)
+        ttl = self.settings.article_ttl
+        now = datetime.utcnow()
+        pending = []
+        for url, key in zip(urls, keys):
+            checked_at = checked.get(key)
+            if checked_at is not None and (ttl is None or now - checked_at < ttl):
+                self._finish(outcomes, PrefetchOutcome(url=url, status="fresh"))
+            else:
+                pending.append(url)
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, self.settings.fetch_concurrency), thread_name_prefix="prefetch"
+        ) as executor:
+            futures = [executor.submit(self._fetch, url) for url in _interleave_hosts(pending)]
+            for future in as_completed(futures):
+                self._finish(outcomes, future.result())
+        return outcomes
+
+    def _expand(self, source: str, *, depth: int) -> Iterator[str]:
+        if source == "-":
+            yield from _url_lines(sys.stdin.read())
+            return
+        remote = urlsplit(source).scheme in ("http", "https")
+        if remote:
+            with self.throttle.slot(source):
+                data = self.service.download(source)
+        else:
+            data = Path(source).read_bytes()
+        if data.startswith(_GZIP_MAGIC):
+            data = self._gunzip(source, data)
+
+        if not remote and not data.lstrip(_LEADING_NOISE).startswith(b"<"):
+            yield from _url_lines(data.decode("utf-8", errors="replace"))
+            return
+
+        try:
+            kind, urls = parse_feed(data, base=source if remote else None)
+        except ValueError as exc:
+            hint = " Pass article URLs in a file, one per line, or on stdin." if remote else ""
+            raise ValueError(f"{source}: {exc}{hint}") from exc
+        if kind != "sitemapindex":
+            yield from urls
+            return
+        if depth >= _MAX_SITEMAP_DEPTH:
+            self.discovery_errors.append(f"{source}: sitemap indexes nested too deeply.")
+            return
+        for sitemap in urls:
+            try:
+                yield from self._expand(sitemap, depth=depth + 1)
+            except (ArticleDownloadError, OSError, ValueError) as exc:
+                self.discovery_errors.append(f"{sitemap}: {exc}")
+
+    def _gunzip(self, source: str, data: bytes) -> bytes:
+        limit = self.settings.max_download_bytes
+        with gzip.GzipFile(fileobj=io.BytesIO(data)) as handle:
+            try:
+                data = handle.read(limit + 1 if limit else -1)
+            except (OSError, EOFError) as exc:
+                raise ValueError(f"{source} is not a valid gzip file: {exc}") from exc
+        if limit and len(data) > limit:
+            raise ValueError(f"{source} expands beyond the {limit:,} byte download limit.")
+        return data
+
+    def _fetch(self, url: str) -> PrefetchOutcome:
+        started = time.perf_counter()
+        requested_at = datetime.utcnow()
+        telemetry = Telemetry()
+        try:
+            with self.throttle.slot(url):
+                payload = self.service.get_article(url, telemetry=telemetry)
+        except Exception as exc:  # noqa: BLE001 - a failed URL must not stop the prefetch
+            return PrefetchOutcome(
+                url=url,
+                status="failed",
+                seconds=time.perf_counter() - started,
+                error=str(exc) or type(exc).__name__,
+            )
+
+        record = payload.record
+        cache_hit = any(sample.cache_hit for sample in telemetry.samples if sample.stage == "fetch")
+        if not cache_hit:
+            status = "updated" if payload.previous else "fetched"
+        elif (record.validated_at or record.fetched_at) >= requested_at:
+            status = "unchanged"
+        else:
+            status = "stale"
+        return PrefetchOutcome(
+            url=url,
+            status=status,
+            seconds=time.perf_counter() - started,
+            title=payload.title,
+        )
+
+    def _finish(self, outcomes: List[PrefetchOutcome], outcome: PrefetchOutcome) -> None:
+        outcomes.append(outcome)
+        if self.on_complete:
+            self.on_complete(outcome)
+
+
+def parse_feed(data: bytes, base: Optional[str] = None) -> Tuple[str, List[str]]:
+    """Return the root element name of an RSS, Atom or sitemap document and its links.
+
+    For ``"sitemapindex"`` the links are further sitemaps; otherwise they are
+    articles. Relative links are resolved against ``base``.
+    """
+    try:
+        root = ElementTree.fromstring(data)
+    except ElementTree.ParseError as exc:
+        raise ValueError(f"Not a well-formed feed or sitemap ({exc}).") from exc
+
+    kind = _local_name(root.tag)
+    links: List[str] = []
+    if kind in ("urlset", "sitemapindex"):
+        entry = "url" if kind == "urlset" else "sitemap"
+        for element in _elements(root, entry):
+            links.extend(filter(None, [_child_text(element, "loc")]))
+    elif kind in ("rss", "RDF"):
+        for item in _elements(root, "item"):
+            link = _child_text(item, "link")
+            if not link:
+                guid = next(
+                    (child for child in item if _local_name(child.tag) == "guid"), None
+                )
+                if guid is not None and guid.get("isPermaLink", "true") == "true":
+                    link = (guid.text or "").strip()
+            if link:
+                links.append(link)
+    elif kind == "feed":
+        for entry in _elements(root, "entry"):
+            href = next(
+                (
+                    child.get("href")
+                    for child in entry
+                    if _local_name(child.tag) == "link"
+                    and child.get("rel", "alternate") == "alternate"
+                    and child.get("href")
+                ),
+                None,
+            )
+            if href:
+                links.append(href)
+    else:
+        raise ValueError(f"Expected an RSS/Atom feed or sitemap, found <{kind}>.")
+
+    if base:
+        links = [urljoin(base, link) for link in links]
+    return kind, [link for link in links if urlsplit(link).scheme in ("http", "https")]
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _elements(root: ElementTree.Element, name: str) -> Iterator[ElementTree.Element]:
+    return (element for element in root.iter() if _local_name(element.tag) == name)
+
+
+def _child_text(element: ElementTree.Element, name: str) -> Optional[str]:
+    for child in element:
+        if _local_name(child.tag) == name and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _url_lines(text: str) -> Iterator[str]:
+    for line in text.splitlines():
+        url = line.strip()
+        if url and not url.startswith("#"):
+            yield url
+
+
+def _interleave_hosts(urls: Sequence[str]) -> List[str]:
+    """Order URLs round-robin across hosts, so the workers spread over many hosts."""
+    by_host: Dict[str, List[str]] = {}
+    for url in urls:
+        by_host.setdefault(urlsplit(url).hostname or "", []).append(url)
+    queues = list(by_host.values())
+    ordered: List[str] = []
+    for index in range(max(map(len, queues), default=0)):
+        ordered.extend(queue[index] for queue in queues if index < len(queue))
+    return ordered
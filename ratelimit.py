@@ -0,0 +1,250 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from config import Settings
+
+T = TypeVar("T")
+
+# Status codes that mean "slow down or try again", not "this request is wrong".
+_RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+_RETRYABLE_NAMES = ("ratelimit", "timeout", "connection", "overloaded", "serviceunavailable")
+_RETRYABLE_MESSAGES = (
+    "rate limit",
+    "too many requests",
+    "overloaded",
+    "server is busy",
+    "temporarily unavailable",
+    "timed out",
+    "connection refused",
+    "connection reset",
+)
+_MAX_BACKOFF = 60.0
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of blocking.
+
+    :meth:`reserve` always succeeds and returns how long the caller must wait
+    before using what it reserved, so a request larger than the burst size
+    is delayed rather than refused.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+
+class AdaptiveConcurrency:
+    """In-flight limit tuned by additive increase, multiplicative decrease.
+
+    Every call that finishes without sign of overload raises the limit by
+    ``1 / limit`` (about one slot per window of calls). An overload error
+    halves it, and so does latency drifting above ``latency_tolerance``
+    times its long-run average, which catches local servers that queue
+    rather than reject.
+    """
+
+    def __init__(self, max_limit: int, *, latency_tolerance: float = 2.0):
+        self.max_limit = max(1, max_limit)
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._recent_latency: Optional[float] = None
+        self._baseline_latency: Optional[float] = None
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, seconds: float, *, overloaded: bool) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded:
+                self._decrease()
+            elif seconds > 0:
+                self._observe(seconds)
+            self._condition.notify_all()
+
+    def _observe(self, seconds: float) -> None:
+        if self._baseline_latency is None:
+            self._recent_latency = self._baseline_latency = seconds
+        else:
+            self._recent_latency = 0.7 * self._recent_latency + 0.3 * seconds
+            self._baseline_latency = 0.95 * self._baseline_latency + 0.05 * seconds
+        if self._recent_latency > self.latency_tolerance * self._baseline_latency:
+            self._decrease()
+            # Start measuring again at the new level instead of decreasing on every call.
+            self._recent_latency = self._baseline_latency
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _decrease(self) -> None:
+        self.limit = max(1.0, self.limit / 2)
+
+
+class ProviderLimiter:
+    """Requests per second, tokens per minute and in-flight limits for one LLM provider.
+
+    :meth:`call` waits for budget, runs the call, and retries overload errors
+    (429s, 5xx, timeouts) with jittered exponential backoff. A ``Retry-After``
+    from the provider pauses every caller sharing the limiter, not just the
+    one that was rejected.
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_second: float = 0.0,
+        tokens_per_minute: int = 0,
+        max_in_flight: int = 8,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+    ):
+        self.requests = (
+            TokenBucket(requests_per_second, max(1.0, requests_per_second))
+            if requests_per_second > 0
+            else None
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute > 0 else None
+        )
+        self.concurrency = AdaptiveConcurrency(max_in_flight)
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        *,
+        tokens: int = 0,
+        on_retry: Optional[Callable[[BaseException, float], None]] = None,
+    ) -> T:
+        attempt = 0
+        while True:
+            self._wait_for_budget(tokens)
+            self.concurrency.acquire()
+            started = time.monotonic()
+            try:
+                result = fn()
+            except Exception as exc:
+                overloaded = is_retryable(exc)
+                self.concurrency.release(time.monotonic() - started, overloaded=overloaded)
+                if not overloaded or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt, exc)
+                attempt += 1
+                if on_retry:
+                    on_retry(exc, delay)
+                time.sleep(delay)
+                continue
+            self.concurrency.release(time.monotonic() - started, overloaded=False)
+            return result
+
+    def charge(self, tokens: int) -> None:
+        """Count tokens only known after a call, such as the generated output."""
+        if self.tokens is not None and tokens > 0:
+            self.tokens.reserve(tokens)
+
+    def _wait_for_budget(self, tokens: int) -> None:
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if self.requests is not None:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens is not None and tokens > 0:
+            delay = max(delay, self.tokens.reserve(min(tokens, self.tokens.capacity)))
+        if delay > 0:
+            time.sleep(delay)
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            delay = min(_MAX_BACKOFF, retry_after) + random.uniform(0, self.retry_base_delay)
+            with self._lock:
+                self._resume_at = max(self._resume_at, time.monotonic() + delay)
+            return delay
+        # "Full jitter": spread retries over the whole window so callers that
+        # failed together do not come back together.
+        return random.uniform(0, min(_MAX_BACKOFF, self.retry_base_delay * 2**attempt))
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether ``exc`` (or an exception it wraps) signals overload rather than a bad request."""
+    for error in _exception_chain(exc):
+        status = getattr(error, "status_code", None) or getattr(error, "status", None)
+        if isinstance(status, int):
+            return status in _RETRYABLE_STATUS
+        name = type(error).__name__.lower()
+        if any(marker in name for marker in _RETRYABLE_NAMES):
+            return True
+        message = str(error).lower()
+        if any(marker in message for marker in _RETRYABLE_MESSAGES):
+            return True
+    return False
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    for error in _exception_chain(exc):
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        value = headers.get("retry-after") if headers is not None else None
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return None
+    return None
+
+
+def _exception_chain(exc: BaseException):
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+_limiters: Dict[Tuple, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def provider_limiter(settings: Settings, provider: Optional[str] = None) -> ProviderLimiter:
+    """Return the limiter shared by every pipeline in this process that uses the same provider."""
+    provider = provider or settings.model_provider
+    endpoint = settings.openrouter_base_url if provider == "openrouter" else "ollama"
+    key = (
+        provider,
+        endpoint,
+        settings.llm_requests_per_second,
+        settings.llm_tokens_per_minute,
+        settings.llm_max_in_flight,
+        settings.llm_max_retries,
+        settings.llm_retry_base_delay,
+    )
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = ProviderLimiter(
+                requests_per_second=settings.llm_requests_per_second,
+                tokens_per_minute=settings.llm_tokens_per_minute,
+                max_in_flight=settings.llm_max_in_flight,
+                max_retries=settings.llm_max_retries,
+                retry_base_delay=settings.llm_retry_base_delay,
+            )
+        return limiter
@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from ratelimit import ProviderLimiter
+from telemetry import percentile
+
+T = TypeVar("T")
+
+# Outcomes kept per backend; older calls stop influencing routing.
+_WINDOW = 50
+# A backend failing at least this share of its recent calls is routed around.
+_UNHEALTHY_ERROR_RATE = 0.5
+_MIN_SAMPLES = 3
+# ...as is one whose last few calls all failed, however good its history.
+_MAX_CONSECUTIVE_FAILURES = 3
+# An unhealthy backend is probed again once it has not failed for this long.
+_COOLDOWN_SECONDS = 30.0
+# Hedging waits for enough latency history to pick a meaningful delay.
+_MIN_HEDGE_SAMPLES = 5
+
+
+@dataclass
+class Backend:
+    """One provider and model an agent can be built on."""
+
+    provider: str
+    model: str
+    llm: object = field(repr=False)
+    limiter: ProviderLimiter = field(repr=False)
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+
+@dataclass
+class BackendHealth:
+    name: str
+    calls: int
+    error_rate: float
+    p50: Optional[float]
+    healthy: bool
+
+
+class LatencyRouter:
+    """Rank backends by rolling latency and error rate.
+
+    Healthy backends are ordered fastest first by median latency; a backend
+    without history is tried before measured ones so every backend gets
+    measured. Unhealthy backends stay at the end of the list as a last resort
+    until a cooldown passes without failures, when they are probed again.
+    """
+
+    def __init__(self, window: int = _WINDOW):
+        self._outcomes: Dict[str, Deque[Tuple[float, bool]]] = {}
+        self._last_failure: Dict[str, float] = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._outcomes.setdefault(name, deque(maxlen=self._window)).append((seconds, ok))
+            if not ok:
+                self._last_failure[name] = time.monotonic()
+
+    def health(self, name: str) -> BackendHealth:
+        with self._lock:
+            outcomes = list(self._outcomes.get(name, ()))
+            last_failure = self._last_failure.get(name)
+        latencies = sorted(seconds for seconds, ok in outcomes if ok)
+        errors = sum(1 for _, ok in outcomes if not ok)
+        error_rate = errors / len(outcomes) if outcomes else 0.0
+        trailing = 0
+        for _, ok in reversed(outcomes):
+            if ok:
+                break
+            trailing += 1
+        failing = (
+            len(outcomes) >= _MIN_SAMPLES and error_rate >= _UNHEALTHY_ERROR_RATE
+        ) or trailing >= _MAX_CONSECUTIVE_FAILURES
+        cooling = (
+            last_failure is not None and time.monotonic() - last_failure < _COOLDOWN_SECONDS
+        )
+        return BackendHealth(
+            name=name,
+            calls=len(outcomes),
+            error_rate=error_rate,
+            p50=percentile(latencies, 0.5) if latencies else None,
+            healthy=not (failing and cooling),
+        )
+
+    def rank(self, backends: Sequence[Backend]) -> List[Backend]:
+        health = {backend.name: self.health(backend.name) for backend in backends}
+
+        def key(indexed: Tuple[int, Backend]) -> Tuple[bool, float, int]:
+            position, backend = indexed
+            state = health[backend.name]
+            latency = state.p50 if state.p50 is not None else 0.0
+            return (not state.healthy, latency, position)
+
+        return [backend for _, backend in sorted(enumerate(backends), key=key)]
+
+    def hedge_delay(self, name: str, fraction: float) -> Optional[float]:
+        """Latency percentile after which a hedged request is worth sending."""
+        with self._lock:
+            latencies = sorted(seconds for seconds, ok in self._outcomes.get(name, ()) if ok)
+        if len(latencies) < _MIN_HEDGE_SAMPLES:
+            return None
+        return percentile(latencies, fraction)
+
+
+_router = LatencyRouter()
+
+
+def shared_router() -> LatencyRouter:
+    """The router whose statistics every pipeline in this process contributes to."""
+    return _router
+
+
+def run_routed(
+    backends: Sequence[Backend],
+    router: LatencyRouter,
+    attempt: Callable[[Backend], T],
+    *,
+    hedge_percentile: Optional[float] = None,
+) -> Tuple[T, Backend, bool]:
+    """Run ``attempt`` on the best backend, falling back down the ranking on failure.
+
+    With ``hedge_percentile`` a second backend is started once the first has
+    run longer than that percentile of its recent latency, and whichever
+    succeeds first wins. Returns the result, the backend that produced it and
+    whether it came from a hedged request. The losing call is left to finish
+    in the background; its outcome still feeds the router.
+    """
+    pending = router.rank(backends)
+    if len(pending) == 1:
+        backend = pending[0]
+        return _timed(router, backend, attempt), backend, False
+
+    executor = ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="route")
+    running: Dict[Future, Backend] = {}
+    hedged: Optional[Backend] = None
+    last_error: Optional[BaseException] = None
+
+    def launch() -> Backend:
+        backend = pending.pop(0)
+        running[executor.submit(_timed, router, backend, attempt)] = backend
+        return backend
+
+    try:
+        primary = launch()
+        while running:
+            delay = None
+            if hedge_percentile and hedged is None and pending and len(running) == 1:
+                delay = router.hedge_delay(primary.name, hedge_percentile)
+            done, _ = wait(list(running), timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = launch()
+                continue
+            for future in done:
+                backend = running.pop(future)
+                try:
+                    return future.result(), backend, backend is hedged
+                except Exception as exc:  # noqa: BLE001 - try the next backend
+                    last_error = exc
+            if not running and pending:
+                primary = launch()
+        raise last_error
+    finally:
+        executor.shutdown(wait=False)
+
+
+def _timed(router: LatencyRouter, backend: Backend, attempt: Callable[[Backend], T]) -> T:
+    started = time.perf_counter()
+    try:
+        result = attempt(backend)
+    except Exception:
+        router.record(backend.name, time.perf_counter() - started, ok=False)
+        raise
+    router.record(backend.name, time.perf_counter() - started, ok=True)
+    return result
@@ -0,0 +1,260 @@
+import json
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pipeline import AnalysisPipeline
+from telemetry import Telemetry
+
+_STOP = object()
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while every queue slot is taken."""
+
+
+@dataclass
+class Job:
+    id: str
+    url: str
+    status: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    output_path: Optional[Path] = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "id": self.id,
+            "url": self.url,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+            "output_path": str(self.output_path) if self.output_path else None,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "report_url": f"/jobs/{self.id}/report" if self.status == "succeeded" else None,
+        }
+
+
+class JobManager:
+    """Run submitted URLs through one warm pipeline with a fixed worker pool.
+
+    The queue is bounded; :meth:`submit` raises :class:`QueueFullError`
+    instead of accepting work the workers cannot get to. Finished jobs are
+    kept for lookups until ``history_size`` newer jobs have finished.
+    """
+
+    def __init__(
+        self,
+        pipeline: AnalysisPipeline,
+        *,
+        workers: int,
+        queue_size: int,
+        history_size: int = 1000,
+    ):
+        self.pipeline = pipeline
+        self.workers = max(1, workers)
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, queue_size))
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._history_size = history_size
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+
+    def start(self) -> None:
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Let running jobs finish, then stop the workers; queued jobs are dropped."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+
+    def submit(self, url: str) -> Job:
+        job = Job(id=uuid.uuid4().hex[:12], url=url, status="queued", created_at=datetime.utcnow())
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFullError(
+                    f"The job queue is full ({self._queue.maxsize} jobs); retry later."
+                ) from None
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self, limit: int = 50) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())[-limit:][::-1]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        telemetry = Telemetry()
+        try:
+            article = self.pipeline.fetch(job.url, telemetry=telemetry)
+            result = self.pipeline.analyze(job.url, article, telemetry=telemetry)
+            job.output_path = self.pipeline.write(result)
+            job.cache_hits = len(result.cache_hits)
+            job.cache_misses = len(result.cache_misses)
+            job.status = "succeeded"
+        except Exception as exc:  # noqa: BLE001 - a failed job must not stop its worker
+            job.error = str(exc) or type(exc).__name__
+            job.status = "failed"
+        finally:
+            job.finished_at = datetime.utcnow()
+            self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            finished = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.status in ("succeeded", "failed")
+            ]
+            for job_id in finished[: max(0, len(finished) - self._history_size)]:
+                del self._jobs[job_id]
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    manager: JobManager
+    log: Callable[[str], None]
+
+    def do_GET(self) -> None:
+        parts = [part for part in self.path.split("?", 1)[0].split("/") if part]
+        if parts == ["health"]:
+            self._send_json(
+                200,
+                {
+                    "status": "ok",
+                    "workers": self.manager.workers,
+                    "jobs": self.manager.counts(),
+                },
+            )
+        elif parts == ["jobs"]:
+            self._send_json(200, {"jobs": [job.to_dict() for job in self.manager.list_jobs()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.manager.get(parts[1])
+            if job is None:
+                self._send_json(404, {"error": "Unknown job."})
+            else:
+                self._send_json(200, job.to_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "report":
+            self._send_report(parts[1])
+        else:
+            self._send_json(404, {"error": "Not found."})
+
+    def do_POST(self) -> None:
+        if self.path.split("?", 1)[0].rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "Not found."})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError
+            urls = payload["urls"] if "urls" in payload else [payload["url"]]
+            # A string would otherwise be taken as a list of one-character URLs.
+            if not isinstance(urls, list) or not urls:
+                raise ValueError
+            if not all(isinstance(url, str) and url.strip() for url in urls):
+                raise ValueError
+        except (ValueError, KeyError):
+            self._send_json(400, {"error": 'Send JSON like {"url": "..."} or {"urls": [...]}.'})
+            return
+
+        accepted = []
+        for url in urls:
+            try:
+                accepted.append(self.manager.submit(url.strip()).to_dict())
+            except QueueFullError as exc:
+                self._send_json(
+                    429,
+                    {"error": str(exc), "accepted": accepted},
+                    headers=[("Retry-After", "5")],
+                )
+                return
+        if "urls" in payload:
+            self._send_json(202, {"jobs": accepted})
+        else:
+            self._send_json(202, accepted[0], headers=[("Location", f"/jobs/{accepted[0]['id']}")])
+
+    def _send_report(self, job_id: str) -> None:
+        job = self.manager.get(job_id)
+        if job is None:
+            self._send_json(404, {"error": "Unknown job."})
+        elif job.status != "succeeded":
+            self._send_json(409, {"error": f"Job is {job.status}.", "job": job.to_dict()})
+        else:
+            try:
+                body = job.output_path.read_bytes()
+            except FileNotFoundError:
+                self._send_json(410, {"error": "Report file no longer exists.", "job": job.to_dict()})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/markdown; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def _send_json(
+        self, status: int, payload: object, headers: List[Tuple[str, str]] = ()
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - signature fixed by the base class
+        self.log(f"{self.address_string()} {format % args}")
+
+
+def create_server(
+    manager: JobManager, host: str, port: int, log: Callable[[str], None] = lambda _: None
+) -> ThreadingHTTPServer:
+    handler = type("ApiHandler", (_ApiHandler,), {"manager": manager, "log": staticmethod(log)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,90 @@
+import hashlib
+import re
+from collections import Counter
+from typing import List
+
+SIMHASH_BITS = 64
+# The fingerprint is indexed as this many bands. Two fingerprints differing
+# in fewer bits than there are bands share at least one band exactly, so a
+# band lookup finds every neighbour within SIMHASH_BANDS - 1 bits: 6 bits,
+# which covers the default NEAR_DUPLICATE_THRESHOLD of 0.9.
+SIMHASH_BANDS = 7
+# Band widths as even as 64 bits allow: 10, 9, 9, 9, 9, 9, 9.
+_BAND_BITS = [
+    SIMHASH_BITS // SIMHASH_BANDS + (band < SIMHASH_BITS % SIMHASH_BANDS)
+    for band in range(SIMHASH_BANDS)
+]
+
+# Word trigrams: long enough that shared vocabulary alone does not make two
+# different stories look alike.
+_SHINGLE_WORDS = 3
+_WORD = re.compile(r"\w+")
+
+_LANE_BITS = 32
+_LANE_MASK = (1 << _LANE_BITS) - 1
+# _LANES[position][byte]: one counter increment for every set bit of ``byte``
+# found at ``position`` of a hash digest.
+_LANES = [
+    [
+        sum(1 << ((position * 8 + bit) * _LANE_BITS) for bit in range(8) if byte >> bit & 1)
+        for byte in range(256)
+    ]
+    for position in range(SIMHASH_BITS // 8)
+]
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of ``text`` over lower-cased word trigrams.
+
+    Similar texts get fingerprints that differ in few bits; see
+    :func:`similarity`.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < _SHINGLE_WORDS:
+        shingles = Counter([" ".join(words)]) if words else Counter()
+    else:
+        shingles = Counter(
+            " ".join(words[index : index + _SHINGLE_WORDS])
+            for index in range(len(words) - _SHINGLE_WORDS + 1)
+        )
+    # Per-bit tallies are kept as 64 counters packed side by side in one
+    # integer, so each shingle costs eight table lookups instead of a loop
+    # over its bits.
+    tally = 0
+    for shingle, count in shingles.items():
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        tally += count * sum(_LANES[position][byte] for position, byte in enumerate(digest))
+    total = sum(shingles.values())
+    return sum(
+        1 << bit
+        for bit in range(SIMHASH_BITS)
+        if 2 * (tally >> (bit * _LANE_BITS) & _LANE_MASK) > total
+    )
+
+
+def simhash_bands(fingerprint: int) -> List[int]:
+    """Split a fingerprint into the band values it is indexed under."""
+    bands = []
+    for width in _BAND_BITS:
+        bands.append(fingerprint & ((1 << width) - 1))
+        fingerprint >>= width
+    return bands
+
+
+def hamming_distance(first: int, second: int) -> int:
+    return bin(first ^ second).count("1")
+
+
+def similarity(first: int, second: int) -> float:
+    """Share of fingerprint bits two texts agree on, from 0.0 to 1.0."""
+    return 1 - hamming_distance(first, second) / SIMHASH_BITS
+
+
+def max_distance(threshold: float) -> int:
+    """Largest Hamming distance that still meets a :func:`similarity` threshold."""
+    return int((1 - threshold) * SIMHASH_BITS + 1e-9)
+
+
+def is_indexed_threshold(threshold: float) -> bool:
+    """Whether the band index finds every fingerprint meeting ``threshold``."""
+    return max_distance(threshold) < SIMHASH_BANDS
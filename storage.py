@@ -1,8 +1,31 @@
+import queue
+import re
 import sqlite3
-from dataclasses import dataclass
-from datetime import datetime
+import uuid
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from simhash import SIMHASH_BITS, hamming_distance, max_distance, simhash, simhash_bands
+from telemetry import StageSample
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 
 @dataclass
@@ -13,6 +36,21 @@ class ArticleRecord:
     content: str
     content_hash: str
     fetched_at: datetime
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    validated_at: Optional[datetime] = None
+    paragraph_hashes: Tuple[str, ...] = ()
+
+
+@dataclass
+class ArticleSummary:
+    """Article metadata without the body, for listings."""
+
+    id: int
+    url: str
+    title: Optional[str]
+    content_hash: str
+    fetched_at: datetime
 
 
 @dataclass
@@ -26,54 +64,768 @@ class AnalysisRecord:
     created_at: datetime
 
 
+@dataclass
+class BatchItemRecord:
+    id: int
+    batch_id: str
+    url: str
+    status: str
+    stage: Optional[str]
+    error: Optional[str]
+    output_path: Optional[str]
+    finished_at: datetime
+
+
+@dataclass
+class NewArticle:
+    url: str
+    title: Optional[str]
+    content: str
+    content_hash: str
+    fetched_at: datetime
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    paragraph_hashes: Sequence[str] = ()
+
+
+@dataclass
+class JobRecord:
+    id: int
+    url: str
+    status: str
+    attempts: int
+    max_attempts: int
+    available_at: datetime
+    created_at: datetime
+    updated_at: datetime
+    lease_owner: Optional[str] = None
+    lease_token: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    output_path: Optional[str] = None
+    article_id: Optional[int] = None
+
+
+@dataclass
+class StageTimingRecord:
+    analysis_id: int
+    stage: str
+    model_provider: str
+    model_name: str
+    seconds: float
+    input_tokens: int
+    output_tokens: int
+    cache_hit: Optional[bool]
+    failed: bool
+    created_at: datetime
+
+
+@dataclass
+class NewAnalysis:
+    article_id: int
+    model_provider: str
+    model_name: str
+    output_path: Path
+    created_at: datetime
+    strategy: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    cache_hits: Optional[int] = None
+    cache_misses: Optional[int] = None
+    failed_sections: Optional[int] = None
+    article_tokens: Optional[int] = None
+    compacted_tokens: Optional[int] = None
+    stages: Sequence[StageSample] = ()
+    sections: Optional[Mapping[str, str]] = None
+    # The body the analysis was made from; the article may have changed since.
+    content_hash: Optional[str] = None
+
+
+@dataclass
+class ArchivedAnalysis:
+    """An analysis identified by its article's URL, for moving between databases."""
+
+    article_url: str
+    analysis: NewAnalysis
+    report: Optional[str] = None
+
+
+@dataclass
+class NearDuplicate:
+    """A cached body whose SimHash fingerprint is close to another body's."""
+
+    content_hash: str
+    url: str
+    title: Optional[str]
+    similarity: float
+
+
+@dataclass
+class SearchResult:
+    """A cached article or generated report matching a search query."""
+
+    kind: str
+    id: int
+    url: str
+    title: Optional[str]
+    snippet: str
+    created_at: datetime
+    output_path: Optional[str] = None
+
+
+def _migration_baseline(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            title TEXT,
+            content TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            fetched_at TEXT NOT NULL
+        )
+        """
+    )
+    _add_missing_columns(
+        conn,
+        "articles",
+        {"etag": "TEXT", "last_modified": "TEXT", "validated_at": "TEXT"},
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS analyses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER NOT NULL,
+            model_provider TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            output_path TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY(article_id) REFERENCES articles(id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS batch_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            batch_id TEXT NOT NULL,
+            url TEXT NOT NULL,
+            status TEXT NOT NULL,
+            stage TEXT,
+            error TEXT,
+            output_path TEXT,
+            article_id INTEGER,
+            finished_at TEXT NOT NULL,
+            FOREIGN KEY(article_id) REFERENCES articles(id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS section_cache (
+            content_hash TEXT NOT NULL,
+            task_kind TEXT NOT NULL,
+            model_provider TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            prompt_fingerprint TEXT NOT NULL,
+            output TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (
+                content_hash, task_kind, model_provider, model_name, prompt_fingerprint
+            )
+        )
+        """
+    )
+
+
+def _migration_listing_indexes(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_articles_fetched_at ON articles(fetched_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses(created_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_analyses_article_id ON analyses(article_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_batch_items_batch_id ON batch_items(batch_id)"
+    )
+
+
+def _migration_compress_content(conn: sqlite3.Connection) -> None:
+    _add_missing_columns(
+        conn, "articles", {"content_encoding": "TEXT NOT NULL DEFAULT 'identity'"}
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            """
+            SELECT id, content FROM articles
+            WHERE id > ? AND content_encoding = 'identity'
+            ORDER BY id LIMIT 500
+            """,
+            (last_id,),
+        ).fetchall()
+        if not rows:
+            return
+        conn.executemany(
+            "UPDATE articles SET content = ?, content_encoding = ? WHERE id = ?",
+            [(*compress_content(row["content"]), row["id"]) for row in rows],
+        )
+        last_id = rows[-1]["id"]
+
+
+def _migration_content_addressed_bodies(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS article_bodies (
+            content_hash TEXT PRIMARY KEY,
+            content BLOB NOT NULL,
+            content_encoding TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO article_bodies (content_hash, content, content_encoding, created_at)
+        SELECT content_hash, content, content_encoding, fetched_at FROM articles
+        """
+    )
+    # Rebuild articles without the inline body; SQLite cannot drop columns portably.
+    conn.execute(
+        """
+        CREATE TABLE articles_rebuilt (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT UNIQUE NOT NULL,
+            title TEXT,
+            content_hash TEXT NOT NULL,
+            fetched_at TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            validated_at TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO articles_rebuilt (
+            id, url, title, content_hash, fetched_at, etag, last_modified, validated_at
+        )
+        SELECT id, url, title, content_hash, fetched_at, etag, last_modified, validated_at
+        FROM articles
+        """
+    )
+    conn.execute("DROP TABLE articles")
+    conn.execute("ALTER TABLE articles_rebuilt RENAME TO articles")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_articles_fetched_at ON articles(fetched_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_articles_content_hash ON articles(content_hash)"
+    )
+
+
+def _migration_analysis_telemetry(conn: sqlite3.Connection) -> None:
+    _add_missing_columns(
+        conn,
+        "analyses",
+        {
+            "strategy": "TEXT",
+            "duration_seconds": "REAL",
+            "input_tokens": "INTEGER",
+            "output_tokens": "INTEGER",
+            "cache_hits": "INTEGER",
+            "cache_misses": "INTEGER",
+            "failed_sections": "INTEGER",
+        },
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS analysis_stages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            analysis_id INTEGER NOT NULL,
+            stage TEXT NOT NULL,
+            seconds REAL NOT NULL,
+            input_tokens INTEGER NOT NULL DEFAULT 0,
+            output_tokens INTEGER NOT NULL DEFAULT 0,
+            cache_hit INTEGER,
+            failed INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY(analysis_id) REFERENCES analyses(id)
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_analysis_stages_analysis_id ON analysis_stages(analysis_id)"
+    )
+
+
+def _migration_jobs(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL,
+            available_at TEXT NOT NULL,
+            lease_owner TEXT,
+            lease_token TEXT,
+            lease_expires_at TEXT,
+            error TEXT,
+            output_path TEXT,
+            article_id INTEGER,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            finished_at TEXT,
+            FOREIGN KEY(article_id) REFERENCES articles(id)
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status_available ON jobs(status, available_at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status_lease ON jobs(status, lease_expires_at)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_lease_token ON jobs(lease_token)")
+
+
+def _migration_paragraph_hashes(conn: sqlite3.Connection) -> None:
+    # Filled in as bodies are stored; older bodies are hashed when first diffed.
+    _add_missing_columns(conn, "article_bodies", {"paragraph_hashes": "TEXT"})
+
+
+def _migration_compaction_tokens(conn: sqlite3.Connection) -> None:
+    _add_missing_columns(
+        conn, "analyses", {"article_tokens": "INTEGER", "compacted_tokens": "INTEGER"}
+    )
+
+
+def _migration_search_index(conn: sqlite3.Connection) -> None:
+    # Article bodies already live compressed in article_bodies, so their index
+    # is contentless: it stores only the inverted index, and snippets are cut
+    # from the decompressed body. Reports are small enough to keep in full.
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS article_search USING fts5(
+            title, body, content='', tokenize='{_SEARCH_TOKENIZER}'
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS report_search USING fts5(
+            title, summary, assumptions, errors, tokenize='{_SEARCH_TOKENIZER}'
+        )
+        """
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            """
+            SELECT articles.id, articles.title, article_bodies.content, article_bodies.content_encoding
+            FROM articles
+            INNER JOIN article_bodies ON article_bodies.content_hash = articles.content_hash
+            WHERE articles.id > ?
+            ORDER BY articles.id LIMIT 500
+            """,
+            (last_id,),
+        ).fetchall()
+        if not rows:
+            break
+        conn.executemany(
+            "INSERT INTO article_search (rowid, title, body) VALUES (?, ?, ?)",
+            [
+                (
+                    row["id"],
+                    row["title"] or "",
+                    decompress_content(row["content"], row["content_encoding"]),
+                )
+                for row in rows
+            ],
+        )
+        last_id = rows[-1]["id"]
+
+    # Earlier analyses only exist as markdown files; index the ones still on disk.
+    reports = []
+    for row in conn.execute(
+        """
+        SELECT analyses.id, analyses.output_path, articles.title
+        FROM analyses
+        INNER JOIN articles ON articles.id = analyses.article_id
+        """
+    ):
+        try:
+            markdown = Path(row["output_path"]).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            continue
+        sections = _report_sections(markdown)
+        if sections:
+            reports.append(_report_search_row(row["id"], row["title"], sections))
+    conn.executemany(_INSERT_REPORT_SEARCH, reports)
+    for table in ("article_search", "report_search"):
+        conn.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+
+
+def _migration_simhash(conn: sqlite3.Connection) -> None:
+    _add_missing_columns(conn, "article_bodies", {"simhash": "INTEGER"})
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS simhash_bands (
+            band INTEGER NOT NULL,
+            value INTEGER NOT NULL,
+            content_hash TEXT NOT NULL,
+            PRIMARY KEY (band, value, content_hash)
+        ) WITHOUT ROWID
+        """
+    )
+    last_rowid = 0
+    while True:
+        rows = conn.execute(
+            """
+            SELECT rowid, content_hash, content, content_encoding FROM article_bodies
+            WHERE rowid > ? ORDER BY rowid LIMIT 500
+            """,
+            (last_rowid,),
+        ).fetchall()
+        if not rows:
+            return
+        _index_simhashes(
+            conn,
+            [
+                (row["content_hash"], decompress_content(row["content"], row["content_encoding"]))
+                for row in rows
+            ],
+        )
+        last_rowid = rows[-1]["rowid"]
+
+
+def _migration_analysis_content_hash(conn: sqlite3.Connection) -> None:
+    # Earlier analyses did not record their body, which may be gone already;
+    # they are left NULL rather than guessed from the current one.
+    _add_missing_columns(conn, "analyses", {"content_hash": "TEXT"})
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_analyses_content_hash ON analyses(content_hash)"
+    )
+
+
+def _migration_simhash_bands(conn: sqlite3.Connection) -> None:
+    # Four 16-bit bands only guaranteed matches within 3 bits; re-index the
+    # stored fingerprints under the current band layout.
+    conn.execute("DELETE FROM simhash_bands")
+    last_rowid = 0
+    while True:
+        rows = conn.execute(
+            """
+            SELECT rowid, content_hash, simhash FROM article_bodies
+            WHERE rowid > ? AND simhash IS NOT NULL ORDER BY rowid LIMIT 500
+            """,
+            (last_rowid,),
+        ).fetchall()
+        if not rows:
+            return
+        conn.executemany(
+            "INSERT OR IGNORE INTO simhash_bands (band, value, content_hash) VALUES (?, ?, ?)",
+            [
+                (band, value, row["content_hash"])
+                for row in rows
+                for band, value in enumerate(simhash_bands(_to_unsigned(row["simhash"])))
+            ],
+        )
+        last_rowid = rows[-1]["rowid"]
+
+
+def _index_simhashes(conn: sqlite3.Connection, bodies: Sequence[Tuple[str, str]]) -> None:
+    fingerprints = [(content_hash, simhash(content)) for content_hash, content in bodies]
+    conn.executemany(
+        "UPDATE article_bodies SET simhash = ? WHERE content_hash = ?",
+        [(_to_signed(fingerprint), content_hash) for content_hash, fingerprint in fingerprints],
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO simhash_bands (band, value, content_hash) VALUES (?, ?, ?)",
+        [
+            (band, value, content_hash)
+            for content_hash, fingerprint in fingerprints
+            for band, value in enumerate(simhash_bands(fingerprint))
+        ],
+    )
+
+
+# SQLite integers are signed; fingerprints are stored in two's complement.
+def _to_signed(fingerprint: int) -> int:
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def _add_missing_columns(
+    conn: sqlite3.Connection, table: str, columns: Dict[str, str]
+) -> None:
+    existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, definition in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+_ARTICLE_METADATA_COLUMNS = (
+    "id, url, title, content_hash, fetched_at, etag, last_modified, validated_at"
+)
+
+_SELECT_ARTICLE = """
+    SELECT
+        articles.*,
+        article_bodies.content,
+        article_bodies.content_encoding,
+        article_bodies.paragraph_hashes
+    FROM articles
+    INNER JOIN article_bodies ON article_bodies.content_hash = articles.content_hash
+"""
+
+SEARCH_SCOPES = ("all", "articles", "reports")
+
+_SEARCH_TOKENIZER = "porter unicode61 remove_diacritics 2"
+
+_INSERT_REPORT_SEARCH = """
+    INSERT INTO report_search (rowid, title, summary, assumptions, errors)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Headings of the sections in reports written by the pipeline.
+_REPORT_HEADINGS = {
+    "Executive Summary": "summary",
+    "Authorial Assumptions": "assumptions",
+    "Potential Errors & Biases": "errors",
+}
+
+# bm25 weights per indexed column; a match in a title counts most.
+_ARTICLE_WEIGHTS = (10.0, 1.0)
+_REPORT_WEIGHTS = (10.0, 2.0, 1.0, 1.0)
+
+_SEARCH_TERM = re.compile(r'"[^"]*"|\S+')
+_SNIPPET_WORDS = 24
+
+
+def _report_sections(markdown: str) -> Dict[str, str]:
+    sections: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    for line in markdown.splitlines():
+        if line.startswith("## "):
+            name = _REPORT_HEADINGS.get(line[3:].strip())
+            current = sections.setdefault(name, []) if name else None
+        elif current is not None and not line.startswith("> _Report generated"):
+            current.append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+
+def _report_search_row(
+    analysis_id: int, title: Optional[str], sections: Mapping[str, str]
+) -> Tuple[int, str, str, str, str]:
+    return (
+        analysis_id,
+        title or "",
+        sections.get("summary", ""),
+        sections.get("assumptions", ""),
+        sections.get("errors", ""),
+    )
+
+
+def _match_expression(query: str) -> Tuple[str, List[str]]:
+    """Turn a search box query into an FTS5 expression and the words to highlight.
+
+    Words are matched literally, so punctuation such as ``U.S.`` or
+    ``covid-19`` cannot break the query syntax. ``"quoted phrases"``,
+    ``prefix*`` and ``OR``/``NOT`` between words keep their FTS5 meaning.
+    """
+    parts: List[str] = []
+    words: List[str] = []
+    for token in _SEARCH_TERM.findall(query):
+        if token in ("OR", "NOT", "AND"):
+            if parts and parts[-1] not in ("OR", "NOT", "AND"):
+                parts.append(token)
+            continue
+        prefix = token.endswith("*") and not token.startswith('"')
+        text = token.strip('"').rstrip("*").strip()
+        if not text:
+            continue
+        words.extend(text.split())
+        parts.append('"' + text.replace('"', '""') + '"' + ("*" if prefix else ""))
+    while parts and parts[-1] in ("OR", "NOT", "AND"):
+        parts.pop()
+    if not parts:
+        raise ValueError("The search query has no words to match.")
+    return " ".join(parts), words
+
+
+def _excerpt(text: str, words: Sequence[str]) -> str:
+    """Cut a window of ``text`` around the first occurrence of any of ``words``."""
+    tokens = text.split()
+    lowered = [token.lower() for token in tokens]
+    needles = [word.lower() for word in words]
+    start = next(
+        (
+            index
+            for index, token in enumerate(lowered)
+            if any(needle in token for needle in needles)
+        ),
+        0,
+    )
+    start = max(0, start - _SNIPPET_WORDS // 3)
+    window = " ".join(tokens[start : start + _SNIPPET_WORDS])
+    prefix = "…" if start else ""
+    suffix = "…" if start + _SNIPPET_WORDS < len(tokens) else ""
+    return f"{prefix}{window}{suffix}"
+
+
+# Stay well below SQLite's default limit on bound parameters per statement.
+_MAX_SQL_PARAMETERS = 500
+
+# Applied in order; a database's PRAGMA user_version records how many have run.
+# Append new migrations, never edit or reorder released ones.
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _migration_baseline,
+    _migration_listing_indexes,
+    _migration_compress_content,
+    _migration_content_addressed_bodies,
+    _migration_analysis_telemetry,
+    _migration_jobs,
+    _migration_paragraph_hashes,
+    _migration_compaction_tokens,
+    _migration_search_index,
+    _migration_simhash,
+    _migration_analysis_content_hash,
+    _migration_simhash_bands,
+]
+
+# Migrations that rewrite most of the file; the space they free is reclaimed
+# with VACUUM once they have been committed.
+_VACUUM_AFTER = {_migration_compress_content, _migration_content_addressed_bodies}
+
+
+def compress_content(text: str) -> Tuple[bytes, str]:
+    """Compress an article body, preferring zstd when it is installed."""
+    data = text.encode("utf-8")
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=6).compress(data), "zstd"
+    return zlib.compress(data, 6), "zlib"
+
+
+def decompress_content(value, encoding: str) -> str:
+    if encoding == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Article content is zstd-compressed but zstandard is not installed.")
+        return zstandard.ZstdDecompressor().decompress(value).decode("utf-8")
+    if encoding == "zlib":
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
 class ArticleRepository:
-    def __init__(self, database_path: Path):
+    """SQLite-backed store for articles, analyses and cached LLM results.
+
+    Connections are pooled and may be handed to any thread, but each one is
+    only used by a single caller at a time. The database runs in WAL mode so
+    readers never block the writer and concurrent writers wait on the busy
+    timeout instead of failing with "database is locked".
+    """
+
+    def __init__(
+        self, database_path: Path, *, pool_size: int = 4, busy_timeout: float = 30.0
+    ):
         self.database_path = Path(database_path)
         self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout = busy_timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=pool_size)
         self._initialize()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.database_path)
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open_connection()
+        try:
+            with conn:
+                yield conn
+        finally:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.database_path, timeout=self.busy_timeout, check_same_thread=False
+        )
         conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -16000")
         return conn
 
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
     def _initialize(self) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS articles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url TEXT UNIQUE NOT NULL,
-                    title TEXT,
-                    content TEXT NOT NULL,
-                    content_hash TEXT NOT NULL,
-                    fetched_at TEXT NOT NULL
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS analyses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    article_id INTEGER NOT NULL,
-                    model_provider TEXT NOT NULL,
-                    model_name TEXT NOT NULL,
-                    output_path TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    FOREIGN KEY(article_id) REFERENCES articles(id)
-                )
-                """
-            )
+        conn = self._open_connection()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            # BEGIN IMMEDIATE serializes concurrent processes migrating the same file.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                pending = MIGRATIONS[version:]
+                for number, migration in enumerate(pending, start=version + 1):
+                    migration(conn)
+                    conn.execute(f"PRAGMA user_version = {number}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            if _VACUUM_AFTER.intersection(pending):
+                conn.execute("VACUUM")
+        finally:
+            conn.close()
 
     def get_article(self, url: str) -> Optional[ArticleRecord]:
         with self._connect() as conn:
             row = conn.execute(
-                "SELECT * FROM articles WHERE url = ?", (url,)
+                f"{_SELECT_ARTICLE} WHERE articles.url = ?", (url,)
             ).fetchone()
             if not row:
                 return None
             return self._row_to_article(row)
 
+    def last_checked(self, urls: Sequence[str]) -> Dict[str, datetime]:
+        """When each cached URL was last downloaded or revalidated; uncached URLs are left out."""
+        checked: Dict[str, datetime] = {}
+        with self._connect() as conn:
+            for start in range(0, len(urls), _MAX_SQL_PARAMETERS):
+                batch = urls[start : start + _MAX_SQL_PARAMETERS]
+                placeholders = ", ".join("?" * len(batch))
+                checked.update(
+                    (row["url"], datetime.fromisoformat(row["checked_at"]))
+                    for row in conn.execute(
+                        f"""
+                        SELECT url, COALESCE(validated_at, fetched_at) AS checked_at
+                        FROM articles WHERE url IN ({placeholders})
+                        """,
+                        batch,
+                    )
+                )
+        return checked
+
     def save_article(
         self,
         *,
@@ -82,23 +834,330 @@ class ArticleRepository:
         content: str,
         content_hash: str,
         fetched_at: datetime,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        paragraph_hashes: Sequence[str] = (),
     ) -> ArticleRecord:
-        fetched_iso = fetched_at.isoformat()
+        return self.save_articles(
+            [
+                NewArticle(
+                    url=url,
+                    title=title,
+                    content=content,
+                    content_hash=content_hash,
+                    fetched_at=fetched_at,
+                    etag=etag,
+                    last_modified=last_modified,
+                    paragraph_hashes=paragraph_hashes,
+                )
+            ]
+        )[0]
+
+    def save_articles(self, articles: Sequence[NewArticle]) -> List[ArticleRecord]:
+        """Upsert many articles in a single transaction, returned in input order.
+
+        Bodies are stored once per content hash, so URLs serving the same
+        article share a row in ``article_bodies``.
+        """
+        if not articles:
+            return []
+        # Bodies are echoed from the input rather than read back and decompressed.
+        contents = {article.url: article for article in articles}
+        bodies = {article.content_hash: article for article in articles}
+        urls = list(contents)
         with self._connect() as conn:
-            conn.execute(
+            stored = set()
+            previous: Dict[str, sqlite3.Row] = {}
+            hashes = list(bodies)
+            for start in range(0, len(hashes), _MAX_SQL_PARAMETERS):
+                batch = hashes[start : start + _MAX_SQL_PARAMETERS]
+                placeholders = ", ".join("?" * len(batch))
+                stored.update(
+                    row["content_hash"]
+                    for row in conn.execute(
+                        f"SELECT content_hash FROM article_bodies WHERE content_hash IN ({placeholders})",
+                        batch,
+                    )
+                )
+            for start in range(0, len(urls), _MAX_SQL_PARAMETERS):
+                batch = urls[start : start + _MAX_SQL_PARAMETERS]
+                placeholders = ", ".join("?" * len(batch))
+                previous.update(
+                    (row["url"], row)
+                    for row in conn.execute(
+                        f"SELECT id, url, title, content_hash FROM articles WHERE url IN ({placeholders})",
+                        batch,
+                    )
+                )
+
+            conn.executemany(
                 """
-                INSERT INTO articles (url, title, content, content_hash, fetched_at)
+                INSERT OR IGNORE INTO article_bodies (
+                    content_hash, content, content_encoding, created_at, paragraph_hashes
+                )
                 VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        content_hash,
+                        *compress_content(article.content),
+                        article.fetched_at.isoformat(),
+                        " ".join(article.paragraph_hashes) or None,
+                    )
+                    for content_hash, article in bodies.items()
+                    if content_hash not in stored
+                ],
+            )
+            _index_simhashes(
+                conn,
+                [
+                    (content_hash, article.content)
+                    for content_hash, article in bodies.items()
+                    if content_hash not in stored
+                ],
+            )
+            conn.executemany(
+                """
+                INSERT INTO articles (
+                    url, title, content_hash, fetched_at, etag, last_modified, validated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(url) DO UPDATE SET
                     title = excluded.title,
-                    content = excluded.content,
                     content_hash = excluded.content_hash,
-                    fetched_at = excluded.fetched_at
+                    fetched_at = excluded.fetched_at,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    validated_at = excluded.validated_at
                 """,
-                (url, title, content, content_hash, fetched_iso),
+                [
+                    (
+                        article.url,
+                        article.title,
+                        article.content_hash,
+                        article.fetched_at.isoformat(),
+                        article.etag,
+                        article.last_modified,
+                        article.fetched_at.isoformat(),
+                    )
+                    for article in articles
+                ],
             )
+            by_url = {}
+            for start in range(0, len(urls), _MAX_SQL_PARAMETERS):
+                batch = urls[start : start + _MAX_SQL_PARAMETERS]
+                placeholders = ", ".join("?" * len(batch))
+                for row in conn.execute(
+                    f"SELECT {_ARTICLE_METADATA_COLUMNS} FROM articles WHERE url IN ({placeholders})",
+                    batch,
+                ):
+                    echoed = contents[row["url"]]
+                    by_url[row["url"]] = self._row_to_article(
+                        row, content=echoed.content, paragraph_hashes=echoed.paragraph_hashes
+                    )
+            # Reindex before orphaned bodies go: removing a contentless FTS
+            # entry needs the text it was indexed with.
+            self._update_article_search(
+                conn, [(previous.get(url), by_url[url]) for url in urls]
+            )
+            self._delete_orphaned_bodies(
+                conn, {row["content_hash"] for row in previous.values()} - set(bodies)
+            )
+            return [by_url[article.url] for article in articles]
+
+    @staticmethod
+    def _update_article_search(
+        conn: sqlite3.Connection, changes: Sequence[Tuple[Optional[sqlite3.Row], ArticleRecord]]
+    ) -> None:
+        changed = [
+            (old, new)
+            for old, new in changes
+            if old is None or (old["title"], old["content_hash"]) != (new.title, new.content_hash)
+        ]
+        stale = [old for old, _ in changed if old is not None]
+        old_bodies = {}
+        for row in stale:
+            if row["content_hash"] not in old_bodies:
+                body = conn.execute(
+                    "SELECT content, content_encoding FROM article_bodies WHERE content_hash = ?",
+                    (row["content_hash"],),
+                ).fetchone()
+                old_bodies[row["content_hash"]] = decompress_content(
+                    body["content"], body["content_encoding"]
+                )
+        conn.executemany(
+            """
+            INSERT INTO article_search (article_search, rowid, title, body)
+            VALUES ('delete', ?, ?, ?)
+            """,
+            [(row["id"], row["title"] or "", old_bodies[row["content_hash"]]) for row in stale],
+        )
+        conn.executemany(
+            "INSERT INTO article_search (rowid, title, body) VALUES (?, ?, ?)",
+            [(new.id, new.title or "", new.content) for _, new in changed],
+        )
+
+    @staticmethod
+    def _delete_orphaned_bodies(conn: sqlite3.Connection, content_hashes: Iterable[str]) -> None:
+        """Delete bodies no article holds, keeping each article's last analyzed body.
+
+        The analyzed body stays as the basis an incremental re-analysis diffs
+        against, however many times the article is refetched before then.
+        """
+        parameters = [(content_hash,) for content_hash in content_hashes]
+        conn.executemany(
+            """
+            DELETE FROM article_bodies
+            WHERE content_hash = ?
+                AND NOT EXISTS (
+                    SELECT 1 FROM articles WHERE articles.content_hash = article_bodies.content_hash
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM analyses
+                    WHERE analyses.content_hash = article_bodies.content_hash
+                        AND analyses.id = (
+                            SELECT latest.id FROM analyses AS latest
+                            WHERE latest.article_id = analyses.article_id
+                            ORDER BY latest.created_at DESC, latest.id DESC LIMIT 1
+                        )
+                )
+            """,
+            parameters,
+        )
+        conn.executemany(
+            """
+            DELETE FROM simhash_bands
+            WHERE content_hash = ?
+                AND NOT EXISTS (
+                    SELECT 1 FROM article_bodies
+                    WHERE article_bodies.content_hash = simhash_bands.content_hash
+                )
+            """,
+            parameters,
+        )
+
+    def find_near_duplicate(
+        self, content_hash: str, *, threshold: float
+    ) -> Optional[NearDuplicate]:
+        """The most similar other cached body, if it meets ``threshold``.
+
+        Candidates are the bodies sharing at least one fingerprint band, so the
+        lookup reads a small part of the index however large the cache is.
+        Every body within ``SIMHASH_BANDS - 1`` bits is found; more distant
+        ones only when one band survived intact.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT simhash FROM article_bodies WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if row is None or row["simhash"] is None:
+                return None
+            fingerprint = _to_unsigned(row["simhash"])
+            bands = simhash_bands(fingerprint)
+            band_lookup = " UNION ".join(
+                ["SELECT content_hash FROM simhash_bands WHERE band = ? AND value = ?"]
+                * len(bands)
+            )
+            candidates = conn.execute(
+                f"""
+                SELECT content_hash, simhash FROM article_bodies
+                WHERE content_hash IN ({band_lookup}) AND content_hash != ?
+                    AND EXISTS (
+                        SELECT 1 FROM articles
+                        WHERE articles.content_hash = article_bodies.content_hash
+                    )
+                """,
+                [*(item for pair in enumerate(bands) for item in pair), content_hash],
+            ).fetchall()
+            limit = max_distance(threshold)
+            nearest = min(
+                (
+                    (hamming_distance(fingerprint, _to_unsigned(candidate["simhash"])), candidate)
+                    for candidate in candidates
+                ),
+                key=lambda pair: pair[0],
+                default=None,
+            )
+            if nearest is None or nearest[0] > limit:
+                return None
+            distance, candidate = nearest
+            article = conn.execute(
+                """
+                SELECT url, title FROM articles WHERE content_hash = ?
+                ORDER BY fetched_at DESC LIMIT 1
+                """,
+                (candidate["content_hash"],),
+            ).fetchone()
+            if article is None:
+                return None
+            return NearDuplicate(
+                content_hash=candidate["content_hash"],
+                url=article["url"],
+                title=article["title"],
+                similarity=1 - distance / SIMHASH_BITS,
+            )
+
+    def get_article_by_content_hash(self, content_hash: str) -> Optional[ArticleRecord]:
+        """The most recently fetched article whose body has ``content_hash``."""
+        with self._connect() as conn:
             row = conn.execute(
-                "SELECT * FROM articles WHERE url = ?", (url,)
+                f"""
+                {_SELECT_ARTICLE} WHERE articles.content_hash = ?
+                ORDER BY articles.fetched_at DESC LIMIT 1
+                """,
+                (content_hash,),
+            ).fetchone()
+            return self._row_to_article(row) if row else None
+
+    def get_analyzed_version(self, article_id: int) -> Optional[ArticleRecord]:
+        """The body of the article's most recent analysis that is still stored.
+
+        This may be an older version than the cached article; ``fetched_at``
+        is when that body was first stored.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT
+                    articles.id, articles.url, articles.title,
+                    analyses.content_hash,
+                    article_bodies.created_at AS fetched_at,
+                    NULL AS etag, NULL AS last_modified, NULL AS validated_at,
+                    article_bodies.content,
+                    article_bodies.content_encoding,
+                    article_bodies.paragraph_hashes
+                FROM analyses
+                INNER JOIN articles ON articles.id = analyses.article_id
+                INNER JOIN article_bodies ON article_bodies.content_hash = analyses.content_hash
+                WHERE analyses.article_id = ?
+                ORDER BY analyses.created_at DESC, analyses.id DESC LIMIT 1
+                """,
+                (article_id,),
+            ).fetchone()
+            return self._row_to_article(row) if row else None
+
+    def mark_article_validated(
+        self,
+        article_id: int,
+        *,
+        validated_at: datetime,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> ArticleRecord:
+        """Record that the cached content was confirmed current by the origin."""
+        with self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE articles
+                SET validated_at = ?,
+                    etag = COALESCE(?, etag),
+                    last_modified = COALESCE(?, last_modified)
+                WHERE id = ?
+                """,
+                (validated_at.isoformat(), etag, last_modified, article_id),
+            )
+            row = conn.execute(
+                f"{_SELECT_ARTICLE} WHERE articles.id = ?", (article_id,)
             ).fetchone()
             return self._row_to_article(row)
 
@@ -110,22 +1169,687 @@ class ArticleRepository:
         model_name: str,
         output_path: Path,
         created_at: datetime,
+        strategy: Optional[str] = None,
+        duration_seconds: Optional[float] = None,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        cache_hits: Optional[int] = None,
+        cache_misses: Optional[int] = None,
+        failed_sections: Optional[int] = None,
+        article_tokens: Optional[int] = None,
+        compacted_tokens: Optional[int] = None,
+        stages: Sequence[StageSample] = (),
+        sections: Optional[Mapping[str, str]] = None,
+        content_hash: Optional[str] = None,
+    ) -> None:
+        self.record_analyses(
+            [
+                NewAnalysis(
+                    article_id=article_id,
+                    model_provider=model_provider,
+                    model_name=model_name,
+                    output_path=output_path,
+                    created_at=created_at,
+                    strategy=strategy,
+                    duration_seconds=duration_seconds,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    cache_hits=cache_hits,
+                    cache_misses=cache_misses,
+                    failed_sections=failed_sections,
+                    article_tokens=article_tokens,
+                    compacted_tokens=compacted_tokens,
+                    stages=stages,
+                    sections=sections,
+                    content_hash=content_hash,
+                )
+            ]
+        )
+
+    def record_analyses(self, analyses: Iterable[NewAnalysis]) -> None:
+        """Insert many analysis rows, their stage timings and search entries in one transaction."""
+        with self._connect() as conn:
+            self._insert_analyses(conn, analyses)
+
+    @classmethod
+    def _insert_analyses(cls, conn: sqlite3.Connection, analyses: Iterable[NewAnalysis]) -> None:
+        stage_rows = []
+        search_rows = []
+        # Bodies kept only for an article's previous analysis may go now.
+        superseded = set()
+        for analysis in analyses:
+            latest = conn.execute(
+                """
+                SELECT content_hash FROM analyses WHERE article_id = ?
+                ORDER BY created_at DESC, id DESC LIMIT 1
+                """,
+                (analysis.article_id,),
+            ).fetchone()
+            if latest is not None and latest["content_hash"]:
+                superseded.add(latest["content_hash"])
+            cursor = conn.execute(
+                """
+                INSERT INTO analyses (
+                    article_id, model_provider, model_name, output_path, created_at,
+                    strategy, duration_seconds, input_tokens, output_tokens,
+                    cache_hits, cache_misses, failed_sections, article_tokens,
+                    compacted_tokens, content_hash
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    analysis.article_id,
+                    analysis.model_provider,
+                    analysis.model_name,
+                    str(analysis.output_path),
+                    analysis.created_at.isoformat(),
+                    analysis.strategy,
+                    analysis.duration_seconds,
+                    analysis.input_tokens,
+                    analysis.output_tokens,
+                    analysis.cache_hits,
+                    analysis.cache_misses,
+                    analysis.failed_sections,
+                    analysis.article_tokens,
+                    analysis.compacted_tokens,
+                    analysis.content_hash,
+                ),
+            )
+            if analysis.sections:
+                title = conn.execute(
+                    "SELECT title FROM articles WHERE id = ?", (analysis.article_id,)
+                ).fetchone()
+                search_rows.append(
+                    _report_search_row(
+                        cursor.lastrowid, title["title"] if title else None, analysis.sections
+                    )
+                )
+            stage_rows.extend(
+                (
+                    cursor.lastrowid,
+                    sample.stage,
+                    sample.seconds,
+                    sample.input_tokens,
+                    sample.output_tokens,
+                    None if sample.cache_hit is None else int(sample.cache_hit),
+                    int(sample.failed),
+                )
+                for sample in analysis.stages
+            )
+        conn.executemany(
+            """
+            INSERT INTO analysis_stages (
+                analysis_id, stage, seconds, input_tokens, output_tokens, cache_hit, failed
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            stage_rows,
+        )
+        conn.executemany(_INSERT_REPORT_SEARCH, search_rows)
+        cls._delete_orphaned_bodies(conn, superseded)
+
+    def iter_articles(
+        self, *, since: Optional[datetime] = None, batch_size: int = 500
+    ) -> Iterator[ArticleRecord]:
+        """Articles fetched at or after ``since``, oldest first, read a batch at a time."""
+        cursor = (since.isoformat() if since else "", 0)
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"""
+                    {_SELECT_ARTICLE}
+                    WHERE (articles.fetched_at, articles.id) > (?, ?)
+                    ORDER BY articles.fetched_at, articles.id LIMIT ?
+                    """,
+                    (*cursor, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_article(row)
+            cursor = (rows[-1]["fetched_at"], rows[-1]["id"])
+
+    def iter_analyses(
+        self, *, since: Optional[datetime] = None, batch_size: int = 500
+    ) -> Iterator[ArchivedAnalysis]:
+        """Analyses created at or after ``since`` with their stage timings, oldest first.
+
+        Report contents are not read; ``report`` is left empty.
+        """
+        cursor = (since.isoformat() if since else "", 0)
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT analyses.*, articles.url AS article_url
+                    FROM analyses
+                    INNER JOIN articles ON articles.id = analyses.article_id
+                    WHERE (analyses.created_at, analyses.id) > (?, ?)
+                    ORDER BY analyses.created_at, analyses.id LIMIT ?
+                    """,
+                    (*cursor, batch_size),
+                ).fetchall()
+                stages: Dict[int, List[StageSample]] = {}
+                if rows:
+                    placeholders = ", ".join("?" * len(rows))
+                    for stage in conn.execute(
+                        f"""
+                        SELECT * FROM analysis_stages
+                        WHERE analysis_id IN ({placeholders}) ORDER BY id
+                        """,
+                        [row["id"] for row in rows],
+                    ):
+                        stages.setdefault(stage["analysis_id"], []).append(
+                            StageSample(
+                                stage=stage["stage"],
+                                seconds=stage["seconds"],
+                                input_tokens=stage["input_tokens"],
+                                output_tokens=stage["output_tokens"],
+                                cache_hit=(
+                                    None if stage["cache_hit"] is None else bool(stage["cache_hit"])
+                                ),
+                                failed=bool(stage["failed"]),
+                            )
+                        )
+            if not rows:
+                return
+            for row in rows:
+                yield ArchivedAnalysis(
+                    article_url=row["article_url"],
+                    analysis=NewAnalysis(
+                        article_id=row["article_id"],
+                        model_provider=row["model_provider"],
+                        model_name=row["model_name"],
+                        output_path=Path(row["output_path"]),
+                        created_at=datetime.fromisoformat(row["created_at"]),
+                        strategy=row["strategy"],
+                        duration_seconds=row["duration_seconds"],
+                        input_tokens=row["input_tokens"],
+                        output_tokens=row["output_tokens"],
+                        cache_hits=row["cache_hits"],
+                        cache_misses=row["cache_misses"],
+                        failed_sections=row["failed_sections"],
+                        article_tokens=row["article_tokens"],
+                        compacted_tokens=row["compacted_tokens"],
+                        stages=stages.get(row["id"], []),
+                        content_hash=row["content_hash"],
+                    ),
+                )
+            cursor = (rows[-1]["created_at"], rows[-1]["id"])
+
+    def merge_articles(self, articles: Sequence[NewArticle]) -> int:
+        """Save the articles that are newer than the stored copy of their URL.
+
+        Returns how many were saved; older or identical copies are skipped, so
+        merging the same export twice changes nothing.
+        """
+        latest: Dict[str, NewArticle] = {}
+        for article in articles:
+            if article.url not in latest or latest[article.url].fetched_at < article.fetched_at:
+                latest[article.url] = article
+        urls = list(latest)
+        stored: Dict[str, datetime] = {}
+        with self._connect() as conn:
+            for start in range(0, len(urls), _MAX_SQL_PARAMETERS):
+                batch = urls[start : start + _MAX_SQL_PARAMETERS]
+                placeholders = ", ".join("?" * len(batch))
+                stored.update(
+                    (row["url"], datetime.fromisoformat(row["fetched_at"]))
+                    for row in conn.execute(
+                        f"SELECT url, fetched_at FROM articles WHERE url IN ({placeholders})",
+                        batch,
+                    )
+                )
+        newer = [
+            article
+            for url, article in latest.items()
+            if url not in stored or stored[url] < article.fetched_at
+        ]
+        self.save_articles(newer)
+        return len(newer)
+
+    def merge_analyses(self, analyses: Sequence[ArchivedAnalysis]) -> int:
+        """Insert archived analyses in one transaction, returning how many were new.
+
+        Analyses are attached to the local article with the same URL; those
+        whose article is unknown, or that were already merged (same article,
+        model and creation time), are skipped. Report sections are indexed
+        for search from ``report``.
+        """
+        urls = list({item.article_url for item in analyses})
+        with self._connect() as conn:
+            article_ids: Dict[str, int] = {}
+            for start in range(0, len(urls), _MAX_SQL_PARAMETERS):
+                batch = urls[start : start + _MAX_SQL_PARAMETERS]
+                placeholders = ", ".join("?" * len(batch))
+                article_ids.update(
+                    (row["url"], row["id"])
+                    for row in conn.execute(
+                        f"SELECT id, url FROM articles WHERE url IN ({placeholders})", batch
+                    )
+                )
+            fresh = []
+            for item in analyses:
+                article_id = article_ids.get(item.article_url)
+                if article_id is None:
+                    continue
+                analysis = item.analysis
+                exists = conn.execute(
+                    """
+                    SELECT 1 FROM analyses
+                    WHERE article_id = ? AND model_name = ? AND created_at = ?
+                    LIMIT 1
+                    """,
+                    (article_id, analysis.model_name, analysis.created_at.isoformat()),
+                ).fetchone()
+                if exists:
+                    continue
+                fresh.append(
+                    replace(
+                        analysis,
+                        article_id=article_id,
+                        sections=(
+                            analysis.sections
+                            or (_report_sections(item.report) if item.report else None)
+                        ),
+                    )
+                )
+            self._insert_analyses(conn, fresh)
+            return len(fresh)
+
+    def list_stage_timings(
+        self,
+        *,
+        since: Optional[datetime] = None,
+        model_name: Optional[str] = None,
+    ) -> List[StageTimingRecord]:
+        """Stage samples of analyses created after ``since``, oldest first."""
+        where, parameters = self._analysis_filter(since, model_name)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT
+                    analysis_stages.*,
+                    analyses.model_provider,
+                    analyses.model_name,
+                    analyses.created_at
+                FROM analysis_stages
+                INNER JOIN analyses ON analyses.id = analysis_stages.analysis_id
+                {where}
+                ORDER BY analyses.created_at
+                """,
+                parameters,
+            ).fetchall()
+            return [
+                StageTimingRecord(
+                    analysis_id=row["analysis_id"],
+                    stage=row["stage"],
+                    model_provider=row["model_provider"],
+                    model_name=row["model_name"],
+                    seconds=row["seconds"],
+                    input_tokens=row["input_tokens"],
+                    output_tokens=row["output_tokens"],
+                    cache_hit=None if row["cache_hit"] is None else bool(row["cache_hit"]),
+                    failed=bool(row["failed"]),
+                    created_at=datetime.fromisoformat(row["created_at"]),
+                )
+                for row in rows
+            ]
+
+    def compaction_totals(
+        self,
+        *,
+        since: Optional[datetime] = None,
+        model_name: Optional[str] = None,
+    ) -> Tuple[int, int]:
+        """Article tokens before and after compaction, summed over matching analyses."""
+        where, parameters = self._analysis_filter(since, model_name)
+        where = f"{where} AND" if where else "WHERE"
+        with self._connect() as conn:
+            row = conn.execute(
+                f"""
+                SELECT
+                    COALESCE(SUM(article_tokens), 0) AS article_tokens,
+                    COALESCE(SUM(compacted_tokens), 0) AS compacted_tokens
+                FROM analyses
+                {where} article_tokens IS NOT NULL
+                """,
+                parameters,
+            ).fetchone()
+            return row["article_tokens"], row["compacted_tokens"]
+
+    @staticmethod
+    def _analysis_filter(
+        since: Optional[datetime], model_name: Optional[str]
+    ) -> Tuple[str, List[object]]:
+        clauses = []
+        parameters: List[object] = []
+        if since is not None:
+            clauses.append("analyses.created_at >= ?")
+            parameters.append(since.isoformat())
+        if model_name:
+            clauses.append("analyses.model_name = ?")
+            parameters.append(model_name)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), parameters
+
+    def get_section_result(
+        self,
+        *,
+        content_hash: str,
+        task_kind: str,
+        model_provider: str,
+        model_name: str,
+        prompt_fingerprint: str,
+    ) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT output FROM section_cache
+                WHERE content_hash = ? AND task_kind = ? AND model_provider = ?
+                    AND model_name = ? AND prompt_fingerprint = ?
+                """,
+                (content_hash, task_kind, model_provider, model_name, prompt_fingerprint),
+            ).fetchone()
+            return row["output"] if row else None
+
+    def save_section_result(
+        self,
+        *,
+        content_hash: str,
+        task_kind: str,
+        model_provider: str,
+        model_name: str,
+        prompt_fingerprint: str,
+        output: str,
+        created_at: datetime,
     ) -> None:
         with self._connect() as conn:
             conn.execute(
                 """
-                INSERT INTO analyses (article_id, model_provider, model_name, output_path, created_at)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO section_cache (
+                    content_hash, task_kind, model_provider, model_name,
+                    prompt_fingerprint, output, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(
+                    content_hash, task_kind, model_provider, model_name, prompt_fingerprint
+                ) DO UPDATE SET
+                    output = excluded.output,
+                    created_at = excluded.created_at
                 """,
                 (
-                    article_id,
+                    content_hash,
+                    task_kind,
                     model_provider,
                     model_name,
-                    str(output_path),
+                    prompt_fingerprint,
+                    output,
                     created_at.isoformat(),
                 ),
             )
 
+    def enqueue_jobs(
+        self, urls: Iterable[str], *, max_attempts: int, now: Optional[datetime] = None
+    ) -> List[int]:
+        """Add one queued job per URL and return their ids."""
+        now = (now or datetime.utcnow()).isoformat()
+        with self._connect() as conn:
+            ids = []
+            for url in urls:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO jobs (
+                        url, status, max_attempts, available_at, created_at, updated_at
+                    )
+                    VALUES (?, 'queued', ?, ?, ?, ?)
+                    """,
+                    (url, max_attempts, now, now, now),
+                )
+                ids.append(cursor.lastrowid)
+            return ids
+
+    def claim_job(
+        self, owner: str, *, lease: timedelta, now: Optional[datetime] = None
+    ) -> Optional[JobRecord]:
+        """Atomically lease the next runnable job to ``owner``.
+
+        Queued jobs whose retry delay has passed are eligible, as are running
+        jobs whose lease expired because their worker crashed. Expired jobs
+        that have used up their attempts are marked failed instead.
+        """
+        now = now or datetime.utcnow()
+        token = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'failed',
+                    error = COALESCE(error, 'Lease expired on the final attempt.'),
+                    lease_token = NULL,
+                    finished_at = ?,
+                    updated_at = ?
+                WHERE status = 'running' AND lease_expires_at <= ? AND attempts >= max_attempts
+                """,
+                (now.isoformat(), now.isoformat(), now.isoformat()),
+            )
+            # A single UPDATE is atomic, so concurrent workers in any process
+            # can never claim the same row; the token identifies our claim.
+            conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'running',
+                    attempts = attempts + 1,
+                    lease_owner = ?,
+                    lease_token = ?,
+                    lease_expires_at = ?,
+                    updated_at = ?
+                WHERE id = (
+                    SELECT id FROM jobs
+                    WHERE (status = 'queued' AND available_at <= ?)
+                        OR (status = 'running' AND lease_expires_at <= ?)
+                    ORDER BY available_at, id
+                    LIMIT 1
+                )
+                """,
+                (
+                    owner,
+                    token,
+                    (now + lease).isoformat(),
+                    now.isoformat(),
+                    now.isoformat(),
+                    now.isoformat(),
+                ),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE lease_token = ?", (token,)).fetchone()
+            return self._row_to_job(row) if row else None
+
+    def renew_job_lease(
+        self, job_id: int, token: str, *, lease: timedelta, now: Optional[datetime] = None
+    ) -> bool:
+        """Extend a lease; returns ``False`` if the job was reclaimed meanwhile."""
+        now = now or datetime.utcnow()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET lease_expires_at = ?, updated_at = ?
+                WHERE id = ? AND lease_token = ? AND status = 'running'
+                """,
+                ((now + lease).isoformat(), now.isoformat(), job_id, token),
+            )
+            return cursor.rowcount == 1
+
+    def complete_job(
+        self,
+        job_id: int,
+        token: str,
+        *,
+        output_path: Path,
+        article_id: Optional[int],
+        now: Optional[datetime] = None,
+    ) -> bool:
+        now = (now or datetime.utcnow()).isoformat()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'succeeded', output_path = ?, article_id = ?, error = NULL,
+                    lease_token = NULL, finished_at = ?, updated_at = ?
+                WHERE id = ? AND lease_token = ?
+                """,
+                (str(output_path), article_id, now, now, job_id, token),
+            )
+            return cursor.rowcount == 1
+
+    def fail_job(
+        self,
+        job_id: int,
+        token: str,
+        *,
+        error: str,
+        retry_delay: timedelta,
+        now: Optional[datetime] = None,
+    ) -> Optional[str]:
+        """Record a failed attempt; the job is re-queued until it runs out of attempts.
+
+        Returns the job's new status, or ``None`` if the lease was lost.
+        """
+        now = now or datetime.utcnow()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs
+                SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+                    available_at = ?,
+                    finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END,
+                    error = ?,
+                    lease_token = NULL,
+                    lease_expires_at = NULL,
+                    updated_at = ?
+                WHERE id = ? AND lease_token = ?
+                """,
+                (
+                    (now + retry_delay).isoformat(),
+                    now.isoformat(),
+                    error,
+                    now.isoformat(),
+                    job_id,
+                    token,
+                ),
+            )
+            if cursor.rowcount != 1:
+                return None
+            return conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+
+    def release_job(self, job_id: int, token: str, *, now: Optional[datetime] = None) -> bool:
+        """Hand a job back to the queue without counting the attempt (graceful shutdown)."""
+        now = (now or datetime.utcnow()).isoformat()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'queued', attempts = attempts - 1, available_at = ?,
+                    lease_token = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE id = ? AND lease_token = ?
+                """,
+                (now, now, job_id, token),
+            )
+            return cursor.rowcount == 1
+
+    def job_counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            return {
+                row["status"]: row["count"]
+                for row in conn.execute(
+                    "SELECT status, COUNT(*) AS count FROM jobs GROUP BY status"
+                )
+            }
+
+    def list_jobs(self, *, status: Optional[str] = None, limit: int = 20) -> List[JobRecord]:
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?", (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)
+                ).fetchall()
+            return [self._row_to_job(row) for row in rows]
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> JobRecord:
+        def parse(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        return JobRecord(
+            id=row["id"],
+            url=row["url"],
+            status=row["status"],
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            available_at=datetime.fromisoformat(row["available_at"]),
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+            lease_owner=row["lease_owner"],
+            lease_token=row["lease_token"],
+            lease_expires_at=parse(row["lease_expires_at"]),
+            finished_at=parse(row["finished_at"]),
+            error=row["error"],
+            output_path=row["output_path"],
+            article_id=row["article_id"],
+        )
+
+    def record_batch_item(
+        self,
+        *,
+        batch_id: str,
+        url: str,
+        status: str,
+        stage: Optional[str],
+        error: Optional[str],
+        output_path: Optional[Path],
+        article_id: Optional[int],
+        finished_at: datetime,
+    ) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO batch_items (
+                    batch_id, url, status, stage, error, output_path, article_id, finished_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    batch_id,
+                    url,
+                    status,
+                    stage,
+                    error,
+                    str(output_path) if output_path else None,
+                    article_id,
+                    finished_at.isoformat(),
+                ),
+            )
+
+    def list_batch_items(self, batch_id: str) -> List[BatchItemRecord]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM batch_items WHERE batch_id = ? ORDER BY id", (batch_id,)
+            ).fetchall()
+            return [
+                BatchItemRecord(
+                    id=row["id"],
+                    batch_id=row["batch_id"],
+                    url=row["url"],
+                    status=row["status"],
+                    stage=row["stage"],
+                    error=row["error"],
+                    output_path=row["output_path"],
+                    finished_at=datetime.fromisoformat(row["finished_at"]),
+                )
+                for row in rows
+            ]
+
     def list_recent_analyses(self, limit: int = 10) -> List[AnalysisRecord]:
         with self._connect() as conn:
             rows = conn.execute(
@@ -160,20 +1884,131 @@ class ArticleRepository:
                 )
             return records
 
-    def list_cached_articles(self, limit: int = 10) -> List[ArticleRecord]:
+    def list_cached_articles(self, limit: int = 10) -> List[ArticleSummary]:
         with self._connect() as conn:
             rows = conn.execute(
-                "SELECT * FROM articles ORDER BY fetched_at DESC LIMIT ?", (limit,)
+                """
+                SELECT id, url, title, content_hash, fetched_at FROM articles
+                ORDER BY fetched_at DESC LIMIT ?
+                """,
+                (limit,),
             ).fetchall()
-            return [self._row_to_article(row) for row in rows]
+            return [
+                ArticleSummary(
+                    id=row["id"],
+                    url=row["url"],
+                    title=row["title"],
+                    content_hash=row["content_hash"],
+                    fetched_at=datetime.fromisoformat(row["fetched_at"]),
+                )
+                for row in rows
+            ]
+
+    def search(
+        self, query: str, *, scope: str = "all", limit: int = 10, offset: int = 0
+    ) -> Tuple[int, List[SearchResult]]:
+        """Rank cached articles and reports matching ``query`` by bm25.
+
+        ``scope`` is ``all``, ``articles`` or ``reports``. Returns the total
+        number of matches and one page of results.
+        """
+        if scope not in SEARCH_SCOPES:
+            raise ValueError(f"Unknown search scope '{scope}'. Use one of: {', '.join(SEARCH_SCOPES)}.")
+        expression, words = _match_expression(query)
+        selects = []
+        counts = []
+        parameters: List[object] = []
+        if scope in ("all", "articles"):
+            selects.append(
+                f"""
+                SELECT 'article' AS kind, articles.id, articles.url, articles.title,
+                    articles.fetched_at AS created_at, NULL AS output_path, NULL AS snippet,
+                    bm25(article_search, {", ".join(map(str, _ARTICLE_WEIGHTS))}) AS score
+                FROM article_search
+                INNER JOIN articles ON articles.id = article_search.rowid
+                WHERE article_search MATCH ?
+                """
+            )
+            counts.append("SELECT COUNT(*) FROM article_search WHERE article_search MATCH ?")
+            parameters.append(expression)
+        if scope in ("all", "reports"):
+            selects.append(
+                f"""
+                SELECT 'report' AS kind, analyses.id, articles.url, articles.title,
+                    analyses.created_at, analyses.output_path,
+                    snippet(report_search, -1, '', '', '…', {_SNIPPET_WORDS}) AS snippet,
+                    bm25(report_search, {", ".join(map(str, _REPORT_WEIGHTS))}) AS score
+                FROM report_search
+                INNER JOIN analyses ON analyses.id = report_search.rowid
+                INNER JOIN articles ON articles.id = analyses.article_id
+                WHERE report_search MATCH ?
+                """
+            )
+            counts.append("SELECT COUNT(*) FROM report_search WHERE report_search MATCH ?")
+            parameters.append(expression)
+        with self._connect() as conn:
+            total = sum(
+                conn.execute(count, (expression,)).fetchone()[0] for count in counts
+            )
+            rows = conn.execute(
+                f"{' UNION ALL '.join(selects)} ORDER BY score LIMIT ? OFFSET ?",
+                (*parameters, limit, offset),
+            ).fetchall()
+            results = []
+            for row in rows:
+                snippet = row["snippet"]
+                if snippet is None:
+                    snippet = _excerpt(self.get_article_content(row["id"]) or "", words)
+                results.append(
+                    SearchResult(
+                        kind=row["kind"],
+                        id=row["id"],
+                        url=row["url"],
+                        title=row["title"],
+                        snippet=snippet,
+                        created_at=datetime.fromisoformat(row["created_at"]),
+                        output_path=row["output_path"],
+                    )
+                )
+            return total, results
+
+    def get_article_content(self, article_id: int) -> Optional[str]:
+        """Load and decompress a single article body on demand."""
+        with self._connect() as conn:
+            row = conn.execute(
+                """
+                SELECT article_bodies.content, article_bodies.content_encoding
+                FROM articles
+                INNER JOIN article_bodies ON article_bodies.content_hash = articles.content_hash
+                WHERE articles.id = ?
+                """,
+                (article_id,),
+            ).fetchone()
+            if not row:
+                return None
+            return decompress_content(row["content"], row["content_encoding"])
 
     @staticmethod
-    def _row_to_article(row: sqlite3.Row) -> ArticleRecord:
+    def _row_to_article(
+        row: sqlite3.Row,
+        content: Optional[str] = None,
+        paragraph_hashes: Optional[Sequence[str]] = None,
+    ) -> ArticleRecord:
+        if content is None:
+            content = decompress_content(row["content"], row["content_encoding"])
+        if paragraph_hashes is None:
+            paragraph_hashes = (row["paragraph_hashes"] or "").split()
         return ArticleRecord(
             id=row["id"],
             url=row["url"],
             title=row["title"],
-            content=row["content"],
+            content=content,
             content_hash=row["content_hash"],
             fetched_at=datetime.fromisoformat(row["fetched_at"]),
+            etag=row["etag"],
+            last_modified=row["last_modified"],
+            validated_at=(
+                datetime.fromisoformat(row["validated_at"]) if row["validated_at"] else None
+            ),
+            paragraph_hashes=tuple(paragraph_hashes),
         )
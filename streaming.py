@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+# CrewAI agents reason before answering; only text after this marker is report content.
+_FINAL_ANSWER = "Final Answer:"
+
+
+class ReportStream:
+    """A report that is rendered to disk and to listeners while it is generated.
+
+    Sections are filled in report order. Until :meth:`complete` is called the
+    rendered report carries an "incomplete" notice, so a run that is
+    interrupted or killed leaves a file that says it is partial.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        sections: Sequence[str],
+        render: Callable[[Dict[str, str], Optional[str]], str],
+        on_update: Optional[Callable[[str], None]] = None,
+        min_interval: float = 0.25,
+    ):
+        self.path = path
+        self.sections = tuple(sections)
+        self._render = render
+        self._on_update = on_update
+        self._min_interval = min_interval
+        self._finished: Dict[str, str] = {}
+        self._current: Optional[str] = None
+        self._tokens: List[str] = []
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self.first_output_at: Optional[float] = None
+        self._started = time.perf_counter()
+
+    def begin(self, section: str) -> None:
+        with self._lock:
+            self._current = section
+            self._tokens = []
+        self._flush(force=True)
+
+    def feed(self, token: str) -> None:
+        with self._lock:
+            if self._current is None:
+                return
+            self._tokens.append(token)
+        self._flush()
+
+    def finish(self, section: str, output: str) -> None:
+        with self._lock:
+            self._finished[section] = output
+            if self._current == section:
+                self._current = None
+                self._tokens = []
+        self._flush(force=True)
+
+    def complete(self, report: str) -> None:
+        """Replace the partial rendering with the final report."""
+        self._write(report)
+
+    def abort(self, reason: str) -> None:
+        """Leave the partial report on disk with ``reason`` in its notice."""
+        self._flush(force=True, reason=reason)
+
+    def render(self, reason: Optional[str] = None) -> str:
+        with self._lock:
+            outputs = dict(self._finished)
+            if self._current is not None:
+                outputs[self._current] = _answer_text("".join(self._tokens)) or "_Generating..._"
+            current = self._current
+        for section in self.sections:
+            outputs.setdefault(section, "_Pending._")
+        if reason is None:
+            reason = f"generating {current}" if current else "generation in progress"
+        return self._render(outputs, reason)
+
+    @property
+    def time_to_first_output(self) -> Optional[float]:
+        if self.first_output_at is None:
+            return None
+        return self.first_output_at - self._started
+
+    def _flush(self, *, force: bool = False, reason: Optional[str] = None) -> None:
+        now = time.perf_counter()
+        if not force and now - self._last_flush < self._min_interval:
+            return
+        self._last_flush = now
+        self._write(self.render(reason))
+
+    def _write(self, text: str) -> None:
+        # Write to a sibling and rename so readers never see a torn file.
+        partial = self.path.with_name(self.path.name + ".partial")
+        partial.write_text(text, encoding="utf-8")
+        os.replace(partial, self.path)
+        if self.first_output_at is None:
+            self.first_output_at = time.perf_counter()
+        if self._on_update:
+            self._on_update(text)
+
+
+def _answer_text(raw: str) -> str:
+    if _FINAL_ANSWER in raw:
+        return raw.rsplit(_FINAL_ANSWER, 1)[1].strip()
+    return raw.strip()
@@ -1,7 +1,165 @@
-from typing import Optional
+import hashlib
+import re
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
 
 from crewai import Task
 
+from chunking import ArticleChunk, Paragraph, ParagraphDiff
+
+
+class TaskTemplate(NamedTuple):
+    instructions: str
+    expected_output: str
+
+
+ARTICLE_CONTEXT = (
+    "Article URL: {url}\n"
+    "Article Title: {title}\n\n"
+    "Article Content:\n{body}"
+)
+
+TASK_TEMPLATES = {
+    "summary": TaskTemplate(
+        instructions=(
+            "You are provided with an article and must produce a crisp, executive summary "
+            "highlighting primary claims, supporting evidence, and contextual framing."
+        ),
+        expected_output=(
+            "A markdown bullet list (5-8 items) covering thesis, key evidence, and notable context."
+        ),
+    ),
+    "assumptions": TaskTemplate(
+        instructions=(
+            "Analyze the article to surface implicit and explicit assumptions made by the author. "
+            "Explain why each assumption matters and note any evidence needed to validate it."
+        ),
+        expected_output=(
+            "A markdown bullet list. Each bullet must include the assumption, rationale, and verification notes."
+        ),
+    ),
+    "errors": TaskTemplate(
+        instructions=(
+            "Review the article for potential factual inaccuracies, logical fallacies, or biased framing. "
+            "Classify each finding by type and suggest verification steps."
+        ),
+        expected_output=(
+            "A markdown table with columns Issue, Category, Confidence, and Recommended Verification."
+        ),
+    ),
+}
+
+
+CHUNK_INSTRUCTIONS = (
+    "You are reviewing part {part} of {parts} of a longer article (paragraphs {first}-{last}). "
+    "Paragraphs are labelled [P#]; cite the label of every paragraph you draw on. "
+    "Work only from this part and do not speculate about the rest of the article."
+)
+
+CHUNK_EXPECTED_OUTPUT = (
+    "Concise markdown notes for this part of the article, each citing its [P#] paragraph labels."
+)
+
+REDUCE_INSTRUCTIONS = (
+    "The article was too long to review in one pass, so it was split into consecutive parts "
+    "that were analyzed separately. Merge the partial analyses below into a single result "
+    "for the whole article: remove duplicates, reconcile overlaps, and keep the [P#] "
+    "paragraph citations."
+)
+
+REDUCE_CONTEXT = (
+    "Article URL: {url}\n"
+    "Article Title: {title}\n\n"
+    "Partial Analyses:\n{partials}"
+)
+
+
+UPDATE_INSTRUCTIONS = (
+    "The analysis below was written for an earlier or syndicated version of this article. "
+    "Update the analysis so it matches the current version: keep points that still hold, revise or drop points that "
+    "rest on removed or reworded paragraphs, and add points raised by the new text. Keep the "
+    "format of the previous analysis and return the complete updated analysis."
+)
+
+UPDATE_CONTEXT = (
+    "Article URL: {url}\n"
+    "Article Title: {title}\n\n"
+    "Previous Analysis:\n{previous}\n\n"
+    "Changed or Added Paragraphs (current version):\n{updated}\n\n"
+    "Removed or Reworded Paragraphs (previous version):\n{outdated}"
+)
+
+
+COMBINED_INSTRUCTIONS = (
+    "Review the article below once and produce every requested section. Start each "
+    "section with its marker line exactly as shown, in the order given, and do not "
+    "write anything before the first marker."
+)
+
+SECTION_MARKER = "=== {kind} ==="
+
+_MARKER_PATTERN = re.compile(r"^[ \t#*]*=+[ \t]*([A-Za-z]+)[ \t]*=+[ \t*]*$", re.MULTILINE)
+
+
+def section_marker(kind: str) -> str:
+    return SECTION_MARKER.format(kind=kind.upper())
+
+
+def parse_combined_output(text: str, kinds: Sequence[str]) -> Optional[Dict[str, str]]:
+    """Split a single-pass response into its sections.
+
+    Returns ``None`` unless every requested section is present and non-empty,
+    so callers can fall back to per-task prompts.
+    """
+    matches = [
+        match for match in _MARKER_PATTERN.finditer(text) if match.group(1).lower() in kinds
+    ]
+    sections: Dict[str, str] = {}
+    for position, match in enumerate(matches):
+        end = matches[position + 1].start() if position + 1 < len(matches) else len(text)
+        kind = match.group(1).lower()
+        if kind in sections:
+            return None
+        sections[kind] = text[match.end():end].strip()
+    if set(sections) != set(kinds) or not all(sections.values()):
+        return None
+    return sections
+
+
+def prompt_fingerprint(kind: str, strategy: str = "standard", preprocessing: str = "") -> str:
+    """Return a stable hash of the prompt templates used for a task kind.
+
+    Cached LLM results are keyed on this value, so editing a template
+    invalidates only the results produced from the old wording. The same goes
+    for ``preprocessing``, which names how the article body was prepared.
+    """
+    template = TASK_TEMPLATES[kind]
+    parts = [kind, template.instructions, template.expected_output, ARTICLE_CONTEXT]
+    if strategy == "chunked":
+        parts += [
+            strategy,
+            CHUNK_INSTRUCTIONS,
+            CHUNK_EXPECTED_OUTPUT,
+            REDUCE_INSTRUCTIONS,
+            REDUCE_CONTEXT,
+        ]
+    elif strategy == "single-pass":
+        parts += [strategy, COMBINED_INSTRUCTIONS, SECTION_MARKER]
+    if preprocessing:
+        parts.append(preprocessing)
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def render_partial(chunk: ArticleChunk, output: str) -> str:
+    """How one partial analysis appears in a reduce prompt."""
+    return (
+        f"### Part {chunk.index} (paragraphs {chunk.first_paragraph}-{chunk.last_paragraph})"
+        f"\n{output.strip()}"
+    )
+
 
 class ArticleAnalysisTasks:
     def __init__(self, *, article_body: str, url: str, title: Optional[str]):
@@ -10,46 +168,97 @@ class ArticleAnalysisTasks:
         self.title = title
 
     def summarize_article(self, agent):
+        return self._build_task("summary", agent)
+
+    def identify_assumptions(self, agent):
+        return self._build_task("assumptions", agent)
+
+    def identify_errors(self, agent):
+        return self._build_task("errors", agent)
+
+    def analyze_chunk(self, kind: str, agent, chunk: ArticleChunk, chunk_count: int):
+        """Map step: analyze one chunk of a long article for a single section."""
+        template = TASK_TEMPLATES[kind]
+        scope = CHUNK_INSTRUCTIONS.format(
+            part=chunk.index,
+            parts=chunk_count,
+            first=chunk.first_paragraph,
+            last=chunk.last_paragraph,
+        )
+        context = ARTICLE_CONTEXT.format(
+            url=self.url, title=self.title or "Unknown", body=chunk.render()
+        )
         return Task(
-            description=(
-                "You are provided with an article and must produce a crisp, executive summary "
-                "highlighting primary claims, supporting evidence, and contextual framing.\n\n"
-                f"Article URL: {self.url}\n"
-                f"Article Title: {self.title or 'Unknown'}\n\n"
-                f"Article Content:\n{self.article_body}"
-            ),
+            description=f"{template.instructions}\n\n{scope}\n\n{context}",
             agent=agent,
-            expected_output=(
-                "A markdown bullet list (5-8 items) covering thesis, key evidence, and notable context."
-            ),
+            expected_output=CHUNK_EXPECTED_OUTPUT,
         )
 
-    def identify_assumptions(self, agent):
+    def reduce_partials(
+        self, kind: str, agent, partials: Sequence[Tuple[ArticleChunk, str]]
+    ):
+        """Reduce step: merge per-chunk notes into the final section."""
+        template = TASK_TEMPLATES[kind]
+        rendered = "\n\n".join(render_partial(chunk, output) for chunk, output in partials)
+        context = REDUCE_CONTEXT.format(
+            url=self.url, title=self.title or "Unknown", partials=rendered
+        )
         return Task(
-            description=(
-                "Analyze the article to surface implicit and explicit assumptions made by the author. "
-                "Explain why each assumption matters and note any evidence needed to validate it.\n\n"
-                f"Article URL: {self.url}\n"
-                f"Article Title: {self.title or 'Unknown'}\n\n"
-                f"Article Content:\n{self.article_body}"
-            ),
+            description=f"{REDUCE_INSTRUCTIONS}\n\n{template.instructions}\n\n{context}",
             agent=agent,
             expected_output=(
-                "A markdown bullet list. Each bullet must include the assumption, rationale, and verification notes."
+                f"{template.expected_output} Cite [P#] paragraph labels where relevant."
             ),
         )
 
-    def identify_errors(self, agent):
+    def update_section(self, kind: str, agent, previous_output: str, diff: ParagraphDiff):
+        """Delta step: revise a previous section using only the edited paragraphs."""
+        template = TASK_TEMPLATES[kind]
+        context = UPDATE_CONTEXT.format(
+            url=self.url,
+            title=self.title or "Unknown",
+            previous=previous_output.strip(),
+            updated=_render_paragraphs(diff.updated),
+            outdated=_render_paragraphs(diff.outdated),
+        )
         return Task(
-            description=(
-                "Review the article for potential factual inaccuracies, logical fallacies, or biased framing. "
-                "Classify each finding by type and suggest verification steps.\n\n"
-                f"Article URL: {self.url}\n"
-                f"Article Title: {self.title or 'Unknown'}\n\n"
-                f"Article Content:\n{self.article_body}"
-            ),
+            description=f"{UPDATE_INSTRUCTIONS}\n\n{template.instructions}\n\n{context}",
+            agent=agent,
+            expected_output=template.expected_output,
+        )
+
+    def combined_analysis(self, agent, kinds: Sequence[str]):
+        """Single-pass task requesting several sections from one copy of the article."""
+        requests = "\n\n".join(
+            f"{section_marker(kind)}\n{TASK_TEMPLATES[kind].instructions}\n"
+            f"Format: {TASK_TEMPLATES[kind].expected_output}"
+            for kind in kinds
+        )
+        return Task(
+            description=f"{COMBINED_INSTRUCTIONS}\n\n{requests}\n\n{self._article_context()}",
             agent=agent,
             expected_output=(
-                "A markdown table with columns Issue, Category, Confidence, and Recommended Verification."
+                "The requested sections in order, each introduced by its marker line: "
+                + ", ".join(section_marker(kind) for kind in kinds)
+                + "."
             ),
         )
+
+    def _build_task(self, kind: str, agent):
+        template = TASK_TEMPLATES[kind]
+        return Task(
+            description=f"{template.instructions}\n\n{self._article_context()}",
+            agent=agent,
+            expected_output=template.expected_output,
+        )
+
+    def _article_context(self) -> str:
+        return ARTICLE_CONTEXT.format(
+            url=self.url, title=self.title or "Unknown", body=self.article_body
+        )
+
+
+def _render_paragraphs(paragraphs: Sequence[Paragraph]) -> str:
+    if not paragraphs:
+        return "(none)"
+    return "\n\n".join(f"{paragraph.label} {paragraph.text}" for paragraph in paragraphs)
@@ -0,0 +1,119 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Pipeline order used when listing stages; task stages share the "task." prefix.
+STAGE_ORDER = ("fetch", "download", "extract", "compact", "task", "write", "total")
+
+
+@dataclass
+class StageSample:
+    """Duration and token counts of one stage of one analysis."""
+
+    stage: str
+    seconds: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_hit: Optional[bool] = None
+    failed: bool = False
+
+
+class Telemetry:
+    """Thread-safe collector of the stage samples of a single analysis."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._samples: List[StageSample] = []
+        self._lock = threading.Lock()
+
+    @property
+    def samples(self) -> List[StageSample]:
+        with self._lock:
+            return list(self._samples)
+
+    def record(self, sample: StageSample) -> None:
+        with self._lock:
+            self._samples.append(sample)
+
+    def extend(self, samples: Iterable[StageSample]) -> None:
+        with self._lock:
+            self._samples.extend(samples)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageSample]:
+        """Time the body of the ``with`` block; the sample is marked failed on error."""
+        sample = StageSample(stage=name, seconds=0.0)
+        started = time.perf_counter()
+        try:
+            yield sample
+        except BaseException:
+            sample.failed = True
+            raise
+        finally:
+            sample.seconds = time.perf_counter() - started
+            self.record(sample)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+@dataclass
+class StageStats:
+    stage: str
+    model: str
+    count: int
+    failures: int
+    p50: float
+    p95: float
+    p99: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_hits: int = 0
+    cache_lookups: int = 0
+    _durations: List[float] = field(default_factory=list, repr=False)
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_stages(
+    rows: Iterable[Tuple[str, str, float, int, int, Optional[bool], bool]]
+) -> List[StageStats]:
+    """Aggregate ``(stage, model, seconds, in, out, cache_hit, failed)`` rows per stage and model."""
+    groups: Dict[Tuple[str, str], StageStats] = {}
+    for stage, model, seconds, input_tokens, output_tokens, cache_hit, failed in rows:
+        stats = groups.get((stage, model))
+        if stats is None:
+            stats = groups[(stage, model)] = StageStats(
+                stage=stage, model=model, count=0, failures=0, p50=0.0, p95=0.0, p99=0.0
+            )
+        stats.count += 1
+        stats.failures += int(bool(failed))
+        stats.input_tokens += input_tokens or 0
+        stats.output_tokens += output_tokens or 0
+        if cache_hit is not None:
+            stats.cache_lookups += 1
+            stats.cache_hits += int(bool(cache_hit))
+        stats._durations.append(seconds)
+
+    for stats in groups.values():
+        durations = sorted(stats._durations)
+        stats.p50 = percentile(durations, 0.50)
+        stats.p95 = percentile(durations, 0.95)
+        stats.p99 = percentile(durations, 0.99)
+        stats._durations = []
+    return sorted(groups.values(), key=lambda stats: (stats.model, _stage_rank(stats.stage), stats.stage))
+
+
+def _stage_rank(stage: str) -> int:
+    prefix = stage.split(".", 1)[0]
+    return STAGE_ORDER.index(prefix) if prefix in STAGE_ORDER else len(STAGE_ORDER)
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Settings  # noqa: E402
+from storage import ArticleRepository  # noqa: E402
+
+
+@pytest.fixture
+def settings(tmp_path):
+    """Defaults on scratch storage, independent of the local .env."""
+    (tmp_path / "output").mkdir()
+    return Settings(
+        model_provider="openrouter",
+        openrouter_api_key="test",
+        openrouter_model="test/model",
+        ollama_model="test-model",
+        output_dir=tmp_path / "output",
+        database_path=tmp_path / "analysis.db",
+    )
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = ArticleRepository(tmp_path / "analysis.db")
+    yield repository
+    repository.close()
@@ -0,0 +1,141 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from archive import export_archive, import_archive
+from chunking import paragraph_hashes
+from storage import ArticleRepository
+from telemetry import StageSample
+
+FETCHED = datetime(2024, 5, 1, 12, 0)
+REPORT = """# Article Intelligence Report
+
+## Executive Summary
+- Interconnectors approved.
+
+## Authorial Assumptions
+- Balancing costs fall.
+
+## Potential Errors & Biases
+- The estimate predates the tender.
+"""
+
+
+@pytest.fixture
+def target(tmp_path):
+    repository = ArticleRepository(tmp_path / "imported" / "analysis.db")
+    yield repository
+    repository.close()
+
+
+def _seed(repository, output_dir):
+    grid = repository.save_article(
+        url="https://example.com/grid",
+        title="Grid links",
+        content="Three interconnectors were approved.\n\nCosts should fall.",
+        content_hash="hash-grid",
+        fetched_at=FETCHED,
+        etag='"v1"',
+    )
+    repository.save_article(
+        url="https://example.com/solar",
+        title="Solar",
+        content="Solar output doubled.",
+        content_hash="hash-solar",
+        fetched_at=FETCHED + timedelta(minutes=5),
+    )
+    report = output_dir / "grid-links.md"
+    report.write_text(REPORT, encoding="utf-8")
+    repository.record_analysis(
+        article_id=grid.id,
+        model_provider="openrouter",
+        model_name="test/model",
+        output_path=report,
+        created_at=FETCHED + timedelta(minutes=1),
+        strategy="standard",
+        input_tokens=1200,
+        output_tokens=300,
+        stages=[StageSample(stage="task.summary", seconds=1.5, input_tokens=400)],
+        content_hash=grid.content_hash,
+    )
+
+
+def test_export_then_import_restores_articles_analyses_and_reports(
+    repository, target, settings, tmp_path
+):
+    _seed(repository, settings.output_dir)
+    archive = tmp_path / "export.jsonl.gz"
+    exported = export_archive(repository, archive)
+    assert (exported.articles, exported.analyses, exported.skipped) == (2, 1, 0)
+
+    imported_dir = tmp_path / "imported" / "output"
+    imported = import_archive(target, archive, output_dir=imported_dir)
+    assert (imported.articles, imported.analyses, imported.skipped) == (2, 1, 0)
+
+    article = target.get_article("https://example.com/grid")
+    assert article.content == "Three interconnectors were approved.\n\nCosts should fall."
+    assert (article.content_hash, article.etag, article.fetched_at) == (
+        "hash-grid", '"v1"', FETCHED
+    )
+    assert list(article.paragraph_hashes) == paragraph_hashes(article.content)
+
+    (item,) = target.iter_analyses()
+    analysis = item.analysis
+    assert item.article_url == "https://example.com/grid"
+    assert analysis.output_path == imported_dir / "grid-links.md"
+    assert analysis.output_path.read_text(encoding="utf-8") == REPORT
+    assert (analysis.input_tokens, analysis.output_tokens, analysis.content_hash) == (
+        1200, 300, "hash-grid"
+    )
+    assert [(stage.stage, stage.input_tokens) for stage in analysis.stages] == [
+        ("task.summary", 400)
+    ]
+    total, _ = target.search("tender", scope="reports")
+    assert total == 1
+
+
+def test_importing_the_same_archive_again_changes_nothing(repository, target, settings, tmp_path):
+    _seed(repository, settings.output_dir)
+    archive = tmp_path / "export.jsonl.gz"
+    export_archive(repository, archive)
+    imported_dir = tmp_path / "imported" / "output"
+    import_archive(target, archive, output_dir=imported_dir)
+
+    again = import_archive(target, archive, output_dir=imported_dir, batch_size=1)
+    assert (again.articles, again.analyses, again.skipped) == (0, 0, 3)
+    assert len(list(target.iter_analyses())) == 1
+    assert [path.name for path in imported_dir.iterdir()] == ["grid-links.md"]
+
+
+def test_exports_since_a_cursor_contain_only_newer_rows(repository, settings, tmp_path):
+    _seed(repository, settings.output_dir)
+    since = FETCHED + timedelta(minutes=2)
+    summary = export_archive(repository, tmp_path / "delta.jsonl.gz", since=since)
+    assert (summary.articles, summary.analyses) == (1, 0)
+
+    with gzip.open(tmp_path / "delta.jsonl.gz", "rt", encoding="utf-8") as handle:
+        header, article = [json.loads(line) for line in handle]
+    assert header["since"] == since.isoformat()
+    assert article["url"] == "https://example.com/solar"
+
+
+def test_a_missing_report_file_is_counted_as_skipped(repository, target, settings, tmp_path):
+    _seed(repository, settings.output_dir)
+    (settings.output_dir / "grid-links.md").unlink()
+    archive = tmp_path / "export.jsonl.gz"
+    assert export_archive(repository, archive).skipped == 1
+
+    imported = import_archive(target, archive, output_dir=tmp_path / "imported" / "output")
+    assert imported.analyses == 1
+    (item,) = target.iter_analyses()
+    assert item.analysis.output_path == settings.output_dir / "grid-links.md"
+
+
+def test_archives_of_another_format_are_rejected(target, tmp_path):
+    archive = tmp_path / "future.jsonl.gz"
+    with gzip.open(archive, "wt", encoding="utf-8") as handle:
+        handle.write(json.dumps({"type": "header", "format": 999}) + "\n")
+    with pytest.raises(ValueError, match="archive format 999"):
+        import_archive(target, archive, output_dir=tmp_path / "imported" / "output")
@@ -0,0 +1,193 @@
+import hashlib
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+import pipeline
+from article_service import ArticlePayload
+from chunking import diff_paragraphs, paragraph_hashes
+from pipeline import AnalysisPipeline
+
+URL = "https://example.com/grid"
+FIRST_FETCH = datetime(2024, 5, 1, 12, 0)
+FULL_RUN = ["task.assumptions", "task.errors", "task.summary"]
+UPDATE_RUN = ["task.assumptions.update", "task.errors.update", "task.summary.update"]
+PARAGRAPHS = [
+    "The grid operator approved three new interconnectors this spring.",
+    "Officials said the links would cut balancing costs by a fifth.",
+    "Critics noted that the cost estimate predates the latest tender.",
+    "Construction is due to start next year and finish by 2028.",
+    "Two of the links connect to offshore wind farms in the north.",
+    "The third runs under the strait to the neighbouring grid.",
+    "Consumer groups welcomed the decision but asked for audits.",
+    "The operator will publish quarterly progress reports.",
+]
+
+
+def _body(paragraphs):
+    return "\n\n".join(paragraphs)
+
+
+def _edited(index, text):
+    paragraphs = list(PARAGRAPHS)
+    paragraphs[index] = text
+    return paragraphs
+
+
+def test_diff_reports_changed_added_and_removed_paragraphs():
+    new = [PARAGRAPHS[0], "Officials now expect savings of a quarter.", *PARAGRAPHS[2:], "Update."]
+    diff = diff_paragraphs(_body(PARAGRAPHS), _body(new))
+    assert [paragraph.index for paragraph in diff.changed] == [2]
+    assert [paragraph.index for paragraph in diff.replaced] == [2]
+    assert diff.replaced[0].text == PARAGRAPHS[1]
+    assert [paragraph.index for paragraph in diff.added] == [9]
+    assert diff.removed == []
+    assert diff.describe() == "1 changed, 1 added ([P2], [P9])"
+
+    diff = diff_paragraphs(_body(PARAGRAPHS), _body(PARAGRAPHS[:6]))
+    assert [paragraph.index for paragraph in diff.removed] == [7, 8]
+    assert diff.updated == []
+    assert diff.describe() == "2 removed"
+
+
+def test_diff_ignores_whitespace_and_paragraph_spacing():
+    reflowed = "\n\n\n".join(f"  {'  '.join(text.split())} " for text in PARAGRAPHS)
+    diff = diff_paragraphs(_body(PARAGRAPHS), reflowed)
+    assert not diff.updated and not diff.outdated
+    assert diff.change_ratio == 0
+    assert diff.describe() == "no paragraph changes"
+
+
+def test_change_ratio_grows_with_the_edit():
+    small = diff_paragraphs(_body(PARAGRAPHS), _body(_edited(3, "Work starts in May.")))
+    rewrite = diff_paragraphs(_body(PARAGRAPHS), _body(["Something else entirely."]))
+    assert 0 < small.change_ratio < 0.5 < rewrite.change_ratio
+
+
+def test_diff_uses_stored_hashes_and_recomputes_mismatched_ones():
+    previous = _body(PARAGRAPHS)
+    new = _body(_edited(0, "The regulator approved three interconnectors."))
+    stored = diff_paragraphs(previous, new, paragraph_hashes(previous))
+    stale = diff_paragraphs(previous, new, ["0" * 16])
+    assert [paragraph.index for paragraph in stored.changed] == [1]
+    assert [paragraph.index for paragraph in stale.changed] == [1]
+
+
+class _FakeLLM:
+    """Stands in for ``pipeline._run_task``: answers every task with its stage name."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, settings, agents, agent_factory, build_task, usage, *, stage):
+        self.calls.append((stage, build_task))
+        return f"{stage} output"
+
+    def stages(self):
+        stages = [stage for stage, _ in self.calls]
+        self.calls.clear()
+        return sorted(stages)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = _FakeLLM()
+    monkeypatch.setattr(pipeline, "_run_task", fake)
+    monkeypatch.setattr(pipeline, "shared_agents", lambda settings: object())
+    return fake
+
+
+@pytest.fixture
+def analysis(settings, repository, llm):
+    analysis = AnalysisPipeline(settings, repository)
+    yield analysis
+    analysis.close()
+
+
+def _fetch(repository, paragraphs, fetched_at):
+    """Store a download of the article, as any process refetching it would."""
+    content = _body(paragraphs)
+    record = repository.save_article(
+        url=URL,
+        title="Grid links",
+        content=content,
+        content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        fetched_at=fetched_at,
+        paragraph_hashes=paragraph_hashes(content),
+    )
+    return ArticlePayload(record=record, content=content, title=record.title)
+
+
+def _stored_bodies(repository):
+    with sqlite3.connect(repository.database_path) as conn:
+        return {row[0] for row in conn.execute("SELECT content_hash FROM article_bodies")}
+
+
+def _analyze(analysis, payload):
+    result = analysis.analyze(URL, payload)
+    analysis.write(result)
+    return result
+
+
+def test_an_edited_article_updates_the_previous_sections(analysis, repository, llm):
+    _analyze(analysis, _fetch(repository, PARAGRAPHS, FIRST_FETCH))
+    assert llm.stages() == FULL_RUN
+
+    edited = _edited(1, "Officials now expect the links to cut balancing costs by a quarter.")
+    result = _analyze(analysis, _fetch(repository, edited, FIRST_FETCH + timedelta(hours=1)))
+
+    assert llm.stages() == UPDATE_RUN
+    assert result.strategy == "incremental"
+    assert result.sections["summary"] == "task.summary.update output"
+    assert "updated from the version fetched 2024-05-01 12:00 UTC: 1 changed ([P2])" in (
+        result.report
+    )
+
+
+def test_refetches_between_analyses_keep_the_analyzed_basis(analysis, repository, llm):
+    _analyze(analysis, _fetch(repository, PARAGRAPHS, FIRST_FETCH))
+    llm.stages()
+    # Refetched twice, e.g. by prefetch, without being analyzed in between.
+    skipped = _fetch(
+        repository, _edited(3, "Construction starts in May."), FIRST_FETCH + timedelta(hours=1)
+    )
+    latest = _edited(0, "The regulator approved three new interconnectors this spring.")
+    payload = _fetch(repository, latest, FIRST_FETCH + timedelta(hours=2))
+
+    basis = repository.get_analyzed_version(payload.record.id)
+    assert basis.content == _body(PARAGRAPHS)
+    assert _stored_bodies(repository) == {basis.content_hash, payload.record.content_hash}
+    assert skipped.record.content_hash not in _stored_bodies(repository)
+
+    result = _analyze(analysis, payload)
+    assert result.strategy == "incremental"
+    (diff,) = {build_task.keywords["diff"].describe() for _, build_task in llm.calls}
+    assert diff == "1 changed ([P1])"
+    # The new analysis supersedes the old basis, whose body is then pruned.
+    assert repository.get_analyzed_version(payload.record.id).content == _body(latest)
+    assert _stored_bodies(repository) == {payload.record.content_hash}
+
+
+def test_a_reflowed_article_reuses_the_previous_sections(analysis, repository, llm):
+    _analyze(analysis, _fetch(repository, PARAGRAPHS, FIRST_FETCH))
+    llm.stages()
+
+    reflowed = [f"{text}  " for text in PARAGRAPHS]
+    result = _analyze(analysis, _fetch(repository, reflowed, FIRST_FETCH + timedelta(hours=1)))
+
+    assert llm.stages() == []
+    assert result.strategy == "incremental"
+    assert result.sections["errors"] == "task.errors output"
+    assert result.backends["errors"] == "previous version"
+
+
+def test_a_rewritten_article_is_analyzed_from_scratch(analysis, repository, llm):
+    _analyze(analysis, _fetch(repository, PARAGRAPHS, FIRST_FETCH))
+    llm.stages()
+
+    rewritten = [f"Unrelated paragraph number {index}." for index in range(len(PARAGRAPHS))]
+    result = _analyze(analysis, _fetch(repository, rewritten, FIRST_FETCH + timedelta(hours=1)))
+
+    assert llm.stages() == FULL_RUN
+    assert result.strategy == "standard"
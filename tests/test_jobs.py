@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from storage import ArticleRepository
+
+LEASE = timedelta(minutes=10)
+START = datetime(2024, 5, 1, 12, 0)
+REPORT = Path("output/a.md")
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two repositories on one database file, as two worker processes would open it."""
+    first = ArticleRepository(tmp_path / "analysis.db")
+    second = ArticleRepository(tmp_path / "analysis.db")
+    yield first, second
+    first.close()
+    second.close()
+
+
+def _job(repository, job_id):
+    return next(job for job in repository.list_jobs() if job.id == job_id)
+
+
+def test_a_job_is_claimed_by_one_worker_only(workers):
+    first, second = workers
+    (job_id,) = first.enqueue_jobs(["https://example.com/a"], max_attempts=3, now=START)
+
+    claimed = first.claim_job("worker-a", lease=LEASE, now=START)
+    assert claimed.id == job_id
+    assert claimed.status == "running"
+    assert claimed.attempts == 1
+    assert claimed.lease_owner == "worker-a"
+    assert second.claim_job("worker-b", lease=LEASE, now=START) is None
+
+
+def test_jobs_wait_for_their_available_time(workers):
+    first, second = workers
+    first.enqueue_jobs(["https://example.com/a"], max_attempts=3, now=START)
+    assert second.claim_job("worker-b", lease=LEASE, now=START - timedelta(seconds=1)) is None
+    assert second.claim_job("worker-b", lease=LEASE, now=START) is not None
+
+
+def test_renewing_keeps_the_job_from_other_workers(workers):
+    first, second = workers
+    first.enqueue_jobs(["https://example.com/a"], max_attempts=3, now=START)
+    claimed = first.claim_job("worker-a", lease=LEASE, now=START)
+
+    renewed_at = START + timedelta(minutes=8)
+    assert first.renew_job_lease(claimed.id, claimed.lease_token, lease=LEASE, now=renewed_at)
+    assert not second.renew_job_lease(claimed.id, "not-the-token", lease=LEASE, now=renewed_at)
+    # Past the original lease but within the renewed one.
+    assert second.claim_job("worker-b", lease=LEASE, now=START + timedelta(minutes=12)) is None
+    assert first.complete_job(
+        claimed.id,
+        claimed.lease_token,
+        output_path=REPORT,
+        article_id=None,
+        now=START + timedelta(minutes=13),
+    )
+    assert _job(second, claimed.id).status == "succeeded"
+
+
+def test_an_expired_lease_is_reclaimed_and_the_old_owner_locked_out(workers):
+    first, second = workers
+    first.enqueue_jobs(["https://example.com/a"], max_attempts=3, now=START)
+    stale = first.claim_job("worker-a", lease=LEASE, now=START)
+
+    expired = START + LEASE
+    reclaimed = second.claim_job("worker-b", lease=LEASE, now=expired)
+    assert reclaimed.id == stale.id
+    assert reclaimed.attempts == 2
+    assert reclaimed.lease_owner == "worker-b"
+    assert reclaimed.lease_token != stale.lease_token
+
+    assert not first.renew_job_lease(stale.id, stale.lease_token, lease=LEASE, now=expired)
+    assert not first.complete_job(
+        stale.id, stale.lease_token, output_path=REPORT, article_id=None, now=expired
+    )
+    lost = first.fail_job(
+        stale.id, stale.lease_token, error="boom", retry_delay=timedelta(0), now=expired
+    )
+    assert lost is None
+    assert not first.release_job(stale.id, stale.lease_token, now=expired)
+
+    assert second.complete_job(
+        reclaimed.id, reclaimed.lease_token, output_path=REPORT, article_id=None, now=expired
+    )
+    job = _job(first, stale.id)
+    assert (job.status, job.lease_owner, job.output_path) == ("succeeded", "worker-b", str(REPORT))
+
+
+def test_failed_attempts_are_retried_until_exhausted(workers):
+    first, second = workers
+    first.enqueue_jobs(["https://example.com/a"], max_attempts=2, now=START)
+    delay = timedelta(seconds=30)
+
+    claimed = first.claim_job("worker-a", lease=LEASE, now=START)
+    status = first.fail_job(
+        claimed.id, claimed.lease_token, error="boom", retry_delay=delay, now=START
+    )
+    assert status == "queued"
+    assert second.claim_job("worker-b", lease=LEASE, now=START + timedelta(seconds=29)) is None
+
+    claimed = second.claim_job("worker-b", lease=LEASE, now=START + delay)
+    assert claimed.attempts == 2
+    status = second.fail_job(
+        claimed.id, claimed.lease_token, error="boom again", retry_delay=delay, now=START + delay
+    )
+    assert status == "failed"
+    assert first.claim_job("worker-a", lease=LEASE, now=START + timedelta(hours=1)) is None
+    assert _job(first, claimed.id).error == "boom again"
+
+
+def test_an_expired_final_attempt_fails_the_job(workers):
+    first, second = workers
+    first.enqueue_jobs(["https://example.com/a"], max_attempts=1, now=START)
+    claimed = first.claim_job("worker-a", lease=LEASE, now=START)
+
+    assert second.claim_job("worker-b", lease=LEASE, now=START + LEASE) is None
+    job = _job(second, claimed.id)
+    assert job.status == "failed"
+    assert job.error == "Lease expired on the final attempt."
+    assert job.lease_token is None
+
+
+def test_a_released_job_is_requeued_without_using_an_attempt(workers):
+    first, second = workers
+    first.enqueue_jobs(["https://example.com/a"], max_attempts=1, now=START)
+    claimed = first.claim_job("worker-a", lease=LEASE, now=START)
+
+    assert first.release_job(claimed.id, claimed.lease_token, now=START)
+    reclaimed = second.claim_job("worker-b", lease=LEASE, now=START)
+    assert reclaimed.id == claimed.id
+    assert reclaimed.attempts == 1
@@ -0,0 +1,127 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from storage import MIGRATIONS, ArticleRepository
+
+# The schema created before the database was versioned (user_version 0).
+BASELINE_SCHEMA = """
+CREATE TABLE articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT UNIQUE NOT NULL,
+    title TEXT,
+    content TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+CREATE TABLE analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    article_id INTEGER NOT NULL,
+    model_provider TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    FOREIGN KEY(article_id) REFERENCES articles(id)
+);
+"""
+
+BODY = "Solar output doubled this year.\n\nAnalysts expect storage to follow."
+
+
+def _user_version(path) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+@pytest.fixture
+def baseline_database(tmp_path):
+    path = tmp_path / "analysis.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    fetched = datetime(2024, 5, 1, 12, 0).isoformat()
+    # Two URLs serving the same body, as mirrors did before bodies were shared.
+    conn.executemany(
+        "INSERT INTO articles (url, title, content, content_hash, fetched_at) VALUES (?, ?, ?, ?, ?)",
+        [
+            ("https://example.com/solar", "Solar", BODY, "hash-solar", fetched),
+            ("https://mirror.example.org/solar", "Solar", BODY, "hash-solar", fetched),
+        ],
+    )
+    conn.execute(
+        """
+        INSERT INTO analyses (article_id, model_provider, model_name, output_path, created_at)
+        VALUES (1, 'openrouter', 'test/model', 'output/solar.md', ?)
+        """,
+        (fetched,),
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_baseline_database_is_migrated_without_losing_rows(baseline_database):
+    repository = ArticleRepository(baseline_database)
+    try:
+        assert _user_version(baseline_database) == len(MIGRATIONS)
+
+        article = repository.get_article("https://example.com/solar")
+        assert article.content == BODY
+        assert article.content_hash == "hash-solar"
+        assert repository.get_article("https://mirror.example.org/solar").content == BODY
+
+        with sqlite3.connect(baseline_database) as conn:
+            bodies = conn.execute("SELECT COUNT(*) FROM article_bodies").fetchone()[0]
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+        assert bodies == 1
+        assert "content" not in columns
+
+        (analysis,) = repository.list_recent_analyses()
+        assert analysis.article_url == "https://example.com/solar"
+        assert analysis.output_path == "output/solar.md"
+
+        total, results = repository.search("storage", scope="articles")
+        assert total == 2
+        assert {result.url for result in results} == {
+            "https://example.com/solar",
+            "https://mirror.example.org/solar",
+        }
+    finally:
+        repository.close()
+
+
+def test_migrated_database_opens_again_unchanged(baseline_database):
+    ArticleRepository(baseline_database).close()
+    repository = ArticleRepository(baseline_database)
+    try:
+        assert _user_version(baseline_database) == len(MIGRATIONS)
+        assert repository.get_article("https://example.com/solar").content == BODY
+    finally:
+        repository.close()
+
+
+@pytest.mark.parametrize("version", range(len(MIGRATIONS)))
+def test_every_schema_version_upgrades_to_the_latest(tmp_path, version):
+    path = tmp_path / "analysis.db"
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    for migration in MIGRATIONS[:version]:
+        migration(conn)
+    conn.execute(f"PRAGMA user_version = {version}")
+    conn.commit()
+    conn.close()
+
+    repository = ArticleRepository(path)
+    try:
+        assert _user_version(path) == len(MIGRATIONS)
+        saved = repository.save_article(
+            url="https://example.com/solar",
+            title="Solar",
+            content=BODY,
+            content_hash="hash-solar",
+            fetched_at=datetime(2024, 5, 1, 12, 0),
+        )
+        assert repository.get_article(saved.url).content == BODY
+        assert repository.enqueue_jobs([saved.url], max_attempts=3)
+    finally:
+        repository.close()
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+FETCHED = datetime(2024, 5, 1, 12, 0)
+
+
+def _save(repository, url, title, content, content_hash, fetched_at=FETCHED):
+    return repository.save_article(
+        url=url, title=title, content=content, content_hash=content_hash, fetched_at=fetched_at
+    )
+
+
+@pytest.fixture
+def articles(repository):
+    _save(
+        repository,
+        "https://example.com/grid",
+        "Grid interconnectors approved",
+        "The operator approved three links.\n\nU.S. observers and covid-19 delays were noted.",
+        "hash-grid",
+    )
+    _save(
+        repository,
+        "https://example.com/solar",
+        "Solar output doubles",
+        "Panels on warehouses drove the growth. New interconnectors are planned later.",
+        "hash-solar",
+    )
+    return repository
+
+
+def _urls(results):
+    return [result.url for result in results]
+
+
+def test_title_matches_rank_above_body_matches(articles):
+    total, results = articles.search("interconnectors", scope="articles")
+    assert total == 2
+    assert _urls(results) == ["https://example.com/grid", "https://example.com/solar"]
+    assert all(result.kind == "article" for result in results)
+
+
+def test_punctuation_is_matched_literally(articles):
+    for query in ("U.S.", "covid-19", 'covid-19 "U.S."', "operator:"):
+        total, results = articles.search(query)
+        assert total == 1, query
+        assert _urls(results) == ["https://example.com/grid"]
+
+
+def test_operators_phrases_and_prefixes_keep_their_meaning(articles):
+    assert articles.search("warehouses OR operator")[0] == 2
+    assert articles.search("interconnectors NOT warehouses")[0] == 1
+    assert articles.search('"three links"')[0] == 1
+    assert articles.search('"links three"')[0] == 0
+    assert articles.search("wareh*")[0] == 1
+    # Porter stemming: "approve" matches "approved".
+    assert articles.search("approve")[0] == 1
+
+
+def test_snippets_show_the_matching_text(articles):
+    _, (result,) = articles.search("warehouses")
+    assert "warehouses" in result.snippet
+
+
+def test_refetched_articles_are_reindexed(articles):
+    _save(
+        articles,
+        "https://example.com/solar",
+        "Solar output doubles",
+        "Rooftop installations drove the growth.",
+        "hash-solar-2",
+        fetched_at=FETCHED + timedelta(hours=1),
+    )
+    assert articles.search("warehouses")[0] == 0
+    assert _urls(articles.search("rooftop")[1]) == ["https://example.com/solar"]
+
+
+def test_reports_are_searchable_by_section(articles, tmp_path):
+    grid = articles.get_article("https://example.com/grid")
+    articles.record_analysis(
+        article_id=grid.id,
+        model_provider="openrouter",
+        model_name="test/model",
+        output_path=tmp_path / "grid.md",
+        created_at=FETCHED,
+        sections={"summary": "Links approved.", "errors": "The estimate ignores inflation."},
+    )
+    total, (result,) = articles.search("inflation", scope="reports")
+    assert total == 1
+    assert (result.kind, result.url, result.output_path) == (
+        "report", "https://example.com/grid", str(tmp_path / "grid.md")
+    )
+    assert articles.search("inflation", scope="articles")[0] == 0
+
+
+def test_pages_are_offset_by_the_limit(articles):
+    total, first = articles.search("interconnectors", limit=1)
+    _, second = articles.search("interconnectors", limit=1, offset=1)
+    assert total == 2
+    assert _urls(first + second) == ["https://example.com/grid", "https://example.com/solar"]
+
+
+@pytest.mark.parametrize("query", ["", "   ", "OR NOT", '""', "*"])
+def test_queries_without_words_are_rejected(articles, query):
+    with pytest.raises(ValueError, match="no words"):
+        articles.search(query)
+
+
+def test_unknown_scopes_are_rejected(articles):
+    with pytest.raises(ValueError, match="Unknown search scope"):
+        articles.search("solar", scope="everything")
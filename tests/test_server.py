@@ -0,0 +1,112 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from server import JobManager, create_server
+
+
+@pytest.fixture
+def api():
+    # Workers are never started, so submitted jobs stay queued and no
+    # pipeline is needed.
+    manager = JobManager(None, workers=1, queue_size=2)
+    server = create_server(manager, "127.0.0.1", 0)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    try:
+        yield manager, f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _request(url, body=None):
+    request = urllib.request.Request(url, data=body)
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as exc:
+        with exc:
+            return exc.code, dict(exc.headers), exc.read()
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"not json",
+        b'"https://example.com/a"',
+        b'["https://example.com/a"]',
+        b"{}",
+        b'{"url": 5}',
+        b'{"url": "   "}',
+        b'{"urls": "https://example.com/a"}',
+        b'{"urls": []}',
+        b'{"urls": ["https://example.com/a", null]}',
+    ],
+)
+def test_rejects_malformed_submissions(api, body):
+    manager, base = api
+    status, _, payload = _request(f"{base}/jobs", body)
+    assert status == 400
+    assert "error" in json.loads(payload)
+    assert manager.counts()["queued"] == 0
+
+
+def test_accepts_a_single_url(api):
+    manager, base = api
+    status, headers, payload = _request(f"{base}/jobs", b'{"url": " https://example.com/a "}')
+    job = json.loads(payload)
+    assert status == 202
+    assert job["url"] == "https://example.com/a"
+    assert job["status"] == "queued"
+    assert headers["Location"] == f"/jobs/{job['id']}"
+    assert manager.get(job["id"]) is not None
+
+
+def test_accepts_a_list_of_urls(api):
+    _, base = api
+    status, _, payload = _request(
+        f"{base}/jobs", b'{"urls": ["https://example.com/a", "https://example.com/b"]}'
+    )
+    assert status == 202
+    assert [job["url"] for job in json.loads(payload)["jobs"]] == [
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+
+
+def test_reports_what_was_accepted_when_the_queue_fills(api):
+    manager, base = api
+    status, headers, payload = _request(
+        f"{base}/jobs",
+        b'{"urls": ["https://example.com/a", "https://example.com/b", "https://example.com/c"]}',
+    )
+    assert status == 429
+    assert headers["Retry-After"] == "5"
+    assert len(json.loads(payload)["accepted"]) == 2
+    assert manager.counts()["queued"] == 2
+
+
+def test_unknown_paths_are_not_found(api):
+    _, base = api
+    assert _request(f"{base}/analyze", b'{"url": "https://example.com/a"}')[0] == 404
+    assert _request(f"{base}/jobs/missing")[0] == 404
+
+
+def test_report_of_an_unfinished_or_deleted_job(api, tmp_path):
+    manager, base = api
+    job = manager.submit("https://example.com/a")
+    assert _request(f"{base}/jobs/{job.id}/report")[0] == 409
+
+    job.status = "succeeded"
+    job.output_path = tmp_path / "report.md"
+    assert _request(f"{base}/jobs/{job.id}/report")[0] == 410
+
+    job.output_path.write_text("# Report\n", encoding="utf-8")
+    status, _, body = _request(f"{base}/jobs/{job.id}/report")
+    assert (status, body) == (200, b"# Report\n")
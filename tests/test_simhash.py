@@ -0,0 +1,104 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from simhash import (
+    SIMHASH_BANDS,
+    SIMHASH_BITS,
+    is_indexed_threshold,
+    max_distance,
+    simhash,
+    simhash_bands,
+    similarity,
+)
+
+# Band widths as laid out by simhash_bands.
+WIDTHS = (10,) + (9,) * 6
+STORY = " ".join(
+    f"Paragraph {index} says the grid operator approved interconnector number {index} "
+    f"after a review of costs, routes and the effect on consumers in region {index}."
+    for index in range(30)
+)
+
+
+def test_similar_texts_get_close_fingerprints():
+    assert simhash(STORY) == simhash(STORY.upper())
+    edited = STORY.replace("interconnector number 7 ", "interconnector number seven ")
+    assert similarity(simhash(STORY), simhash(edited)) >= 0.9
+    unrelated = "Solar panels on warehouses drove growth in the first quarter of the year."
+    assert similarity(simhash(STORY), simhash(unrelated)) < 0.8
+
+
+def test_bands_cover_every_bit():
+    fingerprint = random.Random(1).getrandbits(SIMHASH_BITS)
+    bands = simhash_bands(fingerprint)
+    assert len(bands) == SIMHASH_BANDS
+    assert simhash_bands((1 << SIMHASH_BITS) - 1) == [(1 << width) - 1 for width in WIDTHS]
+    rebuilt, shift = 0, 0
+    for value, width in zip(bands, WIDTHS):
+        rebuilt |= value << shift
+        shift += width
+    assert rebuilt == fingerprint
+
+
+def test_fingerprints_within_the_band_guarantee_share_a_band():
+    generator = random.Random(7)
+    for _ in range(2000):
+        fingerprint = generator.getrandbits(SIMHASH_BITS)
+        flipped = fingerprint
+        for bit in generator.sample(range(SIMHASH_BITS), SIMHASH_BANDS - 1):
+            flipped ^= 1 << bit
+        assert set(enumerate(simhash_bands(fingerprint))) & set(
+            enumerate(simhash_bands(flipped))
+        )
+
+
+@pytest.mark.parametrize(
+    ("threshold", "indexed"), [(1.0, True), (0.95, True), (0.9, True), (0.89, False), (0.5, False)]
+)
+def test_thresholds_the_index_can_serve(threshold, indexed):
+    assert is_indexed_threshold(threshold) is indexed
+    assert max_distance(threshold) == int((1 - threshold) * SIMHASH_BITS + 1e-9)
+
+
+def _save(repository, url, content, content_hash):
+    return repository.save_article(
+        url=url,
+        title=None,
+        content=content,
+        content_hash=content_hash,
+        fetched_at=datetime(2024, 5, 1, 12, 0),
+    )
+
+
+def test_a_near_duplicate_copy_is_found(repository):
+    _save(repository, "https://example.com/grid", STORY, "hash-original")
+    copy = STORY.replace("region 12.", "region twelve.")
+    _save(repository, "https://mirror.example.org/grid", copy, "hash-copy")
+    _save(repository, "https://example.com/solar", "Solar output doubled again.", "hash-solar")
+
+    match = repository.find_near_duplicate("hash-copy", threshold=0.9)
+    assert match.content_hash == "hash-original"
+    assert match.url == "https://example.com/grid"
+    assert match.similarity >= 0.9
+    assert repository.find_near_duplicate("hash-solar", threshold=0.9) is None
+    assert repository.find_near_duplicate("hash-unknown", threshold=0.9) is None
+
+
+def test_bodies_no_article_holds_are_not_offered(repository, tmp_path):
+    original = _save(repository, "https://example.com/grid", STORY, "hash-original")
+    repository.record_analysis(
+        article_id=original.id,
+        model_provider="openrouter",
+        model_name="test/model",
+        output_path=tmp_path / "grid.md",
+        created_at=datetime(2024, 5, 1, 12, 5),
+        content_hash="hash-original",
+    )
+    # The analyzed body is kept as the incremental basis, but no URL serves it.
+    _save(repository, "https://example.com/grid", "Rewritten from scratch.", "hash-rewrite")
+    assert repository.get_analyzed_version(original.id).content_hash == "hash-original"
+    copy = STORY.replace("region 12.", "region twelve.")
+    _save(repository, "https://mirror.example.org/grid", copy, "hash-copy")
+    assert repository.find_near_duplicate("hash-copy", threshold=0.9) is None
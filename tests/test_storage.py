@@ -0,0 +1,63 @@
+import sqlite3
+from datetime import datetime
+
+from storage import compress_content, decompress_content
+
+BODY = "Die Überschrift — naïve café.\n\n" + "Renewables grew again this quarter. " * 200
+
+
+def _save(repository, url, content, content_hash, fetched_at=datetime(2024, 5, 1, 12, 0)):
+    return repository.save_article(
+        url=url, title="Solar", content=content, content_hash=content_hash, fetched_at=fetched_at
+    )
+
+
+def test_compressed_content_round_trips():
+    data, encoding = compress_content(BODY)
+    assert encoding in ("zstd", "zlib")
+    assert len(data) < len(BODY.encode("utf-8"))
+    assert decompress_content(data, encoding) == BODY
+    assert decompress_content(BODY, "identity") == BODY
+
+
+def test_bodies_are_stored_compressed(repository):
+    _save(repository, "https://example.com/solar", BODY, "hash-solar")
+    with sqlite3.connect(repository.database_path) as conn:
+        content, encoding = conn.execute(
+            "SELECT content, content_encoding FROM article_bodies"
+        ).fetchone()
+    assert encoding != "identity"
+    assert decompress_content(content, encoding) == BODY
+    assert repository.get_article("https://example.com/solar").content == BODY
+
+
+def test_listings_leave_content_to_be_loaded_on_demand(repository):
+    saved = _save(repository, "https://example.com/solar", BODY, "hash-solar")
+    (summary,) = repository.list_cached_articles()
+    assert summary.url == "https://example.com/solar"
+    assert not hasattr(summary, "content")
+    assert repository.get_article_content(saved.id) == BODY
+    assert repository.get_article_content(saved.id + 1) is None
+
+
+def _body_hashes(repository):
+    with sqlite3.connect(repository.database_path) as conn:
+        return {row[0] for row in conn.execute("SELECT content_hash FROM article_bodies")}
+
+
+def test_urls_with_the_same_content_share_one_body(repository):
+    _save(repository, "https://example.com/solar", BODY, "hash-solar")
+    _save(repository, "https://mirror.example.org/solar", BODY, "hash-solar")
+    assert _body_hashes(repository) == {"hash-solar"}
+    assert repository.get_article("https://mirror.example.org/solar").content == BODY
+
+
+def test_bodies_are_deleted_once_no_article_holds_them(repository):
+    _save(repository, "https://example.com/solar", BODY, "hash-solar")
+    _save(repository, "https://mirror.example.org/solar", BODY, "hash-solar")
+
+    _save(repository, "https://example.com/solar", "Corrected text.", "hash-corrected")
+    assert _body_hashes(repository) == {"hash-solar", "hash-corrected"}
+
+    _save(repository, "https://mirror.example.org/solar", "Corrected text.", "hash-corrected")
+    assert _body_hashes(repository) == {"hash-corrected"}
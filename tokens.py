@@ -0,0 +1,50 @@
+import threading
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Rough average for English prose across the GPT/Llama family of tokenizers.
+CHARS_PER_TOKEN = 4
+
+# Encoding used for exact counts; close enough for the OpenRouter and Ollama models.
+TOKENIZER_ENCODING = "cl100k_base"
+
+_encoding = None
+_encoding_failed = False
+_encoding_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the number of LLM tokens in ``text``."""
+    if not text:
+        return 0
+    return max(1, -(-len(text) // CHARS_PER_TOKEN))
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with a real tokenizer, falling back to :func:`estimate_tokens`.
+
+    tiktoken downloads its encoding on first use, so offline machines without
+    a cached copy get the estimate instead.
+    """
+    if not text:
+        return 0
+    encoding = _load_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _load_encoding():
+    global _encoding, _encoding_failed
+    if tiktoken is None:
+        return None
+    with _encoding_lock:
+        if _encoding is None and not _encoding_failed:
+            try:
+                _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+            except Exception:  # noqa: BLE001 - network or cache failures fall back to estimates
+                _encoding_failed = True
+        return _encoding
@@ -0,0 +1,62 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track how a reader arrived at a page.
+_TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "ref_src",
+        "ref_url",
+        "_ga",
+        "_gl",
+    }
+)
+_TRACKING_PREFIXES = ("utm_",)
+
+# Query parameters, and the values of them, that select an AMP rendering of
+# the same article. Other values are kept: they may select different content.
+_AMP_PARAMS = {"amp": frozenset({"", "1", "true"}), "outputtype": frozenset({"amp"})}
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize an article URL so variants of the same page share a cache entry.
+
+    Lowercases the scheme and host, drops default ports, fragments, tracking
+    parameters and unambiguous AMP markers (``?amp=1``, ``?outputType=amp``
+    and ``.amp.html`` pages), and sorts the remaining query parameters. Hosts
+    and path segments merely named "amp" are left alone. URLs that are not
+    http(s) are returned unchanged.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower()
+    netloc = host
+    if parts.port and parts.port != _DEFAULT_PORTS[scheme]:
+        netloc = f"{host}:{parts.port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        netloc = f"{credentials}@{netloc}"
+
+    path = parts.path or "/"
+    if path.endswith(".amp.html"):
+        path = path[: -len(".amp.html")] + ".html"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS
+        and value.lower() not in _AMP_PARAMS.get(key.lower(), ())
+        and not key.lower().startswith(_TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
@@ -0,0 +1,140 @@
+import os
+import socket
+import threading
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+from pipeline import AnalysisPipeline
+from storage import JobRecord
+from telemetry import Telemetry
+
+
+class JobWorker:
+    """Claim jobs from the shared ``jobs`` table and run them through a pipeline.
+
+    Any number of workers, in any number of processes or machines sharing the
+    database, can run side by side: each claim is an atomic lease. While a job
+    runs its lease is renewed in the background, so a worker that crashes
+    stops renewing and the job is picked up again once the lease expires.
+
+    Events passed to ``on_event``: ``started``, ``succeeded``, ``retrying``,
+    ``failed``, and ``lease-lost`` when the job finished after its lease had
+    passed to another worker (or was released), so nothing was recorded.
+    """
+
+    def __init__(
+        self,
+        pipeline: AnalysisPipeline,
+        *,
+        concurrency: int,
+        on_event: Optional[Callable[[str, JobRecord, Optional[str]], None]] = None,
+    ):
+        self.pipeline = pipeline
+        self.repository = pipeline.repository
+        settings = pipeline.settings
+        self.concurrency = max(1, concurrency)
+        self.lease = settings.job_lease
+        self.retry_delay = settings.job_retry_delay
+        self.poll_interval = settings.job_poll_interval
+        self.on_event = on_event
+        self.identity = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._running: Dict[int, JobRecord] = {}
+        self._running_lock = threading.Lock()
+
+    def run(self, *, exit_when_empty: bool = False) -> None:
+        """Process jobs until :meth:`stop` is called (or the queue drains)."""
+        self._threads = [
+            threading.Thread(
+                target=self._loop,
+                args=(f"{self.identity}:{index}", exit_when_empty),
+                name=f"job-worker-{index}",
+                daemon=True,
+            )
+            for index in range(self.concurrency)
+        ]
+        for thread in self._threads:
+            thread.start()
+        self.wait()
+
+    def stop(self) -> None:
+        """Ask the threads to exit once their current job is done."""
+        self.stopping.set()
+
+    def wait(self) -> None:
+        # Join with a timeout so Ctrl-C still reaches the main thread.
+        for thread in self._threads:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+
+    def release_running(self) -> int:
+        """Hand the jobs still running back to the queue, without using up an attempt.
+
+        For shutting down without waiting: other workers can claim the jobs
+        at once instead of after ``JOB_LEASE``. Returns how many were released.
+        """
+        self.stop()
+        with self._running_lock:
+            running = list(self._running.values())
+        return sum(self.repository.release_job(job.id, job.lease_token) for job in running)
+
+    def _loop(self, owner: str, exit_when_empty: bool) -> None:
+        while not self.stopping.is_set():
+            job = self.repository.claim_job(owner, lease=self.lease)
+            if job is None:
+                if exit_when_empty:
+                    return
+                self.stopping.wait(self.poll_interval)
+                continue
+            self._run(job)
+
+    def _run(self, job: JobRecord) -> None:
+        with self._running_lock:
+            self._running[job.id] = job
+        self._emit("started", job, None)
+        renewing = threading.Event()
+        renewer = threading.Thread(
+            target=self._renew, args=(job, renewing), name=f"lease-{job.id}", daemon=True
+        )
+        renewer.start()
+        try:
+            telemetry = Telemetry()
+            article = self.pipeline.fetch(job.url, telemetry=telemetry)
+            result = self.pipeline.analyze(job.url, article, telemetry=telemetry)
+            output_path = self.pipeline.write(result)
+        except Exception as exc:  # noqa: BLE001 - record the failure and keep working
+            error = str(exc) or type(exc).__name__
+            status = self.repository.fail_job(
+                job.id,
+                job.lease_token,
+                error=error,
+                retry_delay=self._backoff(job.attempts),
+            )
+            if status is None:
+                self._emit("lease-lost", job, error)
+            else:
+                self._emit("retrying" if status == "queued" else "failed", job, error)
+        else:
+            completed = self.repository.complete_job(
+                job.id, job.lease_token, output_path=output_path, article_id=article.record.id
+            )
+            self._emit("succeeded" if completed else "lease-lost", job, str(output_path))
+        finally:
+            renewing.set()
+            renewer.join()
+            with self._running_lock:
+                self._running.pop(job.id, None)
+
+    def _renew(self, job: JobRecord, done: threading.Event) -> None:
+        interval = max(1.0, self.lease.total_seconds() / 3)
+        while not done.wait(interval):
+            if not self.repository.renew_job_lease(job.id, job.lease_token, lease=self.lease):
+                return
+
+    def _backoff(self, attempt: int) -> timedelta:
+        return self.retry_delay * (2 ** max(0, attempt - 1))
+
+    def _emit(self, event: str, job: JobRecord, detail: Optional[str]) -> None:
+        if self.on_event:
+            self.on_event(event, job, detail)